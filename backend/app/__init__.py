@@ -1,9 +1,21 @@
-from flask import Flask
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
+from app.models import Model
+
+class ModelJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes the data models (pages, segments...) in their JSON shape"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Model):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
 
 def create_app(config_name='default'):
     app = Flask(__name__)
+    app.json = ModelJSONProvider(app)
 
     # Load configuration
     from config import config
@@ -12,6 +24,38 @@ def create_app(config_name='default'):
     # Enable CORS
     CORS(app, resources={r"/api/*": {"origins": app.config['CORS_ORIGINS']}})
 
+    # Trace requests to the local trace log
+    from app.utils import tracing
+    tracing.init_app(app)
+
+    # Give each request a deadline and stop its work when it ends
+    from app.utils import cancellation
+    cancellation.init_app(app)
+
+    # Shed requests over the per-route limits instead of queueing them without bound
+    from app.utils import admission
+    admission.init_app(app)
+
+    # Profile individual requests on demand (needs PROFILING_SECRET)
+    from app.utils import profiling
+    profiling.init_app(app)
+
+    # Track per-document storage and evict least recently used artifacts over quota
+    from app.services import storage
+    storage.init_app(app)
+
+    # Share provider concurrency limits across all requests, scheduled by priority class
+    from app.services import scheduler
+    scheduler.init_app(app)
+
+    # Translate each text once per service and language pair, across requests and retries
+    from app.services import translation_cache
+    translation_cache.init_app(app)
+
+    # Fail fast on providers that keep failing
+    from app.services.circuit_breaker import provider_circuits
+    provider_circuits.configure(app.config['PROVIDER_CIRCUIT_FAILURES'], app.config['PROVIDER_CIRCUIT_RESET_SECONDS'])
+
     # Create necessary directories
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     os.makedirs(app.config['AUDIO_OUTPUT_FOLDER'], exist_ok=True)
@@ -21,13 +65,28 @@ def create_app(config_name='default'):
     from app.routes.upload import upload_bp
     from app.routes.translate import translate_bp
     from app.routes.tts import tts_bp
+    from app.routes.pipeline import pipeline_bp
+    from app.routes.admin import admin_bp
 
     app.register_blueprint(upload_bp, url_prefix='/api')
     app.register_blueprint(translate_bp, url_prefix='/api')
     app.register_blueprint(tts_bp, url_prefix='/api')
+    app.register_blueprint(pipeline_bp, url_prefix='/api')
+    app.register_blueprint(admin_bp, url_prefix='/api')
 
     @app.route('/api/health')
     def health_check():
         return {'status': 'healthy', 'message': 'Language Learning API is running'}, 200
 
+    @app.route('/api/ready')
+    def readiness():
+        from app.utils.readiness import readiness_report
+        report = readiness_report(app)
+        return report, 200 if report['ready'] else 503
+
+    @app.route('/api/metrics')
+    def metrics():
+        from app.utils.metrics import registry
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
     return app
@@ -1 +1,2 @@
 # Models package
+from app.models.document import AudioSegment, Model, Page, Segment, TranslationUnit, to_json
@@ -0,0 +1,204 @@
+from typing import Dict, List, Optional
+
+_MISSING = object()
+
+class Model:
+    """
+    Base for the compact data models
+
+    Fields are declared in __slots__, so an instance carries no per-object
+    dict and no copies of the key strings; a long book's pages and
+    segments take a fraction of the memory the equivalent dicts did.
+
+    A field that was never set is left out of to_dict(), the same as a key
+    the dict shapes didn't have (e.g. 'error' on a segment that worked).
+    Item access (model['text'], model.get('duration'), 'error' in model)
+    still works, so code that handles both models and documents loaded
+    back from JSON doesn't need to tell them apart.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Model':
+        """
+        Build a model from its JSON shape
+
+        Args:
+            data: Dictionary in the model's JSON shape (other keys are ignored)
+
+        Returns:
+            Model instance
+        """
+        model = cls.__new__(cls)
+        for name in cls.__slots__:
+            value = data.get(name, _MISSING)
+            if value is not _MISSING:
+                setattr(model, name, value)
+        return model
+
+    def to_dict(self) -> Dict:
+        """Dictionary in the JSON shape, with only the fields that are set"""
+        data = {}
+        self._add_set_fields(data, self.__slots__)
+        return data
+
+    def _add_set_fields(self, data: Dict, names):
+        for name in names:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                data[name] = value
+
+    def keys(self) -> List[str]:
+        return [name for name in self.__slots__ if hasattr(self, name)]
+
+    def get(self, key: str, default=None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value):
+        if key not in self.__slots__:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and hasattr(self, key)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Model):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class Page(Model):
+    """
+    One extracted page
+
+    text is the page text the rest of the pipeline uses (normalized once
+    PDFProcessor.apply_normalization has run, with the original in
+    raw_text); boilerplate holds the header/footer marks found by
+    PDFProcessor.detect_boilerplate.
+    """
+
+    __slots__ = ('page_number', 'text', 'char_count', 'boilerplate', 'raw_text')
+    _OPTIONAL = ('boilerplate', 'raw_text')
+
+    def __init__(self, page_number: int, text: str, char_count: Optional[int] = None):
+        self.page_number = page_number
+        self.text = text
+        self.char_count = len(text) if char_count is None else char_count
+
+    def to_dict(self) -> Dict:
+        data = {'page_number': self.page_number, 'text': self.text, 'char_count': self.char_count}
+        self._add_set_fields(data, self._OPTIONAL)
+        return data
+
+class Segment(Model):
+    """A span of text (sentence, word or TTS piece) with its character offsets"""
+
+    __slots__ = ('id', 'text', 'start_char', 'end_char')
+
+    def __init__(self, id: int, text: str, start_char: int, end_char: int):
+        self.id = id
+        self.text = text
+        self.start_char = start_char
+        self.end_char = end_char
+
+    def to_dict(self) -> Dict:
+        return {'id': self.id, 'text': self.text, 'start_char': self.start_char, 'end_char': self.end_char}
+
+class TranslationUnit(Model):
+    """
+    Translation result of one chunk
+
+    Holds the provider's result fields plus the chunk index, or the error
+    and the untranslated text if the chunk failed.
+    """
+
+    __slots__ = (
+        'translated_text', 'source_lang', 'target_lang', 'service', 'confidence',
+        'chunk_index', 'error', 'original_text'
+    )
+
+    def __init__(self, chunk_index: int, **fields):
+        self.chunk_index = chunk_index
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def from_result(cls, result: Dict, chunk_index: int) -> 'TranslationUnit':
+        """Wrap a TranslationService.translate_text result (the result itself isn't changed)"""
+        unit = cls.from_dict(result)
+        unit.chunk_index = chunk_index
+        return unit
+
+    @property
+    def failed(self) -> bool:
+        return hasattr(self, 'error')
+
+class AudioSegment(Model):
+    """
+    Synthesized audio of one segment
+
+    Carries the TTS result (audio_path, file_size, duration...), the
+    segment's text and offsets, its start/end time when the segments are
+    played back to back, and the fields the routes add for serving it.
+    A segment that failed has segment_id, text and error only.
+    """
+
+    __slots__ = (
+        'success', 'audio_path', 'language', 'service', 'file_size', 'duration',
+        'segment_id', 'start_char', 'end_char', 'text', 'start_time', 'end_time',
+        'original_text', 'audio_file', 'audio_url', 'error'
+    )
+
+    def __init__(self, segment_id: int, text: str, **fields):
+        self.segment_id = segment_id
+        self.text = text
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def from_audio(cls, audio_info: Dict, segment: Segment) -> 'AudioSegment':
+        """
+        Combine a TextToSpeechService.text_to_speech result with the segment it was made from
+
+        Args:
+            audio_info: Audio file info
+            segment: The synthesized segment
+
+        Returns:
+            Audio segment
+        """
+        audio_segment = cls.from_dict(audio_info)
+        audio_segment.segment_id = segment.id
+        audio_segment.start_char = segment.start_char
+        audio_segment.end_char = segment.end_char
+        audio_segment.text = segment.text
+        return audio_segment
+
+    @property
+    def failed(self) -> bool:
+        return hasattr(self, 'error')
+
+def to_json(value):
+    """
+    json.dump default hook that writes models in their JSON shape
+
+    Raises:
+        TypeError: For anything else that isn't JSON serializable
+    """
+    if isinstance(value, Model):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,121 @@
+from flask import Blueprint, request, jsonify, current_app, send_file
+import os
+from app.utils.profiling import is_authorized, list_profiles
+
+admin_bp = Blueprint('admin', __name__)
+
+@admin_bp.route('/admin/profiles', methods=['GET'])
+def get_profiles():
+    """
+    List recent request profiles ranked by wall time
+
+    Requires the X-Profile-Token header (or ?profile=) matching PROFILING_SECRET.
+
+    Query params:
+        limit: Maximum number of profiles (default: 20)
+
+    Returns:
+        JSON response with profile summaries, slowest first
+    """
+    if not is_authorized(request, current_app.config.get('PROFILING_SECRET')):
+        return jsonify({'error': 'Forbidden'}), 403
+
+    try:
+        limit = int(request.args.get('limit', 20))
+        profiles = list_profiles(current_app.config['PROFILE_FOLDER'], limit)
+
+        return jsonify({
+            'success': True,
+            'total': len(profiles),
+            'profiles': profiles
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to list profiles',
+            'details': str(e)
+        }), 500
+
+@admin_bp.route('/admin/storage', methods=['GET'])
+def get_storage_usage():
+    """
+    Get disk usage per artifact kind and the storage quota
+
+    Requires the same token as the profile endpoints.
+
+    Returns:
+        JSON response with usage in bytes
+    """
+    if not is_authorized(request, current_app.config.get('PROFILING_SECRET')):
+        return jsonify({'error': 'Forbidden'}), 403
+
+    try:
+        return jsonify({
+            'success': True,
+            'usage': current_app.extensions['storage'].usage()
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to read storage usage',
+            'details': str(e)
+        }), 500
+
+@admin_bp.route('/admin/storage/sweep', methods=['POST'])
+def sweep_storage():
+    """
+    Run a storage sweep now instead of waiting for the background sweeper
+
+    Returns:
+        JSON response with reclaimed bytes, evictions and usage afterwards
+    """
+    if not is_authorized(request, current_app.config.get('PROFILING_SECRET')):
+        return jsonify({'error': 'Forbidden'}), 403
+
+    try:
+        return jsonify({
+            'success': True,
+            **current_app.extensions['storage'].sweep()
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': 'Storage sweep failed',
+            'details': str(e)
+        }), 500
+
+@admin_bp.route('/admin/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """
+    Download a saved profile
+
+    Query params:
+        format: 'prof' for the raw pstats file (default), 'json' for the summary
+
+    Returns:
+        Profile file
+    """
+    if not is_authorized(request, current_app.config.get('PROFILING_SECRET')):
+        return jsonify({'error': 'Forbidden'}), 403
+
+    try:
+        file_format = request.args.get('format', 'prof')
+        if file_format not in ('prof', 'json'):
+            return jsonify({'error': 'format must be prof or json'}), 400
+
+        profile_path = os.path.join(
+            current_app.config['PROFILE_FOLDER'],
+            f"{os.path.basename(profile_id)}.{file_format}"
+        )
+
+        if not os.path.exists(profile_path):
+            return jsonify({'error': 'Profile not found'}), 404
+
+        mimetype = 'application/json' if file_format == 'json' else 'application/octet-stream'
+        return send_file(profile_path, mimetype=mimetype, as_attachment=file_format == 'prof')
+
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to retrieve profile',
+            'details': str(e)
+        }), 500
@@ -0,0 +1,304 @@
+from flask import Blueprint, request, jsonify, current_app
+import os
+import json
+from app.services.translator import TranslationService, TranslationCheckpoint
+from app.services.text_to_speech import TextToSpeechService
+from app.services.pdf_processor import PDFProcessor
+from app.services.pipeline import TranslateSpeakPipeline
+from app.services.job_manager import job_manager
+from app.services.scheduler import set_priority
+from app.utils.files import atomic_write_json, audio_file_name, new_audio_version, publish_audio_version
+from app.utils.helpers import job_deadline
+from app.utils.playlist import PLAYLIST_FILENAME, MediaPlaylist, estimate_target_duration
+
+pipeline_bp = Blueprint('pipeline', __name__)
+
+def _run_translate_speak(
+    job,
+    document_id: str,
+    text_data: dict,
+    target_lang: str,
+    source_lang: str,
+    service: str,
+    tts_service_name: str,
+    audio_folder: str,
+    translation_file_path: str,
+    checkpoint_path: str,
+    queue_size: int,
+    tts_workers: int,
+    gtts_connections: int,
+    audio_versions_keep: int = 2,
+    lock_timeout: float = 30.0,
+    cache=None
+):
+    """Background job body for the translate-and-speak pipeline"""
+    set_priority('document', document_id)
+    translator = TranslationService(service=service, cache=cache)
+    tts_service = TextToSpeechService(service=tts_service_name, gtts_connections=gtts_connections)
+    pdf_processor = PDFProcessor()
+
+    sentences = pdf_processor.split_into_sentences(text_data['full_text'])
+    job.update_progress(total_segments=len(sentences), completed_segments=0, segments=[])
+
+    # Each generation gets its own version directory under the document
+    version = new_audio_version(audio_folder, document_id)
+    doc_audio_dir = os.path.join(audio_folder, document_id, version)
+
+    # Segments finish out of order; the playlist lists them in document order
+    playlist_file = f"{document_id}/{version}/{PLAYLIST_FILENAME}"
+    playlist = MediaPlaylist(
+        doc_audio_dir,
+        len(sentences),
+        estimate_target_duration(tts_service, [{'text': sentence} for sentence in sentences])
+    )
+    job.update_progress(playlist=playlist_file)
+
+    def on_segment(segment):
+        if 'audio_path' in segment:
+            segment.audio_file = audio_file_name(document_id, version, segment.audio_path)
+        playlist.add_segment_info(segment.segment_id, segment)
+        job.append_progress('segments', segment)
+        job.update_progress(completed_segments=len(job.progress['segments']))
+
+    # Sentences and segments finished by an earlier, cancelled or timed out run are reused
+    checkpoint = TranslationCheckpoint(checkpoint_path, service)
+
+    pipeline = TranslateSpeakPipeline(
+        translator,
+        tts_service,
+        queue_size=queue_size,
+        tts_workers=tts_workers
+    )
+    try:
+        result = pipeline.run(sentences, target_lang, source_lang, doc_audio_dir, on_segment, checkpoint)
+    finally:
+        # Also when cancelled, so players never wait on an abandoned playlist
+        playlist.finish()
+    job.update_progress(resumed_units=checkpoint.resumed)
+
+    translated_text = ' '.join(result['translated_sentences'])
+    # Sentences whose translation failed come back as error segments with no text
+    failed_sentences = [
+        segment.segment_id for segment in result['segments']
+        if segment.failed and not segment.text
+    ]
+
+    # Save translation in the same layout as /translate/document
+    translation_result = {
+        'document_id': document_id,
+        'source_lang': result['source_lang'],
+        'target_lang': target_lang,
+        'service': service,
+        'original_text': text_data['full_text'],
+        'translated_text': translated_text,
+        'full_text': translated_text,  # Keep for backward compatibility
+        'pages': [],
+        'total_pages': text_data.get('total_pages', 0),
+        'total_chars': len(translated_text),
+        'original_pages': text_data['pages'],
+        'complete': not failed_sentences,
+        'failed_chunks': [],
+        'failed_pages': [],
+        'failed_sentences': failed_sentences
+    }
+    atomic_write_json(translation_file_path, translation_result)
+
+    # Save segment info in the same layout as /tts/generate-document
+    publish_audio_version(
+        audio_folder,
+        document_id,
+        version,
+        {
+            'document_id': document_id,
+            'language': target_lang,
+            'segment_type': 'sentence',
+            'segments': result['segments'],
+            'playlist': playlist_file
+        },
+        keep=audio_versions_keep,
+        lock_timeout=lock_timeout
+    )
+
+    # Keep the checkpoint until every sentence is translated
+    if translation_result['complete']:
+        checkpoint.discard()
+
+    return {
+        'document_id': document_id,
+        'language': target_lang,
+        'total_segments': len(result['segments']),
+        'audio_directory': document_id,
+        'version': version,
+        'playlist': playlist_file,
+        'timings': result['timings']
+    }
+
+@pipeline_bp.route('/pipeline/translate-speak', methods=['POST'])
+def start_translate_speak():
+    """
+    Start an overlapped translate-and-speak job for a document
+
+    Each sentence is synthesized as soon as its translation is ready, so
+    segment audio becomes available long before the whole document is done.
+    Poll /pipeline/jobs/<job_id> for the segments produced so far.
+
+    The job stops when cancelled (POST /jobs/<job_id>/cancel) or after
+    deadline_seconds (at most JOB_DEADLINE). Sentences translated and
+    segments synthesized until then are checkpointed, so starting the same
+    job again only does the rest.
+
+    Request body:
+        {
+            "document_id": "unique_doc_id",
+            "target_lang": "es",
+            "source_lang": "auto",
+            "service": "google",
+            "tts_service": "gtts",
+            "deadline_seconds": 3600
+        }
+
+    Returns:
+        JSON response with the job ID (202 Accepted)
+    """
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        document_id = data.get('document_id')
+        target_lang = data.get('target_lang', 'en')
+        source_lang = data.get('source_lang', 'auto')
+        service = data.get('service', 'google')
+        tts_service_name = data.get('tts_service', 'gtts')
+
+        if not document_id:
+            return jsonify({'error': 'No document_id provided'}), 400
+
+        try:
+            deadline = job_deadline(data, current_app.config['JOB_DEADLINE'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Load extracted text
+        text_file_path = os.path.join(
+            current_app.config['TRANSLATION_OUTPUT_FOLDER'],
+            f"{document_id}_extracted.json"
+        )
+
+        if not os.path.exists(text_file_path):
+            return jsonify({'error': 'Document not found'}), 404
+
+        with open(text_file_path, 'r', encoding='utf-8') as f:
+            text_data = json.load(f)
+
+        # Validate service names before going to the background
+        TranslationService(service=service)
+        TextToSpeechService(service=tts_service_name)
+
+        translation_file_path = os.path.join(
+            current_app.config['TRANSLATION_OUTPUT_FOLDER'],
+            f"{document_id}_{target_lang}_translation.json"
+        )
+
+        job = job_manager.submit(
+            'translate_speak',
+            _run_translate_speak,
+            params={
+                'document_id': document_id,
+                'target_lang': target_lang,
+                'source_lang': source_lang,
+                'service': service,
+                'tts_service': tts_service_name
+            },
+            deadline=deadline,
+            document_id=document_id,
+            text_data=text_data,
+            target_lang=target_lang,
+            source_lang=source_lang,
+            service=service,
+            tts_service_name=tts_service_name,
+            audio_folder=current_app.config['AUDIO_OUTPUT_FOLDER'],
+            translation_file_path=translation_file_path,
+            checkpoint_path=os.path.join(
+                current_app.config['TRANSLATION_OUTPUT_FOLDER'],
+                f"{document_id}_{target_lang}_pipeline.checkpoint.jsonl"
+            ),
+            queue_size=current_app.config['PIPELINE_QUEUE_SIZE'],
+            tts_workers=current_app.config['PIPELINE_TTS_WORKERS'],
+            gtts_connections=current_app.config['GTTS_MAX_CONNECTIONS'],
+            audio_versions_keep=current_app.config['AUDIO_VERSIONS_KEEP'],
+            lock_timeout=current_app.config['DOCUMENT_LOCK_TIMEOUT'],
+            cache=current_app.extensions['translation_cache']
+        )
+
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'status': job.status,
+            'document_id': document_id,
+            'audio_directory': document_id
+        }), 202
+
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to start translate-and-speak job',
+            'details': str(e)
+        }), 500
+
+@pipeline_bp.route('/jobs/<job_id>', methods=['GET'])
+@pipeline_bp.route('/pipeline/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Get the state of a background job (pipeline, multi-language translation, ...)
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        JSON response with job status, progress and segments ready so far
+    """
+    job = job_manager.get(job_id)
+
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    job_state = job.to_dict()
+    segments = job_state['progress'].get('segments', [])
+    segments.sort(key=lambda s: s['segment_id'])
+
+    return jsonify({
+        'success': True,
+        'job': job_state
+    }), 200
+
+@pipeline_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+@pipeline_bp.route('/pipeline/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """
+    Stop a background job
+
+    Cancellation is cooperative: calls waiting for a provider slot leave the
+    queue at once, calls already sent finish first. The job then ends with
+    status 'cancelled'; what it finished is kept for the next run.
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        JSON response with the job state (202 Accepted)
+    """
+    job = job_manager.get(job_id)
+
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    if job.finished:
+        return jsonify({'error': f"Job already {job.status}"}), 409
+
+    job.cancel()
+
+    return jsonify({
+        'success': True,
+        'job': job.to_dict()
+    }), 202
@@ -1,8 +1,17 @@
 from flask import Blueprint, request, jsonify, current_app
 import os
 import json
-from app.services.translator import TranslationService
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.translator import TranslationService, TranslationCheckpoint
 from app.services.pdf_processor import PDFProcessor
+from app.services.page_translation import PageTranslationService
+from app.services.job_manager import job_manager
+from app.services.scheduler import priority, set_priority
+from app.utils.cancellation import CancelledError, check_cancelled
+from app.utils.files import atomic_write_json
+from app.utils.helpers import circuit_open_response, job_deadline
+from app.utils.tracing import propagate
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 translate_bp = Blueprint('translate', __name__)
 
@@ -37,7 +46,7 @@ def translate_text():
             return jsonify({'error': 'No text provided'}), 400
 
         # Initialize translator
-        translator = TranslationService(service=service)
+        translator = TranslationService(service=service, cache=current_app.extensions['translation_cache'])
 
         # Translate text
         result = translator.translate_text(text, target_lang, source_lang)
@@ -47,6 +56,13 @@ def translate_text():
             'translation': result
         }), 200
 
+    except CancelledError as e:
+        return jsonify({
+            'error': 'Translation timed out',
+            'details': str(e)
+        }), 504
+    except CircuitOpenError as e:
+        return circuit_open_response('Translation provider unavailable', e)
     except Exception as e:
         return jsonify({
             'error': 'Translation failed',
@@ -63,9 +79,19 @@ def translate_document():
             "document_id": "unique_doc_id",
             "target_lang": "es",
             "source_lang": "auto",
-            "service": "google"
+            "service": "google",
+            "translate_boilerplate": false,
+            "resume": true
         }
 
+    Progress is checkpointed per chunk and page. If any unit fails the
+    saved translation has "complete": false; calling again with resume
+    (the default) retries only the missing or failed units.
+
+    The request stops at its deadline (REQUEST_DEADLINES, or a shorter
+    X-Request-Deadline header) with a 504; the units finished until then
+    stay in the checkpoint, so sending the same request again resumes it.
+
     Returns:
         JSON response with translated document
     """
@@ -79,6 +105,8 @@ def translate_document():
         target_lang = data.get('target_lang', 'en')
         source_lang = data.get('source_lang', 'auto')
         service = data.get('service', 'google')
+        translate_boilerplate = bool(data.get('translate_boilerplate', False))
+        resume = bool(data.get('resume', True))
 
         if not document_id:
             return jsonify({'error': 'No document_id provided'}), 400
@@ -95,8 +123,16 @@ def translate_document():
         with open(text_file_path, 'r', encoding='utf-8') as f:
             text_data = json.load(f)
 
+        # Pick up units finished by an earlier, interrupted attempt
+        checkpoint = TranslationCheckpoint(
+            _checkpoint_path(current_app.config['TRANSLATION_OUTPUT_FOLDER'], document_id, target_lang),
+            service
+        )
+        if not resume:
+            checkpoint.discard()
+
         # Initialize translator
-        translator = TranslationService(service=service)
+        translator = TranslationService(service=service, cache=current_app.extensions['translation_cache'])
         pdf_processor = PDFProcessor()
 
         # Split text into chunks for better handling
@@ -105,45 +141,15 @@ def translate_document():
             max_chars=5000
         )
 
-        # Translate chunks
-        translated_chunks = translator.translate_chunks(chunks, target_lang, source_lang)
-
-        # Combine translated chunks
-        translated_text = ' '.join([
-            chunk['translated_text']
-            for chunk in translated_chunks
-            if 'translated_text' in chunk
-        ])
-
-        # Also translate page by page for better structure
-        translated_pages = []
-        for page in text_data['pages']:
-            page_translation = translator.translate_text(
-                page['text'],
-                target_lang,
-                source_lang
-            )
-            translated_pages.append({
-                'page_number': page['page_number'],
-                'original_text': page['text'],
-                'translated_text': page_translation['translated_text'],
-                'char_count': len(page_translation['translated_text'])
-            })
-
-        # Prepare response with both original and translated text
-        translation_result = {
-            'document_id': document_id,
-            'source_lang': translated_chunks[0]['source_lang'] if translated_chunks else source_lang,
-            'target_lang': target_lang,
-            'service': service,
-            'original_text': text_data['full_text'],  # Include original text
-            'translated_text': translated_text,
-            'full_text': translated_text,  # Keep for backward compatibility
-            'pages': translated_pages,
-            'total_pages': len(translated_pages),
-            'total_chars': len(translated_text),
-            'original_pages': text_data['pages']  # Include original pages
-        }
+        # Translate whole document and page by page, queued behind interactive calls
+        with priority('document', document_id):
+            translation_result = {
+                'document_id': document_id,
+                **translator.translate_document(
+                    text_data, chunks, target_lang, source_lang, translate_boilerplate, checkpoint
+                ),
+                'normalization': pdf_processor.normalization_summary(text_data)
+            }
 
         # Save translation result
         translation_file_path = os.path.join(
@@ -151,20 +157,422 @@ def translate_document():
             f"{document_id}_{target_lang}_translation.json"
         )
 
-        with open(translation_file_path, 'w', encoding='utf-8') as f:
-            json.dump(translation_result, f, ensure_ascii=False, indent=2)
+        atomic_write_json(translation_file_path, translation_result)
+
+        # Keep the checkpoint until every unit is translated
+        if translation_result['complete']:
+            checkpoint.discard()
 
         return jsonify({
             'success': True,
             'translation': translation_result
         }), 200
 
+    except CancelledError as e:
+        return jsonify({
+            'error': 'Document translation did not finish in time; send the request again to resume it',
+            'details': str(e)
+        }), 504
     except Exception as e:
         return jsonify({
             'error': 'Document translation failed',
             'details': str(e)
         }), 500
 
+def _checkpoint_path(output_folder: str, document_id: str, target_lang: str) -> str:
+    """Path of a document translation's progress checkpoint"""
+    return os.path.join(output_folder, f"{document_id}_{target_lang}_translation.checkpoint.jsonl")
+
+def _detect_source_language(translator: TranslationService, chunks: list, source_lang: str) -> str:
+    """Detect the source language once so each target doesn't repeat it"""
+    if source_lang != 'auto' or not chunks:
+        return source_lang
+
+    try:
+        detected = translator.detect_language(chunks[0][:1000])['language']
+    except Exception:
+        return source_lang
+
+    return detected if detected and detected != 'unknown' else source_lang
+
+def _run_multi_translation(
+    job,
+    document_id: str,
+    text_data: dict,
+    target_langs: list,
+    source_lang: str,
+    service: str,
+    output_folder: str,
+    translate_boilerplate: bool = False,
+    max_workers: int = 4,
+    cache=None
+):
+    """Background job body translating one document into several languages"""
+    set_priority('document', document_id)
+    translator = TranslationService(service=service, cache=cache)
+    pdf_processor = PDFProcessor()
+
+    # Shared work: chunking and source detection happen once for all targets
+    chunks = pdf_processor.split_into_chunks(text_data['full_text'], max_chars=5000)
+    source_lang = _detect_source_language(translator, chunks, source_lang)
+    job.update_progress(
+        source_lang=source_lang,
+        languages={lang: 'queued' for lang in target_langs}
+    )
+
+    def translate_one(target_lang):
+        job.set_progress_item('languages', target_lang, 'running')
+        checkpoint = TranslationCheckpoint(
+            _checkpoint_path(output_folder, document_id, target_lang),
+            service
+        )
+        translation_result = {
+            'document_id': document_id,
+            **translator.translate_document(
+                text_data, chunks, target_lang, source_lang, translate_boilerplate, checkpoint
+            ),
+            'normalization': pdf_processor.normalization_summary(text_data)
+        }
+
+        translation_file_path = os.path.join(
+            output_folder,
+            f"{document_id}_{target_lang}_translation.json"
+        )
+        atomic_write_json(translation_file_path, translation_result)
+
+        if translation_result['complete']:
+            checkpoint.discard()
+
+        return translation_result
+
+    results = {}
+    # Provider calls from all targets share the process-wide provider limits
+    with ThreadPoolExecutor(max_workers=max(1, min(len(target_langs), max_workers))) as executor:
+        futures = {executor.submit(propagate(translate_one), lang): lang for lang in target_langs}
+        for future in as_completed(futures):
+            target_lang = futures[future]
+            try:
+                translation_result = future.result()
+                results[target_lang] = {
+                    'success': translation_result['complete'],
+                    'complete': translation_result['complete'],
+                    'total_chars': translation_result['total_chars'],
+                    'failed_chunks': translation_result['failed_chunks'],
+                    'failed_pages': translation_result['failed_pages']
+                }
+                # Incomplete targets resume from their checkpoint on the next job
+                job.set_progress_item(
+                    'languages',
+                    target_lang,
+                    'completed' if translation_result['complete'] else 'incomplete'
+                )
+            except CancelledError as e:
+                results[target_lang] = {'success': False, 'error': str(e)}
+                job.set_progress_item('languages', target_lang, 'cancelled')
+            except Exception as e:
+                results[target_lang] = {'success': False, 'error': str(e)}
+                job.set_progress_item('languages', target_lang, 'failed')
+
+    # Finished targets are saved; the rest resume from their checkpoints
+    check_cancelled()
+
+    return {
+        'document_id': document_id,
+        'source_lang': source_lang,
+        'languages': results
+    }
+
+@translate_bp.route('/translate/document/multi', methods=['POST'])
+def translate_document_multi():
+    """
+    Translate one document into several target languages in a background job
+
+    Extraction loading, chunking and source-language detection are done
+    once; the targets are then translated concurrently and each
+    {document_id}_{lang}_translation.json is written as soon as it finishes.
+    At most MULTI_TRANSLATION_MAX_LANGUAGES supported languages per job, of
+    which MULTI_TRANSLATION_MAX_WORKERS are translated at the same time.
+    Poll /jobs/<job_id> for per-language progress; POST /jobs/<job_id>/cancel
+    or deadline_seconds (at most JOB_DEADLINE) stops it.
+
+    Request body:
+        {
+            "document_id": "unique_doc_id",
+            "target_langs": ["es", "fr", "de"],
+            "source_lang": "auto",
+            "service": "google",
+            "translate_boilerplate": false,
+            "deadline_seconds": 3600
+        }
+
+    Returns:
+        JSON response with the job ID (202 Accepted)
+    """
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        document_id = data.get('document_id')
+        target_langs = data.get('target_langs') or []
+        source_lang = data.get('source_lang', 'auto')
+        service = data.get('service', 'google')
+        translate_boilerplate = bool(data.get('translate_boilerplate', False))
+
+        if not document_id:
+            return jsonify({'error': 'No document_id provided'}), 400
+
+        if not isinstance(target_langs, list) or not target_langs:
+            return jsonify({'error': 'target_langs must be a non-empty list'}), 400
+        if not all(isinstance(lang, str) and lang for lang in target_langs):
+            return jsonify({'error': 'target_langs must be language codes'}), 400
+
+        # Drop duplicates but keep the requested order
+        target_langs = list(dict.fromkeys(target_langs))
+
+        max_languages = current_app.config['MULTI_TRANSLATION_MAX_LANGUAGES']
+        if len(target_langs) > max_languages:
+            return jsonify({'error': f"At most {max_languages} target_langs per job"}), 400
+
+        try:
+            deadline = job_deadline(data, current_app.config['JOB_DEADLINE'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Load extracted text
+        text_file_path = os.path.join(
+            current_app.config['TRANSLATION_OUTPUT_FOLDER'],
+            f"{document_id}_extracted.json"
+        )
+
+        if not os.path.exists(text_file_path):
+            return jsonify({'error': 'Document not found'}), 404
+
+        with open(text_file_path, 'r', encoding='utf-8') as f:
+            text_data = json.load(f)
+
+        # Validate service name and languages before going to the background
+        supported = TranslationService(service=service).get_supported_languages()
+        unsupported = [lang for lang in target_langs if supported and lang not in supported]
+        if unsupported:
+            return jsonify({
+                'error': f"Unsupported target language(s) for {service}: {', '.join(unsupported)}"
+            }), 400
+
+        job = job_manager.submit(
+            'translate_multi',
+            _run_multi_translation,
+            params={
+                'document_id': document_id,
+                'target_langs': target_langs,
+                'source_lang': source_lang,
+                'service': service,
+                'translate_boilerplate': translate_boilerplate
+            },
+            deadline=deadline,
+            document_id=document_id,
+            text_data=text_data,
+            target_langs=target_langs,
+            source_lang=source_lang,
+            service=service,
+            output_folder=current_app.config['TRANSLATION_OUTPUT_FOLDER'],
+            translate_boilerplate=translate_boilerplate,
+            max_workers=current_app.config['MULTI_TRANSLATION_MAX_WORKERS'],
+            cache=current_app.extensions['translation_cache']
+        )
+
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'status': job.status,
+            'document_id': document_id,
+            'target_langs': target_langs
+        }), 202
+
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to start multi-language translation',
+            'details': str(e)
+        }), 500
+
+def _run_page_prefetch(
+    job,
+    document_id: str,
+    text_data: dict,
+    page_numbers: list,
+    target_lang: str,
+    source_lang: str,
+    service: str,
+    output_folder: str,
+    cache=None
+):
+    """Background job body translating the pages just ahead of the reader"""
+    set_priority('background', document_id)
+    page_service = PageTranslationService(output_folder, cache=cache)
+    translated = []
+    errors = []
+
+    # One page at a time, so a page the reader reaches soon is ready first
+    pending = list(page_numbers)
+    try:
+        while pending:
+            page_number = pending[0]
+            try:
+                result = page_service.translate_pages(
+                    document_id,
+                    text_data,
+                    [page_number],
+                    target_lang,
+                    source_lang,
+                    service
+                )
+            finally:
+                page_service.release_prefetch(document_id, target_lang, pending.pop(0), source_lang, service)
+            translated.extend(page['page_number'] for page in result['pages'])
+            errors.extend(result['errors'])
+            job.update_progress(translated_pages=list(translated), errors=list(errors))
+    finally:
+        # Stopped early (cancelled, deadline): later pages may be prefetched again
+        for page_number in pending:
+            page_service.release_prefetch(document_id, target_lang, page_number, source_lang, service)
+
+    return {
+        'translated_pages': translated,
+        'errors': errors
+    }
+
+@translate_bp.route('/translate/document/pages', methods=['POST'])
+def translate_document_pages():
+    """
+    Translate only a range of pages, prefetching the next ones in the background
+
+    Translated pages are stored per page and served from the store on
+    later requests. After the requested range, the next `prefetch` pages
+    that aren't stored yet are translated by a background job.
+
+    Request body:
+        {
+            "document_id": "unique_doc_id",
+            "target_lang": "es",
+            "source_lang": "auto",
+            "service": "google",
+            "start_page": 1,
+            "end_page": 2,
+            "prefetch": 2
+        }
+
+    Returns:
+        JSON response with the translated pages and the prefetch job
+    """
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        document_id = data.get('document_id')
+        target_lang = data.get('target_lang', 'en')
+        source_lang = data.get('source_lang', 'auto')
+        service = data.get('service', 'google')
+
+        if not document_id:
+            return jsonify({'error': 'No document_id provided'}), 400
+
+        try:
+            start_page = int(data.get('start_page', 1))
+            end_page = int(data.get('end_page', start_page))
+            prefetch = int(data.get('prefetch', current_app.config['PAGE_PREFETCH_COUNT']))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'start_page, end_page and prefetch must be integers'}), 400
+
+        # Load extracted text
+        text_file_path = os.path.join(
+            current_app.config['TRANSLATION_OUTPUT_FOLDER'],
+            f"{document_id}_extracted.json"
+        )
+
+        if not os.path.exists(text_file_path):
+            return jsonify({'error': 'Document not found'}), 404
+
+        with open(text_file_path, 'r', encoding='utf-8') as f:
+            text_data = json.load(f)
+
+        total_pages = len(text_data['pages'])
+        if start_page < 1 or end_page < start_page or end_page > total_pages:
+            return jsonify({'error': f'Invalid page range (document has {total_pages} pages)'}), 400
+
+        # Validate service name (it is part of the page store path)
+        TranslationService(service=service)
+
+        output_folder = current_app.config['TRANSLATION_OUTPUT_FOLDER']
+        page_service = PageTranslationService(output_folder, cache=current_app.extensions['translation_cache'])
+
+        result = page_service.translate_pages(
+            document_id,
+            text_data,
+            list(range(start_page, end_page + 1)),
+            target_lang,
+            source_lang,
+            service
+        )
+
+        # Look ahead of the reading position
+        prefetch_info = None
+        prefetch_pages = page_service.pages_to_prefetch(
+            document_id,
+            text_data,
+            end_page,
+            max(0, min(prefetch, current_app.config['PAGE_PREFETCH_MAX'])),
+            target_lang,
+            source_lang,
+            service
+        )
+        if prefetch_pages:
+            job = job_manager.submit(
+                'translate_prefetch',
+                _run_page_prefetch,
+                params={
+                    'document_id': document_id,
+                    'target_lang': target_lang,
+                    'source_lang': source_lang,
+                    'service': service,
+                    'pages': prefetch_pages
+                },
+                deadline=current_app.config['JOB_DEADLINE'],
+                document_id=document_id,
+                text_data=text_data,
+                page_numbers=prefetch_pages,
+                target_lang=target_lang,
+                source_lang=source_lang,
+                service=service,
+                output_folder=output_folder,
+                cache=current_app.extensions['translation_cache']
+            )
+            prefetch_info = {'job_id': job.id, 'pages': prefetch_pages}
+
+        return jsonify({
+            'success': True,
+            'document_id': document_id,
+            'target_lang': target_lang,
+            'total_pages': total_pages,
+            'pages': result['pages'],
+            'cached_pages': result['cached'],
+            'errors': result['errors'],
+            'prefetch': prefetch_info
+        }), 200
+
+    except CancelledError as e:
+        return jsonify({
+            'error': 'Page translation timed out',
+            'details': str(e)
+        }), 504
+    except Exception as e:
+        return jsonify({
+            'error': 'Page translation failed',
+            'details': str(e)
+        }), 500
+
 @translate_bp.route('/detect-language', methods=['POST'])
 def detect_language():
     """
@@ -1,10 +1,105 @@
-from flask import Blueprint, request, jsonify, current_app, send_file
+from flask import Blueprint, request, jsonify, current_app, send_file, Response, stream_with_context, url_for, redirect
 import os
 import json
+import time
+from app.models import to_json
+from app.services.circuit_breaker import CircuitOpenError
 from app.services.text_to_speech import TextToSpeechService
+from app.services.translator import TranslationCheckpoint
+from app.utils.cancellation import CancelledError
+from app.utils.files import audio_file_name, new_audio_version, publish_audio_version
+from app.utils.helpers import circuit_open_response
+from app.utils.playlist import PLAYLIST_FILENAME, PLAYLIST_MIMETYPE, MediaPlaylist, estimate_target_duration
 
 tts_bp = Blueprint('tts', __name__)
 
+def _publish_segments(document_id: str, version: str, segment_info: dict):
+    """Make a finished audio version the one /tts/segments serves"""
+    publish_audio_version(
+        current_app.config['AUDIO_OUTPUT_FOLDER'],
+        document_id,
+        version,
+        segment_info,
+        keep=current_app.config['AUDIO_VERSIONS_KEEP'],
+        lock_timeout=current_app.config['DOCUMENT_LOCK_TIMEOUT']
+    )
+
+def _playlist_file(document_id: str, version: str) -> str:
+    """Path of a version's HLS playlist relative to the audio folder"""
+    return f"{document_id}/{version}/{PLAYLIST_FILENAME}"
+
+def _segment_checkpoint(document_id: str, language: str, tts_service: TextToSpeechService) -> TranslationCheckpoint:
+    """Checkpoint of the segments synthesized for a document's audio versions that were not finished"""
+    return TranslationCheckpoint(
+        os.path.join(
+            current_app.config['TRANSLATION_OUTPUT_FOLDER'],
+            f"{document_id}_{language}_tts.checkpoint.jsonl"
+        ),
+        tts_service.service
+    )
+
+def _finish_checkpoint(checkpoint: TranslationCheckpoint, audio_segments: list):
+    """Drop the checkpoint once a published version has every segment"""
+    if not any(segment.failed for segment in audio_segments):
+        checkpoint.discard()
+
+def _iter_version_segments(
+    tts_service: TextToSpeechService,
+    document_id: str,
+    version: str,
+    translated_segments: list,
+    original_segments: list,
+    language: str,
+    checkpoint: TranslationCheckpoint = None
+):
+    """
+    Synthesize sentence segments into a version directory, one at a time
+
+    The version's playlist.m3u8 grows as each segment is written and is
+    ended once all of them are done, or when generation stops early.
+    Segments in the checkpoint (made by an earlier run that was cancelled,
+    timed out or failed before publishing) are copied from that run's
+    version when their text, language and service match.
+
+    Yields:
+        Audio segment info with original text and audio_file added
+    """
+    doc_audio_dir = os.path.join(current_app.config['AUDIO_OUTPUT_FOLDER'], document_id, version)
+    playlist = MediaPlaylist(
+        doc_audio_dir,
+        len(translated_segments),
+        estimate_target_duration(tts_service, translated_segments)
+    )
+
+    try:
+        for i, audio_segment in enumerate(tts_service.iter_with_timestamps(
+            translated_segments,
+            language,
+            doc_audio_dir,
+            checkpoint
+        )):
+            # Add original text and the served file path to each segment
+            if i < len(original_segments):
+                audio_segment.original_text = original_segments[i].text
+            else:
+                audio_segment.original_text = ''
+            if 'audio_path' in audio_segment:
+                audio_segment.audio_file = audio_file_name(document_id, version, audio_segment.audio_path)
+
+            playlist.add_segment_info(i, audio_segment)
+            yield audio_segment
+    finally:
+        # Also on errors and disconnects, so players never wait on an abandoned playlist
+        playlist.finish()
+
+def _incomplete_translation_response(translation_data: dict):
+    """409 response for a translation that still has failed chunks or pages"""
+    return jsonify({
+        'error': 'Translation is incomplete. Translate the document again to resume it before generating audio.',
+        'failed_chunks': translation_data.get('failed_chunks', []),
+        'failed_pages': translation_data.get('failed_pages', [])
+    }), 409
+
 @tts_bp.route('/tts/generate', methods=['POST'])
 def generate_tts():
     """
@@ -36,7 +131,10 @@ def generate_tts():
             return jsonify({'error': 'No text provided'}), 400
 
         # Initialize TTS service
-        tts_service = TextToSpeechService(service=service)
+        tts_service = TextToSpeechService(
+            service=service,
+            gtts_connections=current_app.config['GTTS_MAX_CONNECTIONS']
+        )
 
         # Generate unique filename
         from app.utils.helpers import generate_unique_filename
@@ -56,6 +154,13 @@ def generate_tts():
             'audio_filename': output_filename
         }), 200
 
+    except CancelledError as e:
+        return jsonify({
+            'error': 'TTS generation timed out',
+            'details': str(e)
+        }), 504
+    except CircuitOpenError as e:
+        return circuit_open_response('TTS provider unavailable', e)
     except Exception as e:
         return jsonify({
             'error': 'TTS generation failed',
@@ -104,8 +209,14 @@ def generate_document_tts():
         with open(translation_file_path, 'r', encoding='utf-8') as f:
             translation_data = json.load(f)
 
+        if translation_data.get('complete') is False:
+            return _incomplete_translation_response(translation_data)
+
         # Initialize TTS service
-        tts_service = TextToSpeechService(service=service)
+        tts_service = TextToSpeechService(
+            service=service,
+            gtts_connections=current_app.config['GTTS_MAX_CONNECTIONS']
+        )
 
         if segment_type == 'sentence':
             # Generate sentence segments for synchronized highlighting
@@ -116,36 +227,31 @@ def generate_document_tts():
             translated_segments = tts_service.create_sentence_segments(translated_text)
             original_segments = tts_service.create_sentence_segments(original_text) if original_text else []
 
-            # Create document-specific audio directory
-            doc_audio_dir = os.path.join(
-                current_app.config['AUDIO_OUTPUT_FOLDER'],
-                document_id
-            )
-            os.makedirs(doc_audio_dir, exist_ok=True)
+            # Each generation gets its own version directory under the document
+            version = new_audio_version(current_app.config['AUDIO_OUTPUT_FOLDER'], document_id)
 
-            # Generate audio for each translated segment
-            audio_segments = tts_service.generate_with_timestamps(
+            # Generate audio for each translated segment (the playlist grows as they finish),
+            # reusing the segments an unfinished earlier attempt already made
+            checkpoint = _segment_checkpoint(document_id, language, tts_service)
+            audio_segments = list(_iter_version_segments(
+                tts_service,
+                document_id,
+                version,
                 translated_segments,
+                original_segments,
                 language,
-                doc_audio_dir
-            )
-
-            # Add original text to each segment
-            for i, audio_segment in enumerate(audio_segments):
-                if i < len(original_segments):
-                    audio_segment['original_text'] = original_segments[i]['text']
-                else:
-                    audio_segment['original_text'] = ''
+                checkpoint
+            ))
 
             # Save segment info
-            segment_info_path = os.path.join(doc_audio_dir, 'segments.json')
-            with open(segment_info_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'document_id': document_id,
-                    'language': language,
-                    'segment_type': segment_type,
-                    'segments': audio_segments
-                }, f, ensure_ascii=False, indent=2)
+            _publish_segments(document_id, version, {
+                'document_id': document_id,
+                'language': language,
+                'segment_type': segment_type,
+                'segments': audio_segments,
+                'playlist': _playlist_file(document_id, version)
+            })
+            _finish_checkpoint(checkpoint, audio_segments)
 
             return jsonify({
                 'success': True,
@@ -154,17 +260,25 @@ def generate_document_tts():
                 'segment_type': segment_type,
                 'total_segments': len(audio_segments),
                 'segments': audio_segments,
-                'audio_directory': document_id
+                'audio_directory': document_id,
+                'version': version,
+                'playlist_url': url_for('tts.get_audio_file', filename=_playlist_file(document_id, version))
             }), 200
 
         else:
             # Generate single audio file for entire document
-            from app.utils.helpers import generate_unique_filename
             output_filename = f"{document_id}_{language}_full.mp3"
             output_path = os.path.join(current_app.config['AUDIO_OUTPUT_FOLDER'], output_filename)
 
+            # Synthesize sentence-aligned pieces concurrently and stitch them in order
             full_text = translation_data['full_text']
-            audio_info = tts_service.text_to_speech(full_text, language, output_path)
+            audio_info = tts_service.text_to_speech_chunked(
+                full_text,
+                language,
+                output_path,
+                max_chars=current_app.config['TTS_CHUNK_SIZE'],
+                max_workers=current_app.config['TTS_MAX_WORKERS']
+            )
 
             return jsonify({
                 'success': True,
@@ -175,6 +289,13 @@ def generate_document_tts():
                 'audio_filename': output_filename
             }), 200
 
+    except CancelledError as e:
+        return jsonify({
+            'error': 'Document TTS generation timed out',
+            'details': str(e)
+        }), 504
+    except CircuitOpenError as e:
+        return circuit_open_response('TTS provider unavailable', e)
     except Exception as e:
         return jsonify({
             'error': 'Document TTS generation failed',
@@ -198,7 +319,17 @@ def get_audio_file(filename):
         if not os.path.exists(audio_path):
             return jsonify({'error': 'Audio file not found'}), 404
 
-        return send_file(audio_path, mimetype='audio/mpeg')
+        if filename.endswith('.m3u8'):
+            # Growing playlists must be revalidated on every reload
+            response = send_file(audio_path, mimetype=PLAYLIST_MIMETYPE)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        response = send_file(audio_path, mimetype='audio/mpeg')
+        if filename.count('/') == 2:
+            # Files in a version directory (<document_id>/<version>/...) never change
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
 
     except Exception as e:
         return jsonify({
@@ -241,43 +372,41 @@ def generate_custom_tts():
             return jsonify({'error': 'document_id and translated_text are required'}), 400
 
         # Initialize TTS service
-        tts_service = TextToSpeechService(service=service)
+        tts_service = TextToSpeechService(
+            service=service,
+            gtts_connections=current_app.config['GTTS_MAX_CONNECTIONS']
+        )
 
         if segment_type == 'sentence':
             # Create segments for both original and translated text
             translated_segments = tts_service.create_sentence_segments(translated_text)
             original_segments = tts_service.create_sentence_segments(original_text) if original_text else []
 
-            # Create document-specific audio directory
-            doc_audio_dir = os.path.join(
-                current_app.config['AUDIO_OUTPUT_FOLDER'],
-                document_id
-            )
-            os.makedirs(doc_audio_dir, exist_ok=True)
+            # Each generation gets its own version directory under the document
+            version = new_audio_version(current_app.config['AUDIO_OUTPUT_FOLDER'], document_id)
 
-            # Generate audio for each translated segment
-            audio_segments = tts_service.generate_with_timestamps(
+            # Generate audio for each translated segment (the playlist grows as they finish),
+            # reusing the segments an unfinished earlier attempt already made
+            checkpoint = _segment_checkpoint(document_id, language, tts_service)
+            audio_segments = list(_iter_version_segments(
+                tts_service,
+                document_id,
+                version,
                 translated_segments,
+                original_segments,
                 language,
-                doc_audio_dir
-            )
-
-            # Add original text to each segment
-            for i, audio_segment in enumerate(audio_segments):
-                if i < len(original_segments):
-                    audio_segment['original_text'] = original_segments[i]['text']
-                else:
-                    audio_segment['original_text'] = ''
+                checkpoint
+            ))
 
             # Save segment info
-            segment_info_path = os.path.join(doc_audio_dir, 'segments.json')
-            with open(segment_info_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'document_id': document_id,
-                    'language': language,
-                    'segment_type': segment_type,
-                    'segments': audio_segments
-                }, f, ensure_ascii=False, indent=2)
+            _publish_segments(document_id, version, {
+                'document_id': document_id,
+                'language': language,
+                'segment_type': segment_type,
+                'segments': audio_segments,
+                'playlist': _playlist_file(document_id, version)
+            })
+            _finish_checkpoint(checkpoint, audio_segments)
 
             return jsonify({
                 'success': True,
@@ -286,18 +415,297 @@ def generate_custom_tts():
                 'segment_type': segment_type,
                 'total_segments': len(audio_segments),
                 'segments': audio_segments,
-                'audio_directory': document_id
+                'audio_directory': document_id,
+                'version': version,
+                'playlist_url': url_for('tts.get_audio_file', filename=_playlist_file(document_id, version))
             }), 200
 
         else:
             return jsonify({'error': 'Only sentence segment_type is supported'}), 400
 
+    except CancelledError as e:
+        return jsonify({
+            'error': 'Custom TTS generation timed out',
+            'details': str(e)
+        }), 504
+    except Exception as e:
+        return jsonify({
+            'error': 'Custom TTS generation failed',
+            'details': str(e)
+        }), 500
+
+def _format_event(event: str, data: dict, stream_format: str) -> str:
+    """Serialize one stream event as SSE or NDJSON"""
+    if stream_format == 'ndjson':
+        return json.dumps({'event': event, **data}, ensure_ascii=False, default=to_json) + '\n'
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=to_json)}\n\n"
+
+def _stream_sentence_segments(
+    document_id: str,
+    translated_text: str,
+    original_text: str,
+    language: str,
+    service: str,
+    stream_format: str
+) -> Response:
+    """
+    Build a streaming response that emits each segment as soon as its audio is written
+
+    Events:
+        start:   {"document_id", "language", "total_segments", "playlist_url"}
+        segment: segment metadata including "audio_url", "duration" and offsets
+        done:    {"document_id", "total_segments", "audio_directory", "version", "playlist_url"}
+        error:   {"error", "details"}
+    """
+    tts_service = TextToSpeechService(
+        service=service,
+        gtts_connections=current_app.config['GTTS_MAX_CONNECTIONS']
+    )
+
+    # Create segments for both original and translated text
+    translated_segments = tts_service.create_sentence_segments(translated_text)
+    original_segments = tts_service.create_sentence_segments(original_text) if original_text else []
+
+    # Each generation gets its own version directory under the document
+    version = new_audio_version(current_app.config['AUDIO_OUTPUT_FOLDER'], document_id)
+    checkpoint = _segment_checkpoint(document_id, language, tts_service)
+    playlist_url = url_for('tts.get_audio_file', filename=_playlist_file(document_id, version))
+
+    def generate():
+        audio_segments = []
+
+        # Players can open the playlist right away; it grows with every segment
+        yield _format_event('start', {
+            'document_id': document_id,
+            'language': language,
+            'total_segments': len(translated_segments),
+            'playlist_url': playlist_url
+        }, stream_format)
+
+        try:
+            for audio_segment in _iter_version_segments(
+                tts_service,
+                document_id,
+                version,
+                translated_segments,
+                original_segments,
+                language,
+                checkpoint
+            ):
+                if 'audio_file' in audio_segment:
+                    audio_segment.audio_url = url_for('tts.get_audio_file', filename=audio_segment.audio_file)
+
+                audio_segments.append(audio_segment)
+                yield _format_event('segment', audio_segment, stream_format)
+
+            # Save segment info
+            _publish_segments(document_id, version, {
+                'document_id': document_id,
+                'language': language,
+                'segment_type': 'sentence',
+                'segments': audio_segments,
+                'playlist': _playlist_file(document_id, version)
+            })
+            _finish_checkpoint(checkpoint, audio_segments)
+
+            yield _format_event('done', {
+                'document_id': document_id,
+                'total_segments': len(audio_segments),
+                'audio_directory': document_id,
+                'version': version,
+                'playlist_url': playlist_url
+            }, stream_format)
+
+        except Exception as e:
+            yield _format_event('error', {
+                'error': 'TTS generation failed',
+                'details': str(e)
+            }, stream_format)
+
+    mimetype = 'application/x-ndjson' if stream_format == 'ndjson' else 'text/event-stream'
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Stop reverse proxies from buffering the stream
+        }
+    )
+
+@tts_bp.route('/tts/generate-document/stream', methods=['POST'])
+def generate_document_tts_stream():
+    """
+    Streaming variant of /tts/generate-document (sentence segments only)
+
+    Emits server-sent events (or NDJSON with "format": "ndjson") so playback
+    can start on the first segment while the rest is still being synthesized.
+
+    Request body:
+        {
+            "document_id": "unique_doc_id",
+            "language": "es",
+            "service": "gtts",
+            "format": "sse"
+        }
+
+    Returns:
+        Stream of start, segment, done and error events
+    """
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        document_id = data.get('document_id')
+        language = data.get('language', 'en')
+        service = data.get('service', 'gtts')
+        stream_format = data.get('format', 'sse')
+
+        if not document_id:
+            return jsonify({'error': 'No document_id provided'}), 400
+
+        # Load translation file
+        translation_file_path = os.path.join(
+            current_app.config['TRANSLATION_OUTPUT_FOLDER'],
+            f"{document_id}_{language}_translation.json"
+        )
+
+        if not os.path.exists(translation_file_path):
+            return jsonify({'error': 'Translation not found. Please translate the document first.'}), 404
+
+        with open(translation_file_path, 'r', encoding='utf-8') as f:
+            translation_data = json.load(f)
+
+        if translation_data.get('complete') is False:
+            return _incomplete_translation_response(translation_data)
+
+        translated_text = translation_data.get('translated_text', translation_data.get('full_text', ''))
+        original_text = translation_data.get('original_text', '')
+
+        return _stream_sentence_segments(
+            document_id,
+            translated_text,
+            original_text,
+            language,
+            service,
+            stream_format
+        )
+
+    except Exception as e:
+        return jsonify({
+            'error': 'Document TTS generation failed',
+            'details': str(e)
+        }), 500
+
+@tts_bp.route('/tts/generate-custom/stream', methods=['POST'])
+def generate_custom_tts_stream():
+    """
+    Streaming variant of /tts/generate-custom (sentence segments only)
+
+    Request body:
+        {
+            "document_id": "unique_doc_id",
+            "translated_text": "Custom translated text",
+            "original_text": "Original text",
+            "language": "es",
+            "service": "gtts",
+            "format": "sse"
+        }
+
+    Returns:
+        Stream of start, segment, done and error events
+    """
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        document_id = data.get('document_id')
+        translated_text = data.get('translated_text', '')
+        original_text = data.get('original_text', '')
+        language = data.get('language', 'en')
+        service = data.get('service', 'gtts')
+        stream_format = data.get('format', 'sse')
+
+        if not document_id or not translated_text:
+            return jsonify({'error': 'document_id and translated_text are required'}), 400
+
+        return _stream_sentence_segments(
+            document_id,
+            translated_text,
+            original_text,
+            language,
+            service,
+            stream_format
+        )
+
     except Exception as e:
         return jsonify({
             'error': 'Custom TTS generation failed',
             'details': str(e)
         }), 500
 
+@tts_bp.route('/tts/playlist/<document_id>', methods=['GET'])
+def get_document_playlist(document_id):
+    """
+    Redirect to the HLS playlist of a document's current audio version
+
+    That is a newer generation still in progress (its playlist grows as
+    segments are synthesized and ends with #EXT-X-ENDLIST when done), or
+    else the published version from segments.json. A newer version whose
+    playlist ended without being published, or stopped growing for
+    PLAYLIST_STALE_SECONDS, was abandoned and is skipped.
+
+    Args:
+        document_id: Unique document identifier
+
+    Returns:
+        Redirect to /tts/audio/<document_id>/<version>/playlist.m3u8
+    """
+    try:
+        doc_audio_dir = os.path.join(current_app.config['AUDIO_OUTPUT_FOLDER'], os.path.basename(document_id))
+
+        published = None
+        segment_info_path = os.path.join(doc_audio_dir, 'segments.json')
+        if os.path.exists(segment_info_path):
+            with open(segment_info_path, 'r', encoding='utf-8') as f:
+                published = json.load(f).get('version')
+
+        version = _generating_version(doc_audio_dir, published) or published
+        if not version or not os.path.exists(os.path.join(doc_audio_dir, version, PLAYLIST_FILENAME)):
+            return jsonify({'error': 'Playlist not found'}), 404
+
+        response = redirect(url_for('tts.get_audio_file', filename=_playlist_file(document_id, version)))
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to retrieve playlist',
+            'details': str(e)
+        }), 500
+
+def _generating_version(doc_audio_dir: str, published):
+    """Newest version newer than the published one whose playlist is still growing"""
+    stale_seconds = current_app.config['PLAYLIST_STALE_SECONDS']
+    names = os.listdir(doc_audio_dir) if os.path.isdir(doc_audio_dir) else []
+
+    # Version names start with their creation time, so they sort oldest first
+    for name in sorted(names, reverse=True):
+        if published and name <= published:
+            break
+        playlist_path = os.path.join(doc_audio_dir, name, PLAYLIST_FILENAME)
+        if not os.path.exists(playlist_path):
+            continue
+        if time.time() - os.path.getmtime(playlist_path) > stale_seconds:
+            continue
+        with open(playlist_path, 'r', encoding='utf-8') as f:
+            if '#EXT-X-ENDLIST' not in f.read():
+                return name
+    return None
+
 @tts_bp.route('/tts/segments/<document_id>', methods=['GET'])
 def get_document_segments(document_id):
     """
@@ -1,12 +1,94 @@
 from flask import Blueprint, request, jsonify, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
 import os
 from app.services.pdf_processor import PDFProcessor
 from app.utils.helpers import allowed_file, generate_unique_filename
+from app.utils.files import atomic_output
+from app.services.upload_sessions import UploadOffsetError, UploadSessionStore
 
 upload_bp = Blueprint('upload', __name__)
 pdf_processor = PDFProcessor()
 
+def _session_store() -> UploadSessionStore:
+    return UploadSessionStore(
+        current_app.config['UPLOAD_FOLDER'],
+        max_size=current_app.config['MAX_UPLOAD_SIZE'],
+        ttl_seconds=current_app.config['UPLOAD_SESSION_TTL']
+    )
+
+def _session_response(status: dict) -> dict:
+    return {
+        'upload_id': status['upload_id'],
+        'filename': status['filename'],
+        'size': status['size'],
+        'offset': status['offset'],
+        'complete': status['complete'],
+        'chunk_size': current_app.config['UPLOAD_CHUNK_SIZE']
+    }
+
+def _extract_uploaded(file_path: str, filename: str):
+    """
+    Extract text from a saved upload and build the upload response
+
+    Args:
+        file_path: Path of the PDF in the upload folder
+        filename: Sanitized original file name
+
+    Returns:
+        Flask response tuple
+    """
+    unique_filename = os.path.basename(file_path)
+    document_id = os.path.splitext(unique_filename)[0]
+    text_output_path = os.path.join(
+        current_app.config['TRANSLATION_OUTPUT_FOLDER'],
+        f"{document_id}_extracted.json"
+    )
+
+    # Long documents are extracted page by page straight to disk
+    try:
+        streaming = pdf_processor.page_count(file_path) >= current_app.config['STREAMING_EXTRACTION_MIN_PAGES']
+    except Exception:
+        streaming = False
+
+    def extract(method):
+        if streaming:
+            return pdf_processor.extract_to_file(file_path, text_output_path, method=method)
+        text_data = pdf_processor.extract_text(file_path, method=method)
+        pdf_processor.save_extracted_text(text_data, text_output_path)
+        return text_data
+
+    # Extract text from PDF
+    try:
+        text_data = extract('pdfplumber')
+    except Exception as extract_error:
+        # Try fallback method
+        try:
+            text_data = extract('pypdf2')
+        except Exception as fallback_error:
+            return jsonify({
+                'error': 'Failed to extract text from PDF',
+                'details': str(fallback_error)
+            }), 500
+
+    # Prepare response
+    response = {
+        'success': True,
+        'document_id': document_id,
+        'filename': filename,
+        'total_pages': text_data['total_pages'],
+        'total_chars': text_data['total_chars'],
+        'metadata': text_data['metadata'],
+        'normalization': pdf_processor.normalization_summary(text_data),
+        'streamed': streaming
+    }
+    if not streaming:
+        # Streamed documents leave the text on disk (GET /document/<document_id>)
+        response['full_text'] = text_data['full_text']
+        response['pages'] = text_data['pages']
+
+    return jsonify(response), 200
+
 @upload_bp.route('/upload', methods=['POST'])
 def upload_file():
     """
@@ -36,44 +118,10 @@ def upload_file():
         file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
 
         # Save uploaded file
-        file.save(file_path)
+        with atomic_output(file_path) as temp_path:
+            file.save(temp_path)
 
-        # Extract text from PDF
-        try:
-            text_data = pdf_processor.extract_text(file_path, method='pdfplumber')
-        except Exception as extract_error:
-            # Try fallback method
-            try:
-                text_data = pdf_processor.extract_text(file_path, method='pypdf2')
-            except Exception as fallback_error:
-                return jsonify({
-                    'error': 'Failed to extract text from PDF',
-                    'details': str(fallback_error)
-                }), 500
-
-        # Save extracted text
-        text_output_path = os.path.join(
-            current_app.config['TRANSLATION_OUTPUT_FOLDER'],
-            f"{os.path.splitext(unique_filename)[0]}_extracted.json"
-        )
-        pdf_processor.save_extracted_text(text_data, text_output_path)
-
-        # Generate document ID
-        document_id = os.path.splitext(unique_filename)[0]
-
-        # Prepare response
-        response = {
-            'success': True,
-            'document_id': document_id,
-            'filename': filename,
-            'total_pages': text_data['total_pages'],
-            'total_chars': text_data['total_chars'],
-            'full_text': text_data['full_text'],
-            'pages': text_data['pages'],
-            'metadata': text_data['metadata']
-        }
-
-        return jsonify(response), 200
+        return _extract_uploaded(file_path, filename)
 
     except Exception as e:
         return jsonify({
@@ -116,3 +164,170 @@ def get_document(document_id):
             'error': 'Failed to retrieve document',
             'details': str(e)
         }), 500
+
+@upload_bp.route('/upload/sessions', methods=['POST'])
+def create_upload_session():
+    """
+    Start a resumable chunked upload
+
+    Expected JSON:
+        {
+            "filename": "book.pdf",
+            "size": 314572800,
+            "sha256": "..."  (optional, verified at finalize)
+        }
+
+    Returns:
+        JSON response with upload_id, offset and the suggested chunk_size
+    """
+    try:
+        data = request.get_json() or {}
+        filename = secure_filename(data.get('filename') or '')
+
+        if not filename:
+            return jsonify({'error': 'No filename provided'}), 400
+        if not allowed_file(filename, current_app.config['ALLOWED_EXTENSIONS']):
+            return jsonify({'error': 'Invalid file type. Only PDF files are allowed'}), 400
+        if not isinstance(data.get('size'), int):
+            return jsonify({'error': 'size (bytes) is required'}), 400
+
+        status = _session_store().create(filename, data['size'], sha256=data.get('sha256'))
+        return jsonify({'success': True, **_session_response(status)}), 201
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to start upload',
+            'details': str(e)
+        }), 500
+
+@upload_bp.route('/upload/sessions/<upload_id>', methods=['GET'])
+def get_upload_session(upload_id):
+    """
+    Get an upload's current offset (where to resume after a dropped connection)
+
+    Args:
+        upload_id: Upload session identifier
+
+    Returns:
+        JSON response with the session's offset and size
+    """
+    try:
+        status = _session_store().status(upload_id)
+        return jsonify({'success': True, **_session_response(status)}), 200
+
+    except FileNotFoundError:
+        return jsonify({'error': 'Upload session not found'}), 404
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to get upload session',
+            'details': str(e)
+        }), 500
+
+@upload_bp.route('/upload/sessions/<upload_id>', methods=['PUT'])
+def upload_chunk(upload_id):
+    """
+    Append a chunk to an upload
+
+    The raw request body is the chunk. It is streamed to disk, so chunks
+    only need to fit MAX_CONTENT_LENGTH, not memory.
+
+    Query parameters:
+        offset: Byte offset the chunk starts at (must match the session's offset)
+
+    Headers:
+        X-Chunk-SHA256: Hex SHA-256 of the chunk (optional)
+
+    Args:
+        upload_id: Upload session identifier
+
+    Returns:
+        JSON response with the new offset; 409 with the current offset if it
+        doesn't match, 413 if the chunk is larger than MAX_CONTENT_LENGTH
+    """
+    try:
+        offset = request.args.get('offset', type=int)
+        if offset is None:
+            return jsonify({'error': 'offset query parameter is required'}), 400
+
+        status = _session_store().write_chunk(
+            upload_id,
+            offset,
+            request.stream,
+            length=request.content_length,
+            chunk_sha256=request.headers.get('X-Chunk-SHA256')
+        )
+        return jsonify({'success': True, **_session_response(status)}), 200
+
+    except FileNotFoundError:
+        return jsonify({'error': 'Upload session not found'}), 404
+    except UploadOffsetError as e:
+        return jsonify({'error': str(e), 'offset': e.offset}), 409
+    except RequestEntityTooLarge:
+        return jsonify({
+            'error': f"Chunk too large (limit {current_app.config['MAX_CONTENT_LENGTH']} bytes)"
+        }), 413
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to store chunk',
+            'details': str(e)
+        }), 500
+
+@upload_bp.route('/upload/sessions/<upload_id>/finalize', methods=['POST'])
+def finalize_upload(upload_id):
+    """
+    Verify a complete upload and extract its text
+
+    Args:
+        upload_id: Upload session identifier
+
+    Returns:
+        The same JSON response as POST /upload
+    """
+    try:
+        store = _session_store()
+        status = store.status(upload_id)
+
+        unique_filename = generate_unique_filename(status['filename'])
+        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
+        store.finalize(upload_id, file_path)
+
+        return _extract_uploaded(file_path, status['filename'])
+
+    except FileNotFoundError:
+        return jsonify({'error': 'Upload session not found'}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except TimeoutError:
+        return jsonify({'error': 'A chunk is still being written for this upload'}), 409
+    except Exception as e:
+        return jsonify({
+            'error': 'Internal server error',
+            'details': str(e)
+        }), 500
+
+@upload_bp.route('/upload/sessions/<upload_id>', methods=['DELETE'])
+def abort_upload(upload_id):
+    """
+    Cancel an upload and discard the received data
+
+    Args:
+        upload_id: Upload session identifier
+
+    Returns:
+        JSON response confirming the upload was removed
+    """
+    try:
+        _session_store().abort(upload_id)
+        return jsonify({'success': True, 'upload_id': upload_id}), 200
+
+    except FileNotFoundError:
+        return jsonify({'error': 'Upload session not found'}), 404
+    except Exception as e:
+        return jsonify({
+            'error': 'Failed to cancel upload',
+            'details': str(e)
+        }), 500
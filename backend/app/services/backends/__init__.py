@@ -0,0 +1 @@
+# Provider backends, each imported only when first used (see app.services.providers)
@@ -0,0 +1,52 @@
+from typing import Dict, List
+import os
+import deepl
+
+class DeepLBackend:
+    """DeepL API (requires DEEPL_API_KEY)"""
+
+    languages: List[str] = [
+        'en', 'de', 'fr', 'es', 'pt', 'it', 'nl', 'pl', 'ru',
+        'ja', 'zh', 'bg', 'cs', 'da', 'el', 'et', 'fi', 'hu',
+        'id', 'ko', 'lt', 'lv', 'nb', 'ro', 'sk', 'sl', 'sv',
+        'tr', 'uk'
+    ]
+
+    def __init__(self):
+        api_key = os.environ.get('DEEPL_API_KEY')
+        if not api_key:
+            raise ValueError("DeepL API key not found in environment variables")
+        self.translator = deepl.Translator(api_key)
+
+    def translate(self, text: str, target_lang: str, source_lang: str) -> Dict:
+        """
+        Translate text
+
+        Raises:
+            ValueError: If DeepL rejects the input (e.g. an unsupported language)
+        """
+        try:
+            # DeepL language codes are uppercase
+            target_lang_upper = target_lang.upper()
+            source_lang_param = None if source_lang == 'auto' else source_lang.upper()
+
+            result = self.translator.translate_text(
+                text,
+                target_lang=target_lang_upper,
+                source_lang=source_lang_param
+            )
+
+            return {
+                'translated_text': result.text,
+                'source_lang': result.detected_source_lang.lower() if result.detected_source_lang else source_lang,
+                'target_lang': target_lang,
+                'service': 'deepl'
+            }
+        except ValueError:
+            raise
+        except deepl.DeepLException as e:
+            if e.http_status_code == 400:
+                raise ValueError(f"DeepL rejected the request: {str(e)}")
+            raise Exception(f"DeepL translation error: {str(e)}")
+        except Exception as e:
+            raise Exception(f"DeepL translation error: {str(e)}")
@@ -0,0 +1,51 @@
+from typing import Dict, List
+from deep_translator import GoogleTranslator, single_detection
+from deep_translator.exceptions import LanguageNotSupportedException, NotValidLength, NotValidPayload
+
+class GoogleTranslateBackend:
+    """Google Translate through deep-translator (free, no API key needed)"""
+
+    languages: List[str] = [
+        'en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ja', 'ko',
+        'zh-cn', 'zh-tw', 'ar', 'hi', 'nl', 'pl', 'tr', 'vi',
+        'th', 'id', 'ms', 'sv', 'no', 'da', 'fi'
+    ]
+
+    def translate(self, text: str, target_lang: str, source_lang: str) -> Dict:
+        """
+        Translate text (a translator object is created per request)
+
+        Raises:
+            ValueError: If Google rejects the input (unsupported language, text too long)
+        """
+        try:
+            # deep-translator requires source language (use 'auto' for auto-detection)
+            translator = GoogleTranslator(
+                source=source_lang if source_lang != 'auto' else 'auto',
+                target=target_lang
+            )
+            translated_text = translator.translate(text)
+
+            # Detect source language if auto was used
+            detected_source = source_lang
+            if source_lang == 'auto':
+                try:
+                    detected_source = single_detection(text, api_key=None)
+                except:
+                    detected_source = 'unknown'
+
+            return {
+                'translated_text': translated_text,
+                'source_lang': detected_source,
+                'target_lang': target_lang,
+                'service': 'google',
+                'confidence': None
+            }
+        except (LanguageNotSupportedException, NotValidLength, NotValidPayload) as e:
+            raise ValueError(f"Google Translate rejected the request: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Google Translate error: {str(e)}")
+
+    def detect(self, text: str) -> str:
+        """Detect the language of text"""
+        return single_detection(text, api_key=None)
@@ -0,0 +1,56 @@
+from typing import Dict, List
+import os
+from gtts import gTTS
+from app.services.gtts_engine import get_gtts_engine
+from app.utils.audio import get_mp3_duration
+
+class GTTSBackend:
+    """Google Text-to-Speech through gTTS (free)"""
+
+    languages: List[str] = [
+        'en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ja', 'ko',
+        'zh-cn', 'zh-tw', 'ar', 'hi', 'nl', 'pl', 'tr', 'vi',
+        'th', 'id', 'sv', 'no', 'da', 'fi', 'cs', 'el', 'he',
+        'hu', 'ro', 'sk', 'uk', 'bn', 'ta', 'te', 'mr', 'gu'
+    ]
+
+    def __init__(self, gtts_connections: int = 4, **options):
+        """
+        Initialize backend
+
+        Args:
+            gtts_connections: Concurrent gTTS token requests per host (0 uses plain gTTS.save)
+            options: Options meant for other TTS backends (ignored)
+        """
+        self.gtts_connections = gtts_connections
+
+    def synthesize(self, text: str, language: str, output_path: str, slow: bool = False) -> Dict:
+        """
+        Generate speech into output_path
+
+        Raises:
+            ValueError: If gTTS rejects the input (e.g. an unsupported language)
+        """
+        try:
+            if self.gtts_connections > 0:
+                # Same tokens as gTTS, fetched concurrently over a pooled session
+                engine = get_gtts_engine(max_connections=self.gtts_connections)
+                engine.save(text, language, output_path, slow)
+            else:
+                tts = gTTS(text=text, lang=language, slow=slow)
+                tts.save(output_path)
+
+            file_size = os.path.getsize(output_path)
+
+            return {
+                'success': True,
+                'audio_path': output_path,
+                'language': language,
+                'service': 'gtts',
+                'file_size': file_size,
+                'duration': get_mp3_duration(output_path)  # gTTS doesn't report it, read it from the frames
+            }
+        except ValueError:
+            raise
+        except Exception as e:
+            raise Exception(f"gTTS error: {str(e)}")
@@ -0,0 +1,32 @@
+from typing import Iterator
+from contextlib import contextmanager
+import pdfplumber
+
+class PdfplumberPages:
+    """Page text through pdfplumber (better for complex layouts)"""
+
+    @contextmanager
+    def open(self, pdf_path: str):
+        """
+        Open a PDF for page-at-a-time reading
+
+        Yields:
+            Tuple of (metadata, total pages, iterator over page texts)
+        """
+        with pdfplumber.open(pdf_path) as pdf:
+            yield pdf.metadata or {}, len(pdf.pages), self._page_texts(pdf)
+
+    @staticmethod
+    def _page_texts(pdf) -> Iterator[str]:
+        """Text of each page, dropping the page's parsed objects once it is read"""
+        for page in pdf.pages:
+            try:
+                yield page.extract_text() or ''
+            finally:
+                # pdfplumber caches every char and layout object on the page, which
+                # for dense pages is megabytes that would otherwise live until close
+                page.close()
+                textmap_cache = getattr(page, 'get_textmap', None)
+                if hasattr(textmap_cache, 'cache_clear'):
+                    textmap_cache.cache_clear()
+
@@ -0,0 +1,23 @@
+from contextlib import contextmanager
+import PyPDF2
+
+class PyPDF2Pages:
+    """Page text through PyPDF2 (fallback method)"""
+
+    @contextmanager
+    def open(self, pdf_path: str):
+        """
+        Open a PDF for page-at-a-time reading
+
+        Yields:
+            Tuple of (metadata, total pages, iterator over page texts)
+        """
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            page_texts = (page.extract_text() or '' for page in pdf_reader.pages)
+            yield pdf_reader.metadata or {}, len(pdf_reader.pages), page_texts
+
+    def page_count(self, pdf_path: str) -> int:
+        """Number of pages, read from the page tree without parsing any page content"""
+        with open(pdf_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
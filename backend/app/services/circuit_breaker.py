@@ -0,0 +1,162 @@
+from typing import Dict
+import threading
+import time
+from contextlib import contextmanager
+from app.utils.cancellation import is_cancelled
+from app.utils.metrics import PROVIDER_CIRCUIT_OPEN
+
+class CircuitOpenError(Exception):
+    """A provider's circuit is open; the call was not attempted"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    Stops calling a provider that keeps failing
+
+    After failure_threshold consecutive failures the circuit opens and
+    calls fail immediately with CircuitOpenError instead of waiting on a
+    provider that is down. After reset_seconds one trial call is let
+    through (half-open): if it works the circuit closes, otherwise it
+    opens again for another reset_seconds.
+    """
+
+    def __init__(self, kind: str, provider: str, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        """
+        Initialize circuit breaker
+
+        Args:
+            kind: Provider kind ('translation' or 'tts')
+            provider: Provider name
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: Time the circuit stays open before a trial call
+        """
+        self.kind = kind
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def guard(self):
+        """
+        Run a provider call through the circuit
+
+        A call that fails because its own request or job was cancelled (or
+        ran out of time), or that the provider rejected for its input
+        (backends raise ValueError, e.g. for an unsupported language), says
+        nothing about the provider's health and isn't counted.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or half-open with its trial call running)
+        """
+        trial = self._before_call()
+        try:
+            yield
+        except ValueError:
+            self._record_nothing(trial)
+            raise
+        except BaseException:
+            if is_cancelled():
+                self._record_nothing(trial)
+            else:
+                self._record(False, trial)
+            raise
+        self._record(True, trial)
+
+    def _before_call(self) -> bool:
+        with self._lock:
+            if self.state == 'closed':
+                return False
+
+            remaining = self.opened_at + self.reset_seconds - time.monotonic()
+            if self.state == 'open' and remaining <= 0:
+                self.state = 'half_open'
+            if self.state == 'half_open' and not self._trial_running:
+                self._trial_running = True
+                return True
+
+            raise CircuitOpenError(
+                f"{self.provider} {self.kind} circuit is open after {self.failures} consecutive failures",
+                max(remaining, 1.0)
+            )
+
+    def _record_nothing(self, trial: bool):
+        with self._lock:
+            if trial:
+                # Let the next call be the trial
+                self._trial_running = False
+
+    def _record(self, success: bool, trial: bool):
+        with self._lock:
+            if trial:
+                self._trial_running = False
+            if success:
+                self.state = 'closed'
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.failures += 1
+                if trial or self.failures >= self.failure_threshold:
+                    self.state = 'open'
+                    self.opened_at = time.monotonic()
+            PROVIDER_CIRCUIT_OPEN.set(0 if self.state == 'closed' else 1, kind=self.kind, provider=self.provider)
+
+    def snapshot(self) -> Dict:
+        """Current state, consecutive failures and seconds until the next trial call"""
+        with self._lock:
+            retry_in = None
+            if self.opened_at is not None:
+                retry_in = max(self.opened_at + self.reset_seconds - time.monotonic(), 0.0)
+            return {'state': self.state, 'failures': self.failures, 'retry_in_seconds': retry_in}
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per provider, created on first use"""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def configure(self, failure_threshold: int, reset_seconds: float):
+        """
+        Set the thresholds for all circuits
+
+        Args:
+            failure_threshold: Consecutive failures that open a circuit
+            reset_seconds: Time a circuit stays open before a trial call
+        """
+        with self._lock:
+            self.failure_threshold = failure_threshold
+            self.reset_seconds = reset_seconds
+            for breaker in self._breakers.values():
+                breaker.failure_threshold = failure_threshold
+                breaker.reset_seconds = reset_seconds
+
+    def get(self, kind: str, provider: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get((kind, provider))
+            if breaker is None:
+                breaker = CircuitBreaker(kind, provider, self.failure_threshold, self.reset_seconds)
+                self._breakers[(kind, provider)] = breaker
+            return breaker
+
+    def guard(self, kind: str, provider: str):
+        """Run a provider call through its circuit (see CircuitBreaker.guard)"""
+        return self.get(kind, provider).guard()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """State of every circuit used so far, keyed by 'kind:provider'"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {f"{breaker.kind}:{breaker.provider}": breaker.snapshot() for breaker in breakers}
+
+# Shared by every TranslationService and TextToSpeechService instance
+provider_circuits = CircuitBreakerRegistry()
@@ -0,0 +1,156 @@
+from typing import Dict, List, Optional
+import base64
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from gtts import gTTS
+from gtts.utils import _translate_url
+from app.utils.cancellation import check_cancelled, time_left
+from app.utils.tracing import propagate, span
+
+# Audio payload inside the batchexecute response (same pattern gTTS uses)
+_AUDIO_PATTERN = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+class ConcurrentGTTS:
+    """
+    gTTS-compatible synthesis engine with concurrent token fetching
+
+    Text is pre-processed and tokenized exactly like gTTS (by gTTS itself),
+    but the ~100-character token requests are sent concurrently over one
+    shared keep-alive session instead of one at a time on a fresh session.
+    The decoded audio is written to the output file in token order.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 4,
+        timeout: float = 30.0,
+        tld: str = 'com',
+        base_url: Optional[str] = None
+    ):
+        """
+        Initialize engine
+
+        Args:
+            max_connections: Maximum concurrent connections to the TTS host
+            timeout: Seconds to wait for each token request
+            tld: Google Translate top-level domain (same as gTTS)
+            base_url: Override for the batchexecute endpoint (used by benchmarks)
+        """
+        self.max_connections = max(1, max_connections)
+        self.timeout = timeout
+        self.tld = tld
+        self.url = base_url or _translate_url(
+            tld=tld,
+            path="_/TranslateWebserverUi/data/batchexecute"
+        )
+
+        # One pooled session; the adapter caps connections per host and blocks beyond it
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_connections,
+            pool_block=True
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(gTTS.GOOGLE_TTS_HEADERS)
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_connections,
+            thread_name_prefix='gtts-fetch'
+        )
+
+    def get_bodies(self, text: str, language: str, slow: bool = False) -> List[str]:
+        """
+        Tokenize text and build the request bodies exactly as gTTS would
+
+        Args:
+            text: Text to speak
+            language: Language code
+            slow: Speak slowly
+
+        Returns:
+            List of form-encoded request bodies, one per token
+        """
+        tts = gTTS(text=text, lang=language, slow=slow, tld=self.tld)
+        return [tts._package_rpc(part) for part in tts._tokenize(tts.text)]
+
+    def save(self, text: str, language: str, output_path: str, slow: bool = False) -> Dict:
+        """
+        Synthesize text and write the MP3 to output_path
+
+        Args:
+            text: Text to speak
+            language: Language code
+            output_path: Path to save the audio file
+            slow: Speak slowly
+
+        Returns:
+            Dictionary with the number of tokens fetched and bytes written
+        """
+        bodies = self.get_bodies(text, language, slow)
+        if not bodies:
+            raise ValueError("No text to send to TTS API")
+        check_cancelled()
+
+        futures = [self.executor.submit(propagate(self._fetch), body) for body in bodies]
+        bytes_written = 0
+
+        try:
+            with open(output_path, 'wb') as f:
+                # Results arrive in any order; write them in token order
+                for future in futures:
+                    audio = future.result()
+                    f.write(audio)
+                    bytes_written += len(audio)
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+        return {
+            'tokens': len(bodies),
+            'bytes': bytes_written
+        }
+
+    def _fetch(self, body: str) -> bytes:
+        """Send one token request and decode its audio (the timeout never runs past the current deadline)"""
+        timeout = time_left(self.timeout)
+        with span('tts.fetch', request_bytes=len(body)) as fetch_span:
+            response = self.session.post(self.url, data=body, timeout=timeout)
+            fetch_span.set(status_code=response.status_code, response_bytes=len(response.content))
+        if response.status_code != 200:
+            raise Exception(f"{response.status_code} ({response.reason}) from TTS API")
+
+        audio = b''
+        for line in response.text.splitlines():
+            if 'jQ1olc' in line:
+                match = _AUDIO_PATTERN.search(line)
+                if not match:
+                    raise Exception("No audio stream in TTS API response")
+                audio += base64.b64decode(match.group(1).encode('ascii'))
+
+        return audio
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_gtts_engine(max_connections: int = 4, base_url: Optional[str] = None) -> ConcurrentGTTS:
+    """
+    Get a shared engine so keep-alive connections are reused across requests
+
+    Args:
+        max_connections: Maximum concurrent connections to the TTS host
+        base_url: Override for the batchexecute endpoint
+
+    Returns:
+        Shared ConcurrentGTTS instance for these settings
+    """
+    key = (max_connections, base_url)
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = ConcurrentGTTS(max_connections=max_connections, base_url=base_url)
+        return _engines[key]
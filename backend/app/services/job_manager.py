@@ -0,0 +1,205 @@
+from typing import Callable, Dict, Optional
+import threading
+import uuid
+from datetime import datetime
+from app.utils.cancellation import CancelledError, CancelToken, set_token
+from app.utils.metrics import QUEUE_DEPTH
+from app.utils.tracing import propagate
+
+class Job:
+    """A unit of background work tracked by the JobManager"""
+
+    def __init__(self, job_type: str, params: Optional[Dict] = None, deadline: Optional[float] = None):
+        self.id = str(uuid.uuid4())
+        self.type = job_type
+        self.params = params or {}
+        self.cancel_token = CancelToken(deadline, f"{job_type} job")
+        self.status = 'queued'
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def update_progress(self, **progress):
+        """
+        Merge progress fields into the job state
+
+        Args:
+            **progress: Progress fields to set
+        """
+        with self._lock:
+            self.progress.update(progress)
+
+    def append_progress(self, key: str, item):
+        """
+        Append an item to a list-valued progress field
+
+        Args:
+            key: Progress field name
+            item: Item to append
+        """
+        with self._lock:
+            self.progress.setdefault(key, []).append(item)
+
+    def set_progress_item(self, key: str, item_key: str, value):
+        """
+        Set one entry of a dict-valued progress field
+
+        Args:
+            key: Progress field name
+            item_key: Entry key within the field
+            value: Entry value
+        """
+        with self._lock:
+            self.progress.setdefault(key, {})[item_key] = value
+
+    def cancel(self, reason: str = 'cancelled by client'):
+        """
+        Ask the job to stop
+
+        Queued and in-flight provider calls of the job stop at their next
+        check; units already finished stay in the job's checkpoints.
+
+        Args:
+            reason: Why, reported as the job error
+        """
+        self.cancel_token.cancel(reason)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('completed', 'failed', 'cancelled')
+
+    def to_dict(self) -> Dict:
+        """
+        Get a JSON-serializable snapshot of the job
+
+        Returns:
+            Dictionary with job state
+        """
+        with self._lock:
+            return {
+                'job_id': self.id,
+                'type': self.type,
+                'status': self.status,
+                'params': self.params,
+                'deadline_seconds': self.cancel_token.timeout,
+                'progress': {
+                    key: list(value) if isinstance(value, list)
+                    else dict(value) if isinstance(value, dict)
+                    else value
+                    for key, value in self.progress.items()
+                },
+                'result': self.result,
+                'error': self.error,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at
+            }
+
+class JobManager:
+    """Runs long document jobs on background threads and keeps their state"""
+
+    def __init__(self, max_jobs: int = 200):
+        """
+        Initialize job manager
+
+        Args:
+            max_jobs: Number of jobs to remember before the oldest finished ones are dropped
+        """
+        self.max_jobs = max_jobs
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        job_type: str,
+        target: Callable,
+        params: Optional[Dict] = None,
+        deadline: Optional[float] = None,
+        **kwargs
+    ) -> Job:
+        """
+        Start a job on a background thread
+
+        The job runs under its own cancel token (not the submitting
+        request's), so it outlives the request and stops only when it is
+        cancelled or its deadline passes.
+
+        Args:
+            job_type: Name of the job type (e.g., 'translate_speak')
+            target: Callable invoked as target(job, **kwargs); its return value becomes the job result
+            params: Request parameters to expose in the job state
+            deadline: Seconds the job may run (None: no limit)
+            **kwargs: Keyword arguments passed to target
+
+        Returns:
+            The submitted Job
+        """
+        job = Job(job_type, params, deadline)
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+
+        thread = threading.Thread(
+            target=propagate(self._run),
+            args=(job, target, kwargs),
+            name=f"job-{job_type}-{job.id[:8]}",
+            daemon=True
+        )
+        thread.start()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job by ID
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The Job, or None if unknown
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: Job, target: Callable, kwargs: Dict):
+        """Execute a job and record its outcome"""
+        with job._lock:
+            job.status = 'running'
+            job.started_at = datetime.now().isoformat()
+        QUEUE_DEPTH.inc(queue='jobs_running')
+        set_token(job.cancel_token)
+
+        try:
+            result = target(job, **kwargs)
+            with job._lock:
+                job.result = result
+                job.status = 'completed'
+        except CancelledError as e:
+            with job._lock:
+                job.error = str(e)
+                job.status = 'cancelled'
+        except Exception as e:
+            with job._lock:
+                job.error = str(e)
+                job.status = 'failed'
+        finally:
+            with job._lock:
+                job.finished_at = datetime.now().isoformat()
+            QUEUE_DEPTH.dec(queue='jobs_running')
+
+    def _prune(self):
+        """Drop the oldest finished jobs once more than max_jobs are tracked"""
+        if len(self._jobs) <= self.max_jobs:
+            return
+
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:len(self._jobs) - self.max_jobs]:
+            del self._jobs[job_id]
+
+# Shared instance used by the routes
+job_manager = JobManager()
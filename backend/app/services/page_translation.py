@@ -0,0 +1,252 @@
+from typing import Dict, List, Optional
+import json
+import os
+import threading
+from app.services.translator import TranslationService
+from app.services.pdf_processor import PDFProcessor
+from app.utils.cancellation import CancelledError, check_cancelled, time_left
+from app.utils.files import atomic_write_json
+from app.utils.metrics import CACHE_HITS, CACHE_MISSES
+
+# Pages being translated right now, shared by requests and prefetch jobs
+_inflight = {}
+# Pages handed to a prefetch job that hasn't reached them yet
+_scheduled = set()
+_inflight_lock = threading.Lock()
+
+class PageTranslationService:
+    """
+    Translate document pages on demand and keep each translated page on disk
+
+    Each page is stored as {document_id}_{lang}_pages/{service}_{source_lang}/page_{n}.json
+    in the translation folder, so a page translated by one service (or from
+    another source language) is never served for another. A page that is
+    already being translated with the same settings (by another request or
+    a prefetch job) is waited for instead of translated twice.
+    """
+
+    def __init__(self, output_folder: str, max_chars: int = 5000, cache=None):
+        """
+        Initialize page translation service
+
+        Args:
+            output_folder: Translation output folder
+            max_chars: Maximum characters per provider request
+            cache: Optional TranslationCache consulted before each provider call
+        """
+        self.output_folder = output_folder
+        self.max_chars = max_chars
+        self.cache = cache
+        self.pdf_processor = PDFProcessor()
+
+    def page_path(
+        self,
+        document_id: str,
+        target_lang: str,
+        page_number: int,
+        source_lang: str = 'auto',
+        service: str = 'google'
+    ) -> str:
+        """Path of one stored page translation"""
+        return os.path.join(
+            self.output_folder,
+            f"{document_id}_{target_lang}_pages",
+            f"{service}_{source_lang}",
+            f"page_{page_number}.json"
+        )
+
+    def get_cached(
+        self,
+        document_id: str,
+        target_lang: str,
+        page_number: int,
+        source_lang: str = 'auto',
+        service: str = 'google'
+    ) -> Optional[Dict]:
+        """
+        Get a translated page from the store
+
+        Args:
+            document_id: Unique document identifier
+            target_lang: Target language code
+            page_number: 1-based page number
+            source_lang: Source language code the page was translated from
+            service: Translation service the page was translated with
+
+        Returns:
+            Translated page, or None if it hasn't been translated with these settings yet
+        """
+        path = self.page_path(document_id, target_lang, page_number, source_lang, service)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def translate_pages(
+        self,
+        document_id: str,
+        text_data: Dict,
+        page_numbers: List[int],
+        target_lang: str,
+        source_lang: str = 'auto',
+        service: str = 'google'
+    ) -> Dict:
+        """
+        Get translations for the given pages, translating only those not stored yet
+
+        Args:
+            document_id: Unique document identifier
+            text_data: Extracted text data
+            page_numbers: 1-based page numbers
+            target_lang: Target language code
+            source_lang: Source language code
+            service: Translation service
+
+        Returns:
+            Dictionary with the translated pages (in page order), the page
+            numbers served from the store, and per-page errors
+        """
+        pages_by_number = {page['page_number']: page for page in text_data['pages']}
+        translator = None
+        translated = []
+        cached = []
+        errors = []
+
+        for page_number in page_numbers:
+            page = pages_by_number.get(page_number)
+            if page is None:
+                errors.append({'page_number': page_number, 'error': 'Page not found'})
+                continue
+
+            result = self.get_cached(document_id, target_lang, page_number, source_lang, service)
+            if result is not None:
+                CACHE_HITS.inc(cache='page_translation')
+                cached.append(page_number)
+                translated.append(result)
+                continue
+
+            CACHE_MISSES.inc(cache='page_translation')
+            if translator is None:
+                translator = TranslationService(service=service, cache=self.cache)
+
+            try:
+                translated.append(self._translate_page(document_id, page, translator, target_lang, source_lang))
+            except CancelledError:
+                raise
+            except Exception as e:
+                errors.append({'page_number': page_number, 'error': str(e)})
+
+        return {
+            'pages': translated,
+            'cached': cached,
+            'errors': errors
+        }
+
+    def _translate_page(
+        self,
+        document_id: str,
+        page: Dict,
+        translator: TranslationService,
+        target_lang: str,
+        source_lang: str
+    ) -> Dict:
+        """Translate and store one page, or wait for the request already doing it"""
+        key = (document_id, target_lang, page['page_number'], source_lang, translator.service)
+
+        with _inflight_lock:
+            event = _inflight.get(key)
+            owner = event is None
+            if owner:
+                event = _inflight[key] = threading.Event()
+
+        if not owner:
+            event.wait(time_left())
+            check_cancelled()
+            result = self.get_cached(document_id, target_lang, page['page_number'], source_lang, translator.service)
+            if result is None:
+                raise Exception("Page translation failed")
+            return result
+
+        try:
+            chunks = self.pdf_processor.split_into_chunks(page['text'], max_chars=self.max_chars)
+            translated_chunks = translator.translate_chunks(chunks, target_lang, source_lang)
+            failed = [chunk for chunk in translated_chunks if chunk.failed]
+            if failed:
+                raise Exception(failed[0].error)
+
+            translated_text = ' '.join(chunk.translated_text for chunk in translated_chunks)
+            result = {
+                'page_number': page['page_number'],
+                'original_text': page['text'],
+                'translated_text': translated_text,
+                'char_count': len(translated_text),
+                'source_lang': translated_chunks[0].get('source_lang', source_lang) if translated_chunks else source_lang,
+                'target_lang': target_lang,
+                'service': translator.service
+            }
+
+            # Write then rename so readers never see a partial page
+            atomic_write_json(
+                self.page_path(document_id, target_lang, page['page_number'], source_lang, translator.service),
+                result
+            )
+
+            return result
+        finally:
+            with _inflight_lock:
+                del _inflight[key]
+            event.set()
+
+    def pages_to_prefetch(
+        self,
+        document_id: str,
+        text_data: Dict,
+        after_page: int,
+        count: int,
+        target_lang: str,
+        source_lang: str = 'auto',
+        service: str = 'google'
+    ) -> List[int]:
+        """
+        Reserve the next pages after the reading position that still need translating
+
+        The returned pages are skipped by later calls until release_prefetch.
+
+        Args:
+            document_id: Unique document identifier
+            text_data: Extracted text data
+            after_page: Last page the reader requested
+            count: Number of pages to look ahead
+            target_lang: Target language code
+            source_lang: Source language code
+            service: Translation service
+
+        Returns:
+            Page numbers that are neither stored, being translated nor scheduled
+        """
+        last_page = len(text_data['pages'])
+        candidates = range(after_page + 1, min(after_page + count, last_page) + 1)
+
+        with _inflight_lock:
+            pages = [
+                page_number for page_number in candidates
+                if (document_id, target_lang, page_number, source_lang, service) not in _inflight
+                and (document_id, target_lang, page_number, source_lang, service) not in _scheduled
+                and not os.path.exists(self.page_path(document_id, target_lang, page_number, source_lang, service))
+            ]
+            _scheduled.update((document_id, target_lang, page_number, source_lang, service) for page_number in pages)
+
+        return pages
+
+    def release_prefetch(
+        self,
+        document_id: str,
+        target_lang: str,
+        page_number: int,
+        source_lang: str = 'auto',
+        service: str = 'google'
+    ):
+        """Mark a page reserved by pages_to_prefetch as handled"""
+        with _inflight_lock:
+            _scheduled.discard((document_id, target_lang, page_number, source_lang, service))
@@ -1,69 +1,716 @@
-import pdfplumber
-import PyPDF2
-import os
-from typing import Dict, List, Optional
 import json
+import os
+import re
+import shutil
+import bisect
+import collections
+import difflib
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+from app.models import Page
+from app.services.providers import provider_registry
+from app.utils.files import atomic_output, atomic_write_json, temp_path_for
+from app.utils.metrics import CHARACTERS_PROCESSED, CHARACTERS_SAVED, timed_stage
+from app.utils.tracing import span, traced
+
+# Everything the normalization pass rewrites; text between matches is copied as is
+_NORMALIZE_PATTERN = re.compile(
+    r'(?P<hyphen>(?<=[^\W\d_])-[ \t]*\n[ \t]*(?=[^\W\d_]))'  # Word split at a line end
+    r'|(?P<newline>[ \t\u00a0]*\n(?:[ \t\u00a0]*\n)*[ \t\u00a0]*)'  # Line breaks with surrounding blanks
+    r'|(?P<space>[ \t\u00a0\u2000-\u200a\u202f\u205f\u3000]{2,}|[\t\u00a0\u2000-\u200a\u202f\u205f\u3000])'
+    r'|(?P<invisible>[\u00ad\u200b-\u200d\u2060\ufeff]+)'  # Soft hyphens and zero-width characters
+    r'|(?P<unicode>.[\u0300-\u036f]+|[^\x00-\x7f])'  # Ligatures, compatibility forms, combining marks
+)
+
+# A blank line after one of these is kept as a paragraph break
+_PARAGRAPH_END = '.!?:"\u201d'
+
+class _ChunkCounter:
+    """Counts the chunks split_into_chunks would make, fed one page at a time"""
+
+    def __init__(self, processor, max_chars: int = 5000):
+        self.processor = processor
+        self.max_chars = max_chars
+        self.chunks = 0
+        self.current = 0
+        self.total = 0
+
+    def add(self, text: str):
+        self.total += len(text)
+        for sentence in self.processor.split_into_sentences(text):
+            if self.current + len(sentence) + 1 <= self.max_chars:
+                self.current += len(sentence) + 1
+            else:
+                if self.current:
+                    self.chunks += 1
+                self.current = len(sentence) + 1
+
+    def count(self) -> int:
+        if self.total <= self.max_chars:
+            return 1
+        return self.chunks + (1 if self.current else 0)
+
+def _page_models(text_data: Dict) -> List[Page]:
+    """The document's pages as Page models, converting any that were built as dicts"""
+    text_data['pages'] = [
+        page if isinstance(page, Page) else Page.from_dict(page)
+        for page in text_data['pages']
+    ]
+    return text_data['pages']
+
+def _boilerplate_key(line: str) -> str:
+    """Comparable form of a header/footer line: lowercase, digits masked"""
+    return ' '.join(re.sub(r'\d+', '#', line.lower()).split())
 
 class PDFProcessor:
     """Service for processing PDF files and extracting text"""
 
-    def __init__(self):
-        self.supported_methods = ['pdfplumber', 'pypdf2']
-
-    def extract_text(self, pdf_path: str, method: str = 'pdfplumber') -> Dict:
+    @property
+    def supported_methods(self) -> List[str]:
+        """Extraction backends available (built-in and from entry points)"""
+        return provider_registry.names('extraction')
+
+    @timed_stage('extract')
+    def extract_text(
+        self,
+        pdf_path: str,
+        method: str = 'pdfplumber',
+        normalize: bool = True,
+        strip_boilerplate: bool = True
+    ) -> Dict:
         """
         Extract text from a PDF file
 
         Args:
             pdf_path: Path to the PDF file
             method: Extraction method to use ('pdfplumber' or 'pypdf2')
+            normalize: Reflow and clean the text (raw text is kept in raw_text)
+            strip_boilerplate: Detect repeated headers/footers and leave them out
+                of the normalized text (they are only marked when not normalizing)
 
         Returns:
             Dictionary containing extracted text and metadata
         """
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        if method not in self.supported_methods:
+            raise ValueError(f"Unsupported extraction method: {method}")
+
+        with span('extract', method=method, file_bytes=os.path.getsize(pdf_path)) as extract_span:
+            text_data = self._collect_pages(pdf_path, method)
+            extract_span.set(pages=text_data['total_pages'], chars=text_data['total_chars'])
+
+        CHARACTERS_PROCESSED.inc(text_data['total_chars'], stage='extract', provider=method)
+
+        if strip_boilerplate:
+            self.detect_boilerplate(text_data)
+
+        if normalize:
+            self.apply_normalization(text_data, remove_boilerplate=strip_boilerplate)
+
+        return text_data
+
+    @timed_stage('extract')
+    def extract_to_file(
+        self,
+        pdf_path: str,
+        output_path: str,
+        method: str = 'pdfplumber',
+        normalize: bool = True,
+        strip_boilerplate: bool = True
+    ) -> Dict:
+        """
+        Extract text straight into a document JSON file, one page at a time
+
+        Writes the same document as extract_text followed by
+        save_extracted_text, but peak memory doesn't grow with the page
+        count: page text is spooled to disk as it is read (only header and
+        footer candidate lines stay in memory for boilerplate detection),
+        then each page is normalized and written out while the full text,
+        raw text and offset map go through their own spool files. Use it
+        for books with hundreds of pages.
+
+        Pages are normalized separately, so a page break is always a
+        paragraph break after a sentence end and a space otherwise (even
+        when a removed footer sat in between), and request savings are
+        counted per page.
 
-        if method == 'pdfplumber':
-            return self._extract_with_pdfplumber(pdf_path)
-        elif method == 'pypdf2':
-            return self._extract_with_pypdf2(pdf_path)
-        else:
+        Args:
+            pdf_path: Path to the PDF file
+            output_path: Path of the document JSON to write
+            method: Extraction method to use ('pdfplumber' or 'pypdf2')
+            normalize: Reflow and clean the text (raw text is kept in raw_text)
+            strip_boilerplate: Detect repeated headers/footers and leave them out
+                of the normalized text (they are only marked when not normalizing)
+
+        Returns:
+            Dictionary with metadata, total_pages, total_chars, boilerplate and
+            normalization (without the offset map); the text is only in the file
+        """
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        if method not in self.supported_methods:
             raise ValueError(f"Unsupported extraction method: {method}")
 
-    def _extract_with_pdfplumber(self, pdf_path: str) -> Dict:
-        """Extract text using pdfplumber (better for complex layouts)"""
-        text_data = {
-            'full_text': '',
-            'pages': [],
-            'metadata': {},
-            'total_pages': 0
+        page_spool, full_spool, raw_spool, map_spool = (temp_path_for(output_path) for _ in range(4))
+        try:
+            with span('extract', method=method, file_bytes=os.path.getsize(pdf_path), streaming=True) as extract_span:
+                metadata, total_pages, candidates = self._spool_pages(pdf_path, method, page_spool)
+                extract_span.set(pages=total_pages)
+
+            marks, distinct = {}, []
+            if strip_boilerplate:
+                marks, distinct = self._find_boilerplate(
+                    candidates, range(1, len(candidates) + 1), None, 0.85
+                )
+            del candidates
+
+            with span('normalize', streaming=True) as normalize_span:
+                summary = self._write_document(
+                    output_path, page_spool, (full_spool, raw_spool, map_spool),
+                    metadata, total_pages, marks, distinct, normalize, strip_boilerplate
+                )
+                normalize_span.set(chars=summary['raw_chars'])
+        finally:
+            for path in (page_spool, full_spool, raw_spool, map_spool):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        CHARACTERS_PROCESSED.inc(summary.pop('raw_chars'), stage='extract', provider=method)
+        if normalize:
+            CHARACTERS_SAVED.inc(summary['normalization']['saved_chars'], stage='normalize')
+        return summary
+
+    def _spool_pages(self, pdf_path: str, method: str, page_spool: str) -> Tuple:
+        """Write each page's text as a JSON line; returns metadata, page count and boilerplate candidates"""
+        candidates = []
+        try:
+            with self._open_pages(pdf_path, method) as (metadata, total_pages, page_texts):
+                with open(page_spool, 'w', encoding='utf-8') as spool:
+                    for page_text in page_texts:
+                        spool.write(json.dumps(page_text, ensure_ascii=False) + '\n')
+                        candidates.append(self._boilerplate_candidates(page_text, 3))
+        except Exception as e:
+            raise Exception(f"Error extracting text with {method}: {str(e)}")
+        return metadata, total_pages, candidates
+
+    def _write_document(
+        self,
+        output_path: str,
+        page_spool: str,
+        text_spools: Tuple[str, str, str],
+        metadata: Dict,
+        total_pages: int,
+        marks: Dict[int, List[Dict]],
+        boilerplate: List[Dict],
+        normalize: bool,
+        strip_boilerplate: bool
+    ) -> Dict:
+        """Normalize spooled pages and write the document JSON (see extract_to_file)"""
+        full_spool, raw_spool, map_spool = text_spools
+
+        def dump(value) -> str:
+            return json.dumps(value, ensure_ascii=False)
+
+        raw_chars = 0
+        raw_lead = None  # Whitespace stripped from the start of the raw text, once known
+        raw_pending = ''  # Trailing whitespace held back until more text follows
+        raw_position = 0  # Offset in the unstripped page concatenation
+        full_chars = 0
+        full_tail = ''
+        previous_raw_end = 0
+        anchor = None  # Last offset map anchor, not yet written
+        anchor_count = 0
+        raw_requests = _ChunkCounter(self)
+        normalized_requests = _ChunkCounter(self)
+
+        with atomic_output(output_path) as temp_path, \
+                open(temp_path, 'w', encoding='utf-8') as out, \
+                open(page_spool, 'r', encoding='utf-8') as pages, \
+                open(full_spool, 'w', encoding='utf-8') as full_out, \
+                open(raw_spool, 'w', encoding='utf-8') as raw_out, \
+                open(map_spool, 'w', encoding='utf-8') as map_out:
+
+            def add_anchor(new_anchor):
+                # Same compaction as normalize_text, applied as anchors stream out
+                nonlocal anchor, anchor_count
+                if anchor is not None:
+                    if new_anchor[1] - anchor[1] == new_anchor[0] - anchor[0]:
+                        return
+                    if new_anchor[0] == anchor[0]:
+                        anchor = new_anchor
+                        return
+                    map_out.write((',' if anchor_count else '') + dump(anchor))
+                    anchor_count += 1
+                anchor = new_anchor
+
+            out.write(f'{{"metadata": {dump(metadata)}, "total_pages": {total_pages}, ')
+            if strip_boilerplate:
+                out.write(f'"boilerplate": {dump(boilerplate)}, ')
+            out.write('"pages": [')
+
+            for page_index, line in enumerate(pages):
+                page_raw = json.loads(line)
+                page_marks = marks.get(page_index, [])
+
+                # Raw text: pages joined by blank lines, stripped at both ends
+                page_raw_start = raw_position - (raw_lead or 0)
+                piece = page_raw + '\n\n'
+                if raw_lead is None:
+                    if piece.strip():
+                        raw_lead = raw_position + len(piece) - len(piece.lstrip())
+                        page_raw_start = raw_position - raw_lead
+                        piece = piece.lstrip()
+                    else:
+                        piece = ''
+                if piece.strip():
+                    content = raw_pending + piece.rstrip()
+                    raw_out.write(dump(content)[1:-1])
+                    raw_chars += len(content)
+                    raw_pending = piece[len(piece.rstrip()):]
+                else:
+                    raw_pending += piece
+                raw_position += len(page_raw) + 2
+
+                page = Page(page_index + 1, page_raw)
+                if strip_boilerplate:
+                    page.boilerplate = page_marks
+
+                if normalize:
+                    removals = [(mark['start'], mark['end']) for mark in page_marks] if strip_boilerplate else []
+                    normalized = self.normalize_text(page_raw, removals)
+                    page.raw_text = page_raw
+                    page.text = normalized['text']
+                    page.char_count = len(normalized['text'])
+                    raw_requests.add(page_raw)
+                    normalized_requests.add(normalized['text'])
+
+                    if normalized['text']:
+                        # Page break becomes a paragraph break after a sentence end, else a space
+                        separator = ('\n' if full_tail in _PARAGRAPH_END else ' ') if full_chars else ''
+                        if separator:
+                            add_anchor([full_chars, previous_raw_end])
+                        full_out.write(dump(separator + normalized['text'])[1:-1])
+                        for normalized_offset, raw_offset in normalized['offset_map']:
+                            add_anchor([
+                                full_chars + len(separator) + normalized_offset,
+                                max(page_raw_start + raw_offset, 0)
+                            ])
+                        full_chars += len(separator) + len(normalized['text'])
+                        full_tail = normalized['text'][-1]
+                        previous_raw_end = page_raw_start + self.map_to_raw(
+                            normalized['offset_map'], len(normalized['text'])
+                        )
+
+                out.write((', ' if page_index else '') + dump(page.to_dict()))
+
+            out.write('], ')
+            if anchor is not None:
+                map_out.write((',' if anchor_count else '') + dump(anchor))
+
+            for spool in (full_out, raw_out, map_out):
+                spool.flush()
+
+            def copy_spool(path: str):
+                with open(path, 'r', encoding='utf-8') as spool:
+                    shutil.copyfileobj(spool, out)
+
+            out.write('"full_text": "')
+            copy_spool(full_spool if normalize else raw_spool)
+            out.write('", ')
+
+            summary = {
+                'metadata': metadata,
+                'total_pages': total_pages,
+                'total_chars': full_chars if normalize else raw_chars,
+                'boilerplate': boilerplate,
+                'raw_chars': raw_chars
+            }
+            out.write(f'"total_chars": {summary["total_chars"]}')
+
+            if normalize:
+                out.write(', "raw_text": "')
+                copy_spool(raw_spool)
+                out.write('", ')
+
+                raw_request_count = raw_requests.count() + total_pages
+                normalized_request_count = normalized_requests.count() + total_pages
+                summary['normalization'] = {
+                    'raw_chars': raw_chars,
+                    'normalized_chars': full_chars,
+                    'saved_chars': raw_chars - full_chars,
+                    'saved_ratio': (raw_chars - full_chars) / raw_chars if raw_chars else 0.0,
+                    'raw_requests': raw_request_count,
+                    'normalized_requests': normalized_request_count,
+                    'saved_requests': raw_request_count - normalized_request_count,
+                    'boilerplate_lines_removed': sum(len(page_marks) for page_marks in marks.values())
+                        if strip_boilerplate else 0
+                }
+                out.write(f'"normalization": {dump(summary["normalization"])[:-1]}, "offset_map": [')
+                copy_spool(map_spool)
+                out.write(']}')
+
+            out.write('}')
+            out.flush()
+            os.fsync(out.fileno())
+
+        return summary
+
+    @timed_stage('boilerplate')
+    def detect_boilerplate(
+        self,
+        text_data: Dict,
+        scan_lines: int = 3,
+        min_pages: Optional[int] = None,
+        similarity: float = 0.85
+    ) -> List[Dict]:
+        """
+        Find running headers, footers and page numbers that repeat across pages
+
+        Only the first and last scan_lines lines of each page are considered.
+        Lines are compared with digits masked (so "Page 3" matches "Page 4"),
+        first exactly and then by similarity against the repeating groups.
+        Matches are marked in each page's 'boilerplate' list with their
+        offsets in the page text, and each repeating line is stored once in
+        text_data['boilerplate'] (a line that only changes its number, like
+        "Page 3", "Page 4", is one entry listing all its pages).
+
+        Args:
+            text_data: Extracted text data
+            scan_lines: Lines at the top and bottom of each page to consider
+            min_pages: Pages a line must repeat on (default: 2 for up to 3 pages, else 3)
+            similarity: Minimum similarity ratio for near-identical lines
+
+        Returns:
+            List of repeating lines with their zone and page numbers
+        """
+        pages = _page_models(text_data)
+        marks, distinct = self._find_boilerplate(
+            [self._boilerplate_candidates(page.text, scan_lines) for page in pages],
+            [page.page_number for page in pages],
+            min_pages,
+            similarity
+        )
+        for page_index, page in enumerate(pages):
+            page.boilerplate = marks.get(page_index, [])
+
+        text_data['boilerplate'] = distinct
+        return text_data['boilerplate']
+
+    @staticmethod
+    def _boilerplate_candidates(text: str, scan_lines: int) -> List[Tuple]:
+        """Header and footer candidate lines of one page as (zone, key, start, end, line)"""
+        lines = []
+        position = 0
+        for line in text.split('\n'):
+            if line.strip():
+                lines.append((position, position + len(line), line))
+            position += len(line) + 1
+
+        # Short pages keep most of their lines out of the running
+        edge = min(scan_lines, len(lines) // 3)
+        candidates = []
+        for zone, zone_lines in (('header', lines[:edge]), ('footer', lines[len(lines) - edge:])):
+            for start, end, line in zone_lines:
+                key = _boilerplate_key(line)
+                if key:
+                    candidates.append((zone, key, start, end, line))
+        return candidates
+
+    @staticmethod
+    def _find_boilerplate(
+        candidates: List[List[Tuple]],
+        page_numbers: List[int],
+        min_pages: Optional[int],
+        similarity: float
+    ) -> Tuple[Dict[int, List[Dict]], List[Dict]]:
+        """
+        Group candidate lines across pages and keep the repeating ones
+
+        Args:
+            candidates: _boilerplate_candidates of each page, in page order
+            page_numbers: Page number of each page
+            min_pages: Pages a line must repeat on (default: 2 for up to 3 pages, else 3)
+            similarity: Minimum similarity ratio for near-identical lines
+
+        Returns:
+            Tuple of (marks per page index, one entry per repeating group)
+        """
+        if len(candidates) < 2:
+            return {}, []
+
+        threshold = min_pages or (2 if len(candidates) <= 3 else 3)
+
+        # Group candidate lines by zone and masked text
+        groups = {}
+        for page_index, page_candidates in enumerate(candidates):
+            for zone, key, start, end, line in page_candidates:
+                groups.setdefault((zone, key), []).append((page_index, start, end, line))
+
+        repeating = {
+            group_key: entries
+            for group_key, entries in groups.items()
+            if len({entry[0] for entry in entries}) >= threshold
         }
 
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                text_data['total_pages'] = len(pdf.pages)
-                text_data['metadata'] = pdf.metadata or {}
-
-                for page_num, page in enumerate(pdf.pages, start=1):
-                    page_text = page.extract_text() or ''
-                    text_data['pages'].append({
-                        'page_number': page_num,
-                        'text': page_text,
-                        'char_count': len(page_text)
-                    })
-                    text_data['full_text'] += page_text + '\n\n'
-
-                text_data['full_text'] = text_data['full_text'].strip()
-                text_data['total_chars'] = len(text_data['full_text'])
+        # Near-identical variants (e.g. a dropped character) join a repeating group
+        for (zone, key), entries in groups.items():
+            if (zone, key) in repeating:
+                continue
+            for repeating_zone, repeating_key in list(repeating):
+                if repeating_zone != zone:
+                    continue
+                matcher = difflib.SequenceMatcher(None, key, repeating_key)
+                if matcher.real_quick_ratio() >= similarity and matcher.ratio() >= similarity:
+                    repeating[(repeating_zone, repeating_key)].extend(entries)
+                    break
+
+        marks = {}
+        distinct = []
+        for (zone, _), entries in repeating.items():
+            for page_index, start, end, line in entries:
+                marks.setdefault(page_index, []).append({
+                    'text': line.strip(),
+                    'zone': zone,
+                    'start': start,
+                    'end': end
+                })
+
+            # One entry per group, shown as its most common line ("Page 3" stands for "Page 4"...)
+            texts = collections.Counter(line.strip() for _, _, _, line in entries)
+            distinct.append({
+                'text': texts.most_common(1)[0][0],
+                'zone': zone,
+                'pages': sorted({page_numbers[page_index] for page_index, _, _, _ in entries})
+            })
+
+        for page_marks in marks.values():
+            page_marks.sort(key=lambda mark: mark['start'])
+
+        return marks, distinct
+
+    def apply_normalization(self, text_data: Dict, remove_boilerplate: bool = True) -> Dict:
+        """
+        Normalize extracted text in place so translation and TTS get clean text
 
-        except Exception as e:
-            raise Exception(f"Error extracting text with pdfplumber: {str(e)}")
+        The raw text is kept in raw_text (per document and per page) and
+        text_data['normalization'] holds the offset map back to it along with
+        the characters and provider requests saved.
 
+        Args:
+            text_data: Extracted text data
+            remove_boilerplate: Leave lines marked by detect_boilerplate out
+
+        Returns:
+            The same text data
+        """
+        with span('normalize', chars=len(text_data['full_text'])) as normalize_span:
+            raw_text = text_data['full_text']
+            full_removals = []
+            removed_lines = 0
+            cursor = 0
+
+            for page in _page_models(text_data):
+                page_raw = page.text
+                page_removals = [
+                    (mark['start'], mark['end'])
+                    for mark in page.get('boilerplate', [])
+                ] if remove_boilerplate else []
+                removed_lines += len(page_removals)
+
+                # Same lines in the full text, which joins the pages in order
+                # (stripped at both ends, so look for the page without its outer whitespace)
+                page_body = page_raw.strip()
+                page_offset = raw_text.find(page_body, cursor) if page_body else -1
+                if page_offset >= 0:
+                    page_offset -= len(page_raw) - len(page_raw.lstrip())
+                    full_removals.extend(
+                        (page_offset + start, page_offset + end) for start, end in page_removals
+                    )
+                    cursor = page_offset + len(page_raw.rstrip())
+
+                page.raw_text = page_raw
+                page.text = self.normalize_text(page_raw, page_removals)['text']
+                page.char_count = len(page.text)
+
+            normalized = self.normalize_text(raw_text, full_removals)
+
+            text_data['raw_text'] = raw_text
+            text_data['full_text'] = normalized['text']
+            text_data['total_chars'] = len(normalized['text'])
+
+            # Requests the translation route makes: one per chunk plus one per page
+            raw_requests = len(self.split_into_chunks(raw_text)) + len(text_data['pages'])
+            normalized_requests = len(self.split_into_chunks(normalized['text'])) + len(text_data['pages'])
+
+            text_data['normalization'] = {
+                'raw_chars': len(raw_text),
+                'normalized_chars': len(normalized['text']),
+                'saved_chars': len(raw_text) - len(normalized['text']),
+                'saved_ratio': (len(raw_text) - len(normalized['text'])) / len(raw_text) if raw_text else 0.0,
+                'raw_requests': raw_requests,
+                'normalized_requests': normalized_requests,
+                'saved_requests': raw_requests - normalized_requests,
+                'boilerplate_lines_removed': removed_lines,
+                'offset_map': normalized['offset_map']
+            }
+            normalize_span.set(saved_chars=text_data['normalization']['saved_chars'])
+
+        CHARACTERS_SAVED.inc(text_data['normalization']['saved_chars'], stage='normalize')
         return text_data
 
-    def _extract_with_pypdf2(self, pdf_path: str) -> Dict:
-        """Extract text using PyPDF2 (fallback method)"""
+    @timed_stage('normalize')
+    def normalize_text(self, text: str, remove: Optional[List[Tuple[int, int]]] = None) -> Dict:
+        """
+        Normalize extracted text for translation and speech
+
+        Joins words hyphenated across line ends, reflows wrapped lines (a
+        blank line after sentence-ending punctuation stays a paragraph
+        break), collapses whitespace, drops soft hyphens and zero-width
+        characters and applies NFKC (ligatures, compatibility forms).
+
+        Args:
+            text: Raw extracted text
+            remove: Optional (start, end) ranges of text to leave out entirely
+
+        Returns:
+            Dictionary with the normalized text and an offset map of
+            [normalized_offset, raw_offset] anchors (see map_to_raw)
+        """
+        leading = len(text) - len(text.lstrip())
+        body = text.strip()
+
+        # Removed ranges in body coordinates, and the stretches kept between them
+        removals = sorted(
+            (max(start - leading, 0), min(end - leading, len(body)))
+            for start, end in remove or []
+        )
+        edits = []
+        kept_start = 0
+        for start, end in removals:
+            if end <= kept_start:
+                continue
+            start = max(start, kept_start)
+            if start > kept_start:
+                edits.extend(self._normalize_matches(body, kept_start, start))
+            edits.append((start, end, None, body[start:end]))
+            kept_start = end
+        edits.extend(self._normalize_matches(body, kept_start, len(body)))
+
+        parts = []
+        offset_map = [[0, leading]]
+        out_pos = 0
+        last = 0
+        tail = ''  # Last character written, for context-dependent rewrites
+
+        for start, end, kind, original in edits:
+            if start > last:
+                parts.append(body[last:start])
+                out_pos += start - last
+                tail = body[start - 1]
+
+            if kind is None:
+                replacement = ''
+            elif kind == 'hyphen':
+                # Keep the hyphen of compounds like "Jean-\nPaul"
+                replacement = '-' if body[end].isupper() else ''
+            elif kind == 'newline':
+                paragraph = original.count('\n') > 1 and tail in _PARAGRAPH_END
+                replacement = '\n' if paragraph else ' '
+            elif kind == 'space':
+                replacement = ' '
+            elif kind == 'invisible':
+                replacement = ''
+            else:
+                replacement = unicodedata.normalize('NFKC', original)
+
+            # No doubled or leading separators where removed text used to be
+            if replacement in (' ', '\n') and tail in ('', ' ', '\n'):
+                replacement = ''
+
+            if replacement:
+                tail = replacement[-1]
+            if replacement == original:
+                out_pos += end - start
+                last = end
+                parts.append(original)
+                continue
+
+            parts.append(replacement)
+            offset_map.append([out_pos, leading + start])
+            out_pos += len(replacement)
+            offset_map.append([out_pos, leading + end])
+            last = end
+
+        parts.append(body[last:])
+        normalized = ''.join(parts).rstrip()
+
+        # Drop anchors made redundant by an unchanged stretch, and those past
+        # the stripped end (a page's would land behind the next page's anchors)
+        compact = []
+        for anchor in offset_map:
+            if anchor[0] > len(normalized):
+                break
+            if compact and anchor[1] - compact[-1][1] == anchor[0] - compact[-1][0]:
+                continue
+            if compact and anchor[0] == compact[-1][0]:
+                compact[-1] = anchor
+                continue
+            compact.append(anchor)
+
+        return {
+            'text': normalized,
+            'offset_map': compact
+        }
+
+    @staticmethod
+    def _normalize_matches(body: str, start: int, end: int) -> List[Tuple]:
+        """Find what normalize_text rewrites in body[start:end]"""
+        return [
+            (match.start(), match.end(), match.lastgroup, match.group())
+            for match in _NORMALIZE_PATTERN.finditer(body, start, end)
+        ]
+
+    @staticmethod
+    def normalization_summary(text_data: Dict) -> Optional[Dict]:
+        """Get a document's normalization savings without the offset map"""
+        normalization = text_data.get('normalization')
+        if not normalization:
+            return None
+        return {key: value for key, value in normalization.items() if key != 'offset_map'}
+
+    @staticmethod
+    def map_to_raw(offset_map: List[List[int]], position: int) -> int:
+        """
+        Map an offset in normalized text back to the raw extracted text
+
+        Args:
+            offset_map: Offset map from normalize_text
+            position: Character offset in the normalized text
+
+        Returns:
+            Corresponding character offset in the raw text
+        """
+        index = bisect.bisect_right(offset_map, [position, float('inf')]) - 1
+        normalized_start, raw_start = offset_map[max(index, 0)]
+        raw_position = raw_start + (position - normalized_start)
+
+        # Inside a replacement (e.g. a ligature that became two characters)
+        if index + 1 < len(offset_map):
+            raw_position = min(raw_position, offset_map[index + 1][1])
+        return raw_position
+
+    def _open_pages(self, pdf_path: str, method: str):
+        """
+        Open a PDF with an extraction backend for page-at-a-time reading
+
+        Returns:
+            Context manager yielding (metadata, total pages, iterator over page texts)
+        """
+        return provider_registry.create('extraction', method).open(pdf_path)
+
+    def _collect_pages(self, pdf_path: str, method: str) -> Dict:
+        """Read every page into a text data dictionary"""
         text_data = {
             'full_text': '',
             'pages': [],
@@ -72,29 +719,24 @@ class PDFProcessor:
         }
 
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text_data['total_pages'] = len(pdf_reader.pages)
-                text_data['metadata'] = pdf_reader.metadata or {}
-
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    page_text = page.extract_text() or ''
-                    text_data['pages'].append({
-                        'page_number': page_num + 1,
-                        'text': page_text,
-                        'char_count': len(page_text)
-                    })
-                    text_data['full_text'] += page_text + '\n\n'
-
-                text_data['full_text'] = text_data['full_text'].strip()
-                text_data['total_chars'] = len(text_data['full_text'])
+            with self._open_pages(pdf_path, method) as (metadata, total_pages, page_texts):
+                text_data['total_pages'] = total_pages
+                text_data['metadata'] = metadata
 
+                for page_num, page_text in enumerate(page_texts, start=1):
+                    text_data['pages'].append(Page(page_num, page_text))
         except Exception as e:
-            raise Exception(f"Error extracting text with PyPDF2: {str(e)}")
+            raise Exception(f"Error extracting text with {method}: {str(e)}")
 
+        text_data['full_text'] = ''.join(page.text + '\n\n' for page in text_data['pages']).strip()
+        text_data['total_chars'] = len(text_data['full_text'])
         return text_data
 
+    def page_count(self, pdf_path: str) -> int:
+        """Number of pages, read from the page tree without parsing any page content"""
+        return provider_registry.create('extraction', 'pypdf2').page_count(pdf_path)
+
+    @timed_stage('split_sentences')
     def split_into_sentences(self, text: str) -> List[str]:
         """
         Split text into sentences for better translation and TTS processing
@@ -111,6 +753,8 @@ class PDFProcessor:
         sentences = re.split(r'(?<=[.!?])\s+', text)
         return [s.strip() for s in sentences if s.strip()]
 
+    @timed_stage('split_chunks')
+    @traced('segment.chunks')
     def split_into_chunks(self, text: str, max_chars: int = 5000) -> List[str]:
         """
         Split text into chunks for API processing
@@ -154,8 +798,7 @@ class PDFProcessor:
             Path to the saved file
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(text_data, f, ensure_ascii=False, indent=2)
+            atomic_write_json(output_path, text_data)
             return output_path
         except Exception as e:
             raise Exception(f"Error saving extracted text: {str(e)}")
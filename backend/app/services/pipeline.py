@@ -0,0 +1,196 @@
+from typing import Callable, Dict, List, Optional
+import os
+import queue
+import shutil
+import threading
+import time
+from app.models import AudioSegment, Segment
+from app.utils.cancellation import CancelledError, check_cancelled, is_cancelled
+from app.utils.metrics import QUEUE_DEPTH
+from app.utils.tracing import propagate
+
+# Marks the end of the translated sentence stream for TTS workers
+_END_OF_STREAM = object()
+
+class TranslateSpeakPipeline:
+    """
+    Overlapped translate-and-speak pipeline
+
+    A single translation stage translates sentences in document order and
+    pushes each one into a bounded queue as soon as it is ready. A pool of
+    TTS workers drains the queue, so the first sentence can be played while
+    the rest of the document is still being translated. When the TTS side
+    falls behind, the full queue blocks the translation stage (backpressure).
+
+    With a checkpoint, each translated sentence and synthesized segment is
+    recorded as it finishes, so a run that was cancelled or ran out of time
+    is resumed by the next one instead of starting over.
+    """
+
+    def __init__(
+        self,
+        translator,
+        tts_service,
+        queue_size: int = 8,
+        tts_workers: int = 2
+    ):
+        """
+        Initialize pipeline
+
+        Args:
+            translator: TranslationService used for the translation stage
+            tts_service: TextToSpeechService used for the synthesis stage
+            queue_size: Maximum translated sentences waiting for synthesis
+            tts_workers: Number of concurrent TTS workers
+        """
+        self.translator = translator
+        self.tts_service = tts_service
+        self.queue_size = max(1, queue_size)
+        self.tts_workers = max(1, tts_workers)
+
+    def run(
+        self,
+        sentences: List[str],
+        target_lang: str,
+        source_lang: str,
+        output_dir: str,
+        on_segment: Optional[Callable[[AudioSegment], None]] = None,
+        checkpoint=None
+    ) -> Dict:
+        """
+        Translate and synthesize sentences with both stages running concurrently
+
+        Both stages stop when the current request or job is cancelled or
+        runs out of time; the run then raises CancelledError.
+
+        Args:
+            sentences: Source sentences in document order
+            target_lang: Target language code (also used as TTS language)
+            source_lang: Source language code
+            output_dir: Directory to save segment audio files
+            on_segment: Optional callback invoked with each finished segment
+            checkpoint: Optional TranslationCheckpoint to resume from and save progress to
+
+        Returns:
+            Dictionary with ordered segments, translated sentences and timings
+
+        Raises:
+            CancelledError: If the current request or job was cancelled or ran out of time
+        """
+        work_queue = queue.Queue(maxsize=self.queue_size)
+        translated = [None] * len(sentences)
+        segments = []
+        segments_lock = threading.Lock()
+        state = {'source_lang': source_lang, 'first_audio': None}
+        start_time = time.monotonic()
+
+        def finish_segment(segment: AudioSegment):
+            with segments_lock:
+                if 'audio_path' in segment and state['first_audio'] is None:
+                    state['first_audio'] = time.monotonic() - start_time
+                segments.append(segment)
+            if on_segment:
+                on_segment(segment)
+
+        def translate_stage():
+            char_position = 0
+            try:
+                for i, sentence in enumerate(sentences):
+                    try:
+                        translation = checkpoint.get(f"sentence:{i}", sentence) if checkpoint else None
+                        if translation is None:
+                            translation = self.translator.translate_text(
+                                sentence,
+                                target_lang,
+                                source_lang
+                            )
+                            if checkpoint:
+                                checkpoint.record(f"sentence:{i}", sentence, translation)
+                    except CancelledError:
+                        raise
+                    except Exception as e:
+                        finish_segment(AudioSegment(i, '', error=str(e), original_text=sentence))
+                        continue
+
+                    # Detected by the first sentence that translated (earlier ones may have failed)
+                    if state['source_lang'] == source_lang and translation.get('source_lang') not in (None, 'unknown'):
+                        state['source_lang'] = translation['source_lang']
+
+                    text = translation['translated_text'].strip()
+                    translated[i] = text
+
+                    segment = Segment(i, text, char_position, char_position + len(text))
+                    char_position += len(text) + 1  # +1 for joining space
+
+                    if text:
+                        # Blocks while the TTS workers are behind
+                        QUEUE_DEPTH.inc(queue='pipeline_tts')
+                        work_queue.put((segment, sentence))
+            finally:
+                for _ in range(self.tts_workers):
+                    work_queue.put(_END_OF_STREAM)
+
+        def tts_stage():
+            while True:
+                item = work_queue.get()
+                if item is _END_OF_STREAM:
+                    break
+                QUEUE_DEPTH.dec(queue='pipeline_tts')
+                segment, sentence = item
+                if is_cancelled():
+                    continue  # Keep draining so the translation stage never blocks on a full queue
+
+                output_path = os.path.join(output_dir, f"segment_{segment.id}.mp3")
+                try:
+                    audio_segment = AudioSegment.from_audio(
+                        self._synthesize(segment, target_lang, output_path, checkpoint),
+                        segment
+                    )
+                    audio_segment.original_text = sentence
+                    finish_segment(audio_segment)
+                except CancelledError:
+                    continue
+                except Exception as e:
+                    finish_segment(AudioSegment(segment.id, segment.text, error=str(e), original_text=sentence))
+
+        workers = [
+            threading.Thread(target=propagate(tts_stage), name=f"pipeline-tts-{n}", daemon=True)
+            for n in range(self.tts_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            translate_stage()
+        finally:
+            for worker in workers:
+                worker.join()
+        check_cancelled()
+
+        segments.sort(key=lambda s: s.segment_id)
+
+        return {
+            'segments': segments,
+            'translated_sentences': [text for text in translated if text],
+            'source_lang': state['source_lang'],
+            'timings': {
+                'first_audio_seconds': state['first_audio'],
+                'total_seconds': time.monotonic() - start_time
+            }
+        }
+
+    def _synthesize(self, segment: Segment, language: str, output_path: str, checkpoint=None) -> Dict:
+        """Synthesize one segment, or copy its audio from an earlier run that already made it"""
+        unit = f"audio:{segment.id}"
+        # The same text read by another TTS service is different audio
+        source_text = f"{self.tts_service.service}\0{segment.text}"
+
+        saved = checkpoint.get(unit, source_text) if checkpoint else None
+        if saved is not None and os.path.exists(saved['audio_path']):
+            shutil.copyfile(saved['audio_path'], output_path)
+            return {**saved, 'audio_path': output_path}
+
+        audio_info = self.tts_service.text_to_speech(segment.text, language, output_path)
+        if checkpoint:
+            checkpoint.record(unit, source_text, audio_info)
+        return audio_info
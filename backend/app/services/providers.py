@@ -0,0 +1,157 @@
+from typing import Dict, List
+import importlib
+import threading
+from contextlib import contextmanager
+
+# Backend kinds and the entry point group each one is discovered from
+ENTRY_POINT_GROUPS = {
+    'translation': 'language_learning.translation',
+    'tts': 'language_learning.tts',
+    'extraction': 'language_learning.extraction'
+}
+
+# Built-in backends as "module:attribute"; nothing is imported until first use
+BUILTIN_BACKENDS = {
+    'translation': {
+        'google': 'app.services.backends.google_translate:GoogleTranslateBackend',
+        'deepl': 'app.services.backends.deepl_translate:DeepLBackend'
+    },
+    'tts': {
+        'gtts': 'app.services.backends.gtts_speech:GTTSBackend'
+    },
+    'extraction': {
+        'pdfplumber': 'app.services.backends.pdfplumber_pages:PdfplumberPages',
+        'pypdf2': 'app.services.backends.pypdf2_pages:PyPDF2Pages'
+    }
+}
+
+def _entry_points(group: str) -> list:
+    from importlib.metadata import entry_points
+    return list(entry_points(group=group))
+
+class ProviderRegistry:
+    """
+    Named translation, TTS and extraction backends, imported on first use
+
+    Backends are registered as "module:attribute" strings (or the object
+    itself) and resolved the first time they are asked for, so a process
+    only pays the import cost of the provider libraries it actually uses.
+    Installed packages can add backends through the entry point group of
+    each kind (e.g. language_learning.tts); the entry point is loaded like
+    a built-in, on first use. Built-in names take precedence.
+    """
+
+    def __init__(self, builtins: Dict[str, Dict[str, str]] = None):
+        """
+        Initialize registry
+
+        Args:
+            builtins: Backends per kind as {kind: {name: target}}
+        """
+        self._targets = {kind: dict(targets) for kind, targets in (builtins or {}).items()}
+        self._loaded = {}
+        self._discovered = set()
+        self._lock = threading.RLock()
+
+    def register(self, kind: str, name: str, target):
+        """
+        Register a backend
+
+        Args:
+            kind: Backend kind ('translation', 'tts' or 'extraction')
+            name: Name the backend is selected by (the service name)
+            target: "module:attribute" to import on first use, or the backend itself
+        """
+        with self._lock:
+            self._targets.setdefault(kind, {})[name] = target
+            self._loaded.pop((kind, name), None)
+
+    @contextmanager
+    def override(self, kind: str, name: str, target):
+        """Temporarily replace a backend (used by benchmarks to plug in stubs)"""
+        self._discover(kind)
+        with self._lock:
+            previous = self._targets.get(kind, {}).get(name)
+        self.register(kind, name, target)
+        try:
+            yield
+        finally:
+            with self._lock:
+                if previous is None:
+                    self._targets[kind].pop(name, None)
+                else:
+                    self._targets[kind][name] = previous
+                self._loaded.pop((kind, name), None)
+
+    def names(self, kind: str) -> List[str]:
+        """Names of the backends available for a kind (without importing them)"""
+        self._discover(kind)
+        with self._lock:
+            return sorted(self._targets.get(kind, {}))
+
+    def load(self, kind: str, name: str):
+        """
+        Get a backend, importing it the first time
+
+        Args:
+            kind: Backend kind
+            name: Backend name
+
+        Returns:
+            The registered backend (usually a class)
+
+        Raises:
+            ValueError: If no backend of that kind has that name
+        """
+        key = (kind, name)
+        loaded = self._loaded.get(key)
+        if loaded is not None:
+            return loaded
+
+        self._discover(kind)
+        with self._lock:
+            if key in self._loaded:
+                return self._loaded[key]
+            target = self._targets.get(kind, {}).get(name)
+            if target is None:
+                raise ValueError(f"Unknown {kind} backend: {name}")
+
+            if isinstance(target, str):
+                module_name, _, attribute = target.partition(':')
+                target = getattr(importlib.import_module(module_name), attribute)
+            elif hasattr(target, 'load') and hasattr(target, 'group'):
+                target = target.load()  # Entry point
+
+            self._loaded[key] = target
+            return target
+
+    def create(self, kind: str, name: str, *args, **kwargs):
+        """Load a backend and instantiate it with the given arguments"""
+        return self.load(kind, name)(*args, **kwargs)
+
+    def loaded(self) -> Dict[str, List[str]]:
+        """Backends imported so far, per kind"""
+        with self._lock:
+            result = {}
+            for kind, name in self._loaded:
+                result.setdefault(kind, []).append(name)
+            return {kind: sorted(names) for kind, names in result.items()}
+
+    def _discover(self, kind: str):
+        # Entry points are listed once per kind; the plugins themselves load on first use
+        if kind in self._discovered or kind not in ENTRY_POINT_GROUPS:
+            return
+        with self._lock:
+            if kind in self._discovered:
+                return
+            self._discovered.add(kind)
+            try:
+                entry_points = _entry_points(ENTRY_POINT_GROUPS[kind])
+            except Exception:
+                return  # Broken package metadata shouldn't take the built-ins down
+            targets = self._targets.setdefault(kind, {})
+            for entry_point in entry_points:
+                targets.setdefault(entry_point.name, entry_point)
+
+# Shared by every service in the process
+provider_registry = ProviderRegistry(BUILTIN_BACKENDS)
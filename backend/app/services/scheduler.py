@@ -0,0 +1,267 @@
+from typing import Dict, Optional
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from app.utils.cancellation import current_token
+from app.utils.metrics import PROVIDER_CALLS_CANCELLED, PROVIDER_QUEUE_WAIT, QUEUE_DEPTH
+
+# Priority classes, most latency-sensitive first
+PRIORITY_CLASSES = ('interactive', 'document', 'background')
+
+DEFAULT_WEIGHTS = {'interactive': 8, 'document': 2, 'background': 1}
+
+# Priority class and flow (user or document) of the provider calls made in this context
+_current_priority = contextvars.ContextVar('provider_priority', default=('document', None))
+
+def set_priority(priority_class: str, flow: Optional[str] = None):
+    """
+    Schedule the rest of the current context's provider calls under a priority class
+
+    Meant for job bodies and worker threads, which run in their own copy
+    of the context (see propagate()); elsewhere use priority().
+
+    Args:
+        priority_class: 'interactive', 'document' or 'background'
+        flow: User or document the calls belong to; flows of the same class
+            share the class's capacity fairly
+
+    Returns:
+        Token for resetting the previous setting
+    """
+    if priority_class not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority class: {priority_class}")
+    return _current_priority.set((priority_class, flow))
+
+@contextmanager
+def priority(priority_class: str, flow: Optional[str] = None):
+    """
+    Schedule the provider calls made inside the block under a priority class
+
+    The setting follows the context, so work handed to other threads with
+    propagate() keeps it unless it sets its own.
+
+    Args:
+        priority_class: 'interactive', 'document' or 'background'
+        flow: User or document the calls belong to
+    """
+    token = set_priority(priority_class, flow)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+def current_priority() -> tuple:
+    """(priority class, flow) of the current context"""
+    return _current_priority.get()
+
+class _ProviderQueue:
+    """Call slots and waiting calls of one provider"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.virtual_time = 0.0
+        self.finish_tags = {}  # (class, flow) -> virtual finish time of its last call
+        self.waiting = []  # Heap of (start tag, sequence, _Waiter)
+
+class _Waiter:
+    """A call waiting for a slot"""
+
+    __slots__ = ('event', 'admitted')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.admitted = False
+
+class ProviderScheduler:
+    """
+    Weighted fair queuing in front of provider calls
+
+    Each provider has a fixed number of concurrent call slots. When they
+    are all busy, calls wait and are admitted in start-time fair order:
+    every (priority class, flow) pair is a flow whose calls are tagged
+    with a virtual start time that advances by cost / class weight, so a
+    flow's share of the provider follows its class weight regardless of
+    how much it has queued. A 400-page book queued under 'document' only
+    delays a one-sentence 'interactive' call until the next free slot,
+    and two books translated at once share the document capacity evenly.
+    """
+
+    def __init__(self, default_limit: int = 4, weights: Optional[Dict[str, float]] = None):
+        """
+        Initialize scheduler
+
+        Args:
+            default_limit: Concurrent calls for providers without a configured limit
+            weights: Share of each priority class when providers are saturated
+        """
+        self.default_limit = default_limit
+        self._limits = {}
+        self._weights = dict(DEFAULT_WEIGHTS)
+        if weights:
+            self._weights.update(weights)
+        self._queues = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def configure(self, limits: Dict[str, int], weights: Optional[Dict[str, float]] = None):
+        """
+        Set per-provider concurrency limits and priority class weights
+
+        Args:
+            limits: Mapping of service name to maximum concurrent calls
+            weights: Mapping of priority class to weight (unlisted classes keep theirs)
+        """
+        with self._lock:
+            self._limits = dict(limits)
+            if weights:
+                self._weights.update(weights)
+            for service, provider_queue in self._queues.items():
+                provider_queue.limit = self._limits.get(service, self.default_limit)
+                self._admit(provider_queue)
+
+    def _queue(self, service: str) -> _ProviderQueue:
+        provider_queue = self._queues.get(service)
+        if provider_queue is None:
+            provider_queue = _ProviderQueue(self._limits.get(service, self.default_limit))
+            self._queues[service] = provider_queue
+        return provider_queue
+
+    @contextmanager
+    def slot(self, service: str, cost: float = 1):
+        """
+        Hold one of the provider's call slots for the duration of the block
+
+        The priority class and flow come from the current context (see
+        priority()). A call whose request or job is cancelled, or runs out
+        of time, while it waits leaves the queue without taking a slot.
+
+        Args:
+            service: Provider name
+            cost: Relative size of the call (e.g. characters sent)
+
+        Raises:
+            CancelledError: If the current context's work was cancelled while waiting
+        """
+        priority_class, flow = current_priority()
+        waited = self._acquire(service, priority_class, flow, max(cost, 1))
+        PROVIDER_QUEUE_WAIT.observe(waited, provider=service, priority=priority_class)
+        try:
+            yield
+        finally:
+            self._release(service)
+
+    def _acquire(self, service: str, priority_class: str, flow, cost: float) -> float:
+        with self._lock:
+            provider_queue = self._queue(service)
+            key = (priority_class, flow)
+            start_tag = max(provider_queue.virtual_time, provider_queue.finish_tags.get(key, 0.0))
+            provider_queue.finish_tags[key] = start_tag + cost / self._weights.get(priority_class, 1)
+
+            if provider_queue.active < provider_queue.limit and not provider_queue.waiting:
+                provider_queue.active += 1
+                provider_queue.virtual_time = start_tag
+                return 0.0
+
+            waiter = _Waiter()
+            heapq.heappush(provider_queue.waiting, (start_tag, next(self._sequence), waiter))
+
+        QUEUE_DEPTH.inc(queue=f"provider_{service}")
+        started = time.monotonic()
+        token = current_token()
+        try:
+            if token is None:
+                waiter.event.wait()  # Set once a slot is ours
+            else:
+                unregister = token.on_cancel(waiter.event.set)
+                try:
+                    waiter.event.wait(token.remaining())
+                finally:
+                    unregister()
+                self._leave_if_cancelled(service, provider_queue, waiter, token, priority_class)
+        finally:
+            QUEUE_DEPTH.dec(queue=f"provider_{service}")
+        return time.monotonic() - started
+
+    def _leave_if_cancelled(self, service: str, provider_queue: _ProviderQueue, waiter: _Waiter, token, priority_class: str):
+        if not token.cancelled:
+            return
+        with self._lock:
+            if waiter.admitted:
+                # Admitted just as it was cancelled: pass the slot on
+                provider_queue.active -= 1
+                self._admit(provider_queue)
+            else:
+                provider_queue.waiting = [entry for entry in provider_queue.waiting if entry[2] is not waiter]
+                heapq.heapify(provider_queue.waiting)
+        PROVIDER_CALLS_CANCELLED.inc(provider=service, priority=priority_class)
+        token.check()
+
+    def _release(self, service: str):
+        with self._lock:
+            provider_queue = self._queue(service)
+            provider_queue.active -= 1
+            self._admit(provider_queue)
+
+            if not provider_queue.active:
+                # Idle: no flow is owed anything any more
+                provider_queue.finish_tags.clear()
+            elif len(provider_queue.finish_tags) > 256:
+                # Flows whose tags the virtual time has passed would start at it anyway
+                provider_queue.finish_tags = {
+                    key: tag for key, tag in provider_queue.finish_tags.items()
+                    if tag > provider_queue.virtual_time
+                }
+
+    @staticmethod
+    def _admit(provider_queue: _ProviderQueue):
+        # Waiting calls go in start tag order while there are free slots
+        while provider_queue.waiting and provider_queue.active < provider_queue.limit:
+            start_tag, _, waiter = heapq.heappop(provider_queue.waiting)
+            provider_queue.active += 1
+            provider_queue.virtual_time = start_tag
+            waiter.admitted = True
+            waiter.event.set()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Active and waiting calls per provider"""
+        with self._lock:
+            return {
+                service: {
+                    'limit': provider_queue.limit,
+                    'active': provider_queue.active,
+                    'waiting': len(provider_queue.waiting)
+                }
+                for service, provider_queue in self._queues.items()
+            }
+
+# Shared by every TranslationService instance
+provider_scheduler = ProviderScheduler()
+
+def init_app(app):
+    """
+    Configure the shared scheduler from the app config
+
+    Provider calls made while handling a request are 'interactive' by
+    default, with the client address as their flow; routes that translate
+    whole documents (and the jobs they start) set their own class.
+    """
+    from flask import g, request
+
+    provider_scheduler.configure(
+        app.config['TRANSLATION_PROVIDER_LIMITS'],
+        app.config.get('PROVIDER_PRIORITY_WEIGHTS')
+    )
+
+    @app.before_request
+    def _interactive_priority():
+        g.provider_priority_token = set_priority('interactive', request.remote_addr)
+
+    @app.teardown_request
+    def _reset_priority(exc):
+        token = g.pop('provider_priority_token', None)
+        if token is not None:
+            _current_priority.reset(token)
@@ -0,0 +1,373 @@
+from typing import Dict, Optional
+import os
+import re
+import shutil
+import threading
+import time
+from app.utils.files import document_lock
+from app.utils.metrics import STORAGE_EVICTIONS, STORAGE_RECLAIMED, STORAGE_USAGE
+
+# Artifact kinds tracked per document
+KINDS = ('uploads', 'extractions', 'translations', 'audio')
+
+# Eviction tiers, cheapest to rebuild first; evicting the extraction drops the whole document
+EVICTION_TIERS = {
+    'audio': ('audio',),
+    'translations': ('translations',),
+    'extractions': ('audio', 'translations', 'extractions', 'uploads')
+}
+
+_DOCUMENT_ID = re.compile(r'^[\w.-]+$')
+
+def _entry_stats(path: str):
+    """Total bytes and newest modification time of a file or directory tree"""
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime
+
+    total = 0
+    newest = os.stat(path).st_mtime
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                stat = os.stat(os.path.join(root, name))
+            except OSError:
+                continue  # Removed while scanning
+            total += stat.st_size
+            newest = max(newest, stat.st_mtime)
+    return total, newest
+
+class StorageManager:
+    """
+    Tracks disk usage and last access per document and evicts to stay under quota
+
+    Usage is rebuilt by scanning the upload, translation and audio folders.
+    Last access is the newer of the document's access marker (touched by
+    record_access) and its newest artifact. When usage exceeds the quota,
+    least recently used documents lose their audio first, then their
+    translations, then their extraction and upload.
+    """
+
+    def __init__(
+        self,
+        upload_folder: str,
+        translation_folder: str,
+        audio_folder: str,
+        state_folder: str,
+        quota_bytes: int = 0,
+        target_ratio: float = 0.9,
+        min_idle_seconds: float = 600,
+        max_idle_seconds: float = 0,
+        pause_seconds: float = 0.01
+    ):
+        """
+        Initialize storage manager
+
+        Args:
+            upload_folder: Uploaded PDFs
+            translation_folder: Extraction and translation JSON
+            audio_folder: Generated audio
+            state_folder: Access markers and the sweeper lock
+            quota_bytes: Maximum bytes across all folders (0 = unlimited)
+            target_ratio: Fraction of the quota to evict down to once it is exceeded
+            min_idle_seconds: Documents used more recently than this are never evicted
+            max_idle_seconds: Derived artifacts idle longer than this are evicted even under quota (0 = never)
+            pause_seconds: Pause between evictions so the sweeper doesn't compete for disk
+        """
+        self.folders = {
+            'uploads': upload_folder,
+            'translations': translation_folder,
+            'audio': audio_folder
+        }
+        self.access_folder = os.path.join(state_folder, 'access')
+        self.lock_folder = os.path.join(state_folder, 'locks')
+        self.audio_lock_folder = os.path.join(audio_folder, '.locks')  # Same locks as audio publishing
+        self.quota_bytes = quota_bytes
+        self.target_ratio = target_ratio
+        self.min_idle_seconds = min_idle_seconds
+        self.max_idle_seconds = max_idle_seconds
+        self.pause_seconds = pause_seconds
+        self._touched = {}
+        self._touched_lock = threading.Lock()
+
+    def record_access(self, document_id: str, throttle_seconds: float = 60):
+        """
+        Mark a document as used now
+
+        Args:
+            document_id: Unique document identifier
+            throttle_seconds: Skip the disk write if this process touched it more recently
+        """
+        if not document_id or not _DOCUMENT_ID.match(document_id) or document_id.startswith('.'):
+            return
+
+        now = time.time()
+        with self._touched_lock:
+            if now - self._touched.get(document_id, 0) < throttle_seconds:
+                return
+            self._touched[document_id] = now
+
+        os.makedirs(self.access_folder, exist_ok=True)
+        marker = os.path.join(self.access_folder, document_id)
+        with open(marker, 'a'):
+            pass
+        os.utime(marker, (now, now))
+
+    def scan(self) -> Dict[str, Dict]:
+        """
+        Collect artifacts per document
+
+        Returns:
+            Dictionary of document ID to {'paths': {kind: [...]}, 'bytes': {kind: n}, 'last_access': t}
+        """
+        entries = []
+        for folder_kind, folder in self.folders.items():
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if name.startswith('.'):
+                    continue  # Locks and in-flight temporary files
+                entries.append((folder_kind, folder, name))
+
+        # Document IDs come from uploads, extractions and audio directories
+        known = set()
+        for folder_kind, folder, name in entries:
+            if folder_kind == 'uploads':
+                known.add(os.path.splitext(name)[0])
+            elif folder_kind == 'translations' and name.endswith('_extracted.json'):
+                known.add(name[:-len('_extracted.json')])
+            elif folder_kind == 'audio' and os.path.isdir(os.path.join(folder, name)):
+                known.add(name)
+
+        documents = {}
+        for folder_kind, folder, name in entries:
+            path = os.path.join(folder, name)
+            if folder_kind == 'uploads':
+                document_id, kind = os.path.splitext(name)[0], 'uploads'
+            elif folder_kind == 'translations' and name.endswith('_extracted.json'):
+                document_id, kind = name[:-len('_extracted.json')], 'extractions'
+            elif folder_kind == 'audio' and os.path.isdir(path):
+                document_id, kind = name, 'audio'
+            else:
+                # {document_id}_{lang}_... files: longest known prefix ending before an underscore
+                prefixes = [name[:i] for i, char in enumerate(name) if char == '_']
+                document_id = next((p for p in reversed(prefixes) if p in known), name)
+                kind = folder_kind
+
+            try:
+                size, modified = _entry_stats(path)
+            except OSError:
+                continue
+
+            document = documents.setdefault(document_id, {
+                'paths': {k: [] for k in KINDS},
+                'bytes': {k: 0 for k in KINDS},
+                'last_access': 0.0
+            })
+            document['paths'][kind].append(path)
+            document['bytes'][kind] += size
+            document['last_access'] = max(document['last_access'], modified)
+
+        for document_id, document in documents.items():
+            try:
+                marker_time = os.stat(os.path.join(self.access_folder, document_id)).st_mtime
+                document['last_access'] = max(document['last_access'], marker_time)
+            except OSError:
+                pass
+
+        return documents
+
+    def usage(self, documents: Optional[Dict[str, Dict]] = None) -> Dict:
+        """
+        Current usage per artifact kind (also published as metrics)
+
+        Args:
+            documents: Result of scan() (scanned now if omitted)
+
+        Returns:
+            Dictionary with bytes per kind, total, quota and document count
+        """
+        if documents is None:
+            documents = self.scan()
+
+        by_kind = {kind: sum(d['bytes'][kind] for d in documents.values()) for kind in KINDS}
+        for kind, total in by_kind.items():
+            STORAGE_USAGE.set(total, kind=kind)
+
+        return {
+            'bytes': by_kind,
+            'total_bytes': sum(by_kind.values()),
+            'quota_bytes': self.quota_bytes,
+            'documents': len(documents)
+        }
+
+    def evict(self, document_id: str, document: Dict, tier: str) -> int:
+        """
+        Remove one eviction tier of a document
+
+        Skipped (returns 0) while another process holds the document's lock.
+
+        Args:
+            document_id: Unique document identifier
+            document: The document's entry from scan()
+            tier: 'audio', 'translations' or 'extractions'
+
+        Returns:
+            Bytes reclaimed
+        """
+        reclaimed = 0
+        try:
+            with document_lock(self.audio_lock_folder, document_id, timeout=0):
+                for kind in EVICTION_TIERS[tier]:
+                    if not document['paths'][kind]:
+                        continue
+                    for path in document['paths'][kind]:
+                        if os.path.isdir(path):
+                            shutil.rmtree(path, ignore_errors=True)
+                        elif os.path.exists(path):
+                            os.remove(path)
+                    STORAGE_RECLAIMED.inc(document['bytes'][kind], kind=kind)
+                    STORAGE_EVICTIONS.inc(kind=kind)
+                    reclaimed += document['bytes'][kind]
+                    document['paths'][kind] = []
+                    document['bytes'][kind] = 0
+        except TimeoutError:
+            return 0
+
+        if tier == 'extractions':
+            marker = os.path.join(self.access_folder, document_id)
+            if os.path.exists(marker):
+                os.remove(marker)
+        return reclaimed
+
+    def sweep(self) -> Dict:
+        """
+        Evict idle derived artifacts, then least recently used ones until under quota
+
+        Only one sweep runs at a time across processes sharing the folders.
+
+        Returns:
+            Dictionary with reclaimed bytes per kind, evictions and usage after the sweep
+        """
+        try:
+            with document_lock(self.lock_folder, 'sweeper', timeout=0):
+                return self._sweep()
+        except TimeoutError:
+            return {'skipped': True, 'reason': 'Another sweep is running'}
+
+    def _sweep(self) -> Dict:
+        documents = self.scan()
+        now = time.time()
+        evictions = []
+        reclaimed = {kind: 0 for kind in KINDS}
+
+        def run_eviction(document_id: str, tier: str) -> int:
+            before = dict(documents[document_id]['bytes'])
+            freed = self.evict(document_id, documents[document_id], tier)
+            if freed:
+                for kind in KINDS:
+                    reclaimed[kind] += before[kind] - documents[document_id]['bytes'][kind]
+                evictions.append({'document_id': document_id, 'tier': tier, 'bytes': freed})
+                time.sleep(self.pause_seconds)
+            return freed
+
+        # Least recently used first
+        lru = sorted(documents, key=lambda d: documents[d]['last_access'])
+
+        if self.max_idle_seconds:
+            for document_id in lru:
+                if now - documents[document_id]['last_access'] <= self.max_idle_seconds:
+                    break
+                for tier in ('audio', 'translations'):
+                    run_eviction(document_id, tier)
+
+        total = sum(sum(d['bytes'].values()) for d in documents.values())
+        if self.quota_bytes and total > self.quota_bytes:
+            target = self.quota_bytes * self.target_ratio
+            for tier in ('audio', 'translations', 'extractions'):
+                for document_id in lru:
+                    if total <= target:
+                        break
+                    if now - documents[document_id]['last_access'] < self.min_idle_seconds:
+                        continue
+                    total -= run_eviction(document_id, tier)
+
+        return {
+            'reclaimed_bytes': reclaimed,
+            'total_reclaimed_bytes': sum(reclaimed.values()),
+            'evictions': evictions,
+            'usage': self.usage({d: doc for d, doc in documents.items() if sum(doc['bytes'].values())})
+        }
+
+    def start_sweeper(self, interval_seconds: float) -> threading.Thread:
+        """
+        Run sweep() every interval_seconds on a low-priority daemon thread
+
+        Args:
+            interval_seconds: Seconds between sweeps
+
+        Returns:
+            The sweeper thread
+        """
+        def run():
+            try:
+                # Linux applies nice values per thread
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+            except (AttributeError, OSError):
+                pass
+
+            while True:
+                time.sleep(interval_seconds)
+                try:
+                    self.sweep()
+                except Exception:
+                    pass  # Try again next round
+
+        thread = threading.Thread(target=run, name='storage-sweeper', daemon=True)
+        thread.start()
+        return thread
+
+def _request_document_id(request) -> Optional[str]:
+    """Document a request works on, from the URL or the JSON body"""
+    view_args = request.view_args or {}
+    if view_args.get('document_id'):
+        return view_args['document_id']
+    if view_args.get('filename') and '/' in view_args['filename']:
+        return view_args['filename'].split('/', 1)[0]  # /tts/audio/<document_id>/...
+    if request.is_json:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict) and isinstance(data.get('document_id'), str):
+            return data['document_id']
+    return None
+
+def init_app(app):
+    """
+    Create the app's StorageManager, record document access and start the sweeper
+
+    The manager is available as app.extensions['storage'].
+    """
+    from flask import request
+
+    manager = StorageManager(
+        upload_folder=app.config['UPLOAD_FOLDER'],
+        translation_folder=app.config['TRANSLATION_OUTPUT_FOLDER'],
+        audio_folder=app.config['AUDIO_OUTPUT_FOLDER'],
+        state_folder=app.config['STORAGE_STATE_FOLDER'],
+        quota_bytes=app.config['STORAGE_QUOTA_BYTES'],
+        target_ratio=app.config['STORAGE_TARGET_RATIO'],
+        min_idle_seconds=app.config['STORAGE_MIN_IDLE_SECONDS'],
+        max_idle_seconds=app.config['STORAGE_MAX_IDLE_DAYS'] * 86400
+    )
+    app.extensions['storage'] = manager
+
+    @app.after_request
+    def _record_access(response):
+        if response.status_code < 400:
+            try:
+                manager.record_access(_request_document_id(request))
+            except OSError:
+                pass
+        return response
+
+    if app.config['STORAGE_SWEEP_INTERVAL'] > 0:
+        manager.start_sweeper(app.config['STORAGE_SWEEP_INTERVAL'])
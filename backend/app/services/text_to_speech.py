@@ -1,24 +1,44 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import os
-from gtts import gTTS
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 import json
+from app.models import AudioSegment, Segment
+from app.services.circuit_breaker import CircuitOpenError, provider_circuits
+from app.services.providers import provider_registry
+from app.utils.cancellation import CancelledError, check_cancelled
+from app.utils.audio import iter_mp3_frames
+from app.utils.files import atomic_output, temp_path_for
+from app.utils.metrics import timed_stage, track_provider_call
+from app.utils.tracing import propagate, span, traced
 
 class TextToSpeechService:
     """Service for converting text to speech using various TTS engines"""
 
-    def __init__(self, service: str = 'gtts'):
+    def __init__(self, service: str = 'gtts', gtts_connections: int = 4):
         """
         Initialize TTS service
 
         Args:
-            service: TTS service to use ('gtts', 'google_cloud', 'azure', 'elevenlabs')
+            service: TTS service to use ('gtts', 'google_cloud', 'azure', 'elevenlabs'
+                or a backend from an entry point)
+            gtts_connections: Concurrent gTTS token requests per host (0 uses plain gTTS.save)
         """
         self.service = service
-        self.supported_services = ['gtts', 'google_cloud', 'azure', 'elevenlabs']
+        self.gtts_connections = gtts_connections
+        self.supported_services = provider_registry.names('tts') + ['google_cloud', 'azure', 'elevenlabs']
+        self.backend = None  # Created (and its provider library imported) on first synthesis
 
         if service not in self.supported_services:
             raise ValueError(f"Unsupported TTS service: {service}")
 
+    def _get_backend(self):
+        if self.backend is None:
+            # Backends take keyword options and ignore the ones they don't use
+            self.backend = provider_registry.create('tts', self.service, gtts_connections=self.gtts_connections)
+        return self.backend
+
     def text_to_speech(
         self,
         text: str,
@@ -37,48 +57,178 @@ class TextToSpeechService:
 
         Returns:
             Dictionary with audio file info
+
+        Raises:
+            CancelledError: If the current request or job was cancelled or ran out of time
+            CircuitOpenError: If the provider's circuit is open (not attempted)
+            ValueError: If the text is empty or the provider rejected the input
+                (e.g. an unsupported language)
         """
         if not text or not text.strip():
             raise ValueError("Text cannot be empty")
 
+        check_cancelled()
         try:
-            if self.service == 'gtts':
-                return self._gtts_generate(text, language, output_path, slow)
-            elif self.service == 'google_cloud':
-                return self._google_cloud_generate(text, language, output_path)
-            elif self.service == 'azure':
-                return self._azure_generate(text, language, output_path)
-            elif self.service == 'elevenlabs':
-                return self._elevenlabs_generate(text, language, output_path)
-            else:
-                raise ValueError(f"Unsupported service: {self.service}")
+            # Providers write to a temporary file, so readers never see partial audio
+            with provider_circuits.guard('tts', self.service), \
+                    span('tts.provider', provider=self.service, chars=len(text), language=language), \
+                    track_provider_call('tts', self.service, len(text)), \
+                    atomic_output(output_path) as temp_path:
+                if self.service == 'google_cloud':
+                    audio_info = self._google_cloud_generate(text, language, temp_path)
+                elif self.service == 'azure':
+                    audio_info = self._azure_generate(text, language, temp_path)
+                elif self.service == 'elevenlabs':
+                    audio_info = self._elevenlabs_generate(text, language, temp_path)
+                else:
+                    audio_info = self._get_backend().synthesize(text, language, temp_path, slow)
+        except (CancelledError, CircuitOpenError, ValueError):
+            raise
         except Exception as e:
+            # Backends wrap errors in their own; a fetch stopped by the deadline is still a cancellation
+            check_cancelled()
             raise Exception(f"TTS generation error: {str(e)}")
 
-    def _gtts_generate(
+        audio_info['audio_path'] = output_path
+        return audio_info
+
+    @traced('tts.full')
+    def text_to_speech_chunked(
         self,
         text: str,
         language: str,
         output_path: str,
+        max_chars: int = 5000,
+        max_workers: int = 4,
         slow: bool = False
     ) -> Dict:
-        """Generate speech using Google Text-to-Speech (free)"""
+        """
+        Convert long text to a single audio file by synthesizing sentence-aligned pieces concurrently
+
+        Pieces are stitched into the output file in order, frame by frame, as
+        soon as each one and all the pieces before it are done.
+
+        Args:
+            text: Text to convert
+            language: Language code (e.g., 'en', 'es', 'fr')
+            output_path: Path to save the audio file
+            max_chars: Maximum characters per piece (Config.TTS_CHUNK_SIZE)
+            max_workers: Maximum pieces synthesized at the same time
+            slow: Speak slowly (only for gTTS)
+
+        Returns:
+            Dictionary with audio file info and per-piece timing
+        """
+        if not text or not text.strip():
+            raise ValueError("Text cannot be empty")
+
+        # Small enough pieces to keep every worker busy, never above max_chars
+        piece_chars = min(max_chars, max(200, -(-len(text) // max(1, max_workers))))
+        pieces = self._split_into_pieces(text, piece_chars)
+
+        # Concurrent generations of the same file each stitch into their own temporary file
+        temp_path = temp_path_for(output_path)
+        part_paths = [f"{temp_path}.part{i}" for i in range(len(pieces))]
+        piece_info = []
+        elapsed = 0.0
+
         try:
-            tts = gTTS(text=text, lang=language, slow=slow)
-            tts.save(output_path)
-
-            file_size = os.path.getsize(output_path)
-
-            return {
-                'success': True,
-                'audio_path': output_path,
-                'language': language,
-                'service': 'gtts',
-                'file_size': file_size,
-                'duration': None  # gTTS doesn't provide duration
-            }
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                futures = [
+                    executor.submit(propagate(self.text_to_speech), piece.text, language, part_path, slow)
+                    for piece, part_path in zip(pieces, part_paths)
+                ]
+
+                try:
+                    with open(temp_path, 'wb') as output_file:
+                        for piece, part_path, future in zip(pieces, part_paths, futures):
+                            future.result()
+
+                            with open(part_path, 'rb') as part_file:
+                                data = part_file.read()
+                            os.remove(part_path)
+
+                            # Copy only the audio frames so tags don't end up mid-stream
+                            start_time = elapsed
+                            for frame_start, frame_end, samples, sample_rate in iter_mp3_frames(data):
+                                output_file.write(data[frame_start:frame_end])
+                                elapsed += samples / sample_rate
+                            output_file.flush()
+
+                            piece_info.append({
+                                'start_char': piece.start_char,
+                                'end_char': piece.end_char,
+                                'start_time': start_time,
+                                'end_time': elapsed
+                            })
+                except BaseException:
+                    # Don't synthesize (and pay for) pieces that would only be deleted
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+            os.replace(temp_path, output_path)
         except Exception as e:
-            raise Exception(f"gTTS error: {str(e)}")
+            for part_path in part_paths + [temp_path]:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+            if isinstance(e, (CancelledError, CircuitOpenError, ValueError)):
+                raise
+            raise Exception(f"TTS generation error: {str(e)}")
+
+        return {
+            'success': True,
+            'audio_path': output_path,
+            'language': language,
+            'service': self.service,
+            'file_size': os.path.getsize(output_path),
+            'duration': elapsed,
+            'pieces': piece_info
+        }
+
+    def _split_into_pieces(self, text: str, max_chars: int) -> List[Segment]:
+        """
+        Group sentences into pieces of at most max_chars, keeping character offsets
+
+        Sentences longer than max_chars are split at whitespace.
+        """
+        pieces = []
+        current_start = None
+        current_end = 0
+
+        for match in re.finditer(r'\S.*?(?:[.!?](?=\s)|$)', text, flags=re.DOTALL):
+            start, end = match.start(), match.end()
+
+            # Break overlong sentences at word boundaries
+            while end - start > max_chars:
+                split_at = text.rfind(' ', start, start + max_chars)
+                if split_at <= start:
+                    split_at = start + max_chars
+                if current_start is not None:
+                    pieces.append((current_start, current_end))
+                    current_start = None
+                pieces.append((start, split_at))
+                start = split_at
+                while start < end and text[start].isspace():
+                    start += 1
+
+            if start >= end:
+                continue
+
+            if current_start is not None and end - current_start > max_chars:
+                pieces.append((current_start, current_end))
+                current_start = None
+
+            if current_start is None:
+                current_start = start
+            current_end = end
+
+        if current_start is not None:
+            pieces.append((current_start, current_end))
+
+        pieces = [(start, end) for start, end in pieces if text[start:end].strip()]
+        return [
+            Segment(i, text[start:end].strip(), start, end)
+            for i, (start, end) in enumerate(pieces)
+        ]
 
     def _google_cloud_generate(
         self,
@@ -111,57 +261,102 @@ class TextToSpeechService:
         # Placeholder for ElevenLabs implementation
         raise NotImplementedError("ElevenLabs TTS not yet implemented. Use 'gtts' for now.")
 
+    @traced('tts.segments')
     def generate_with_timestamps(
         self,
-        segments: List[Dict],
+        segments: List[Segment],
         language: str,
-        output_dir: str
-    ) -> List[Dict]:
+        output_dir: str,
+        checkpoint=None
+    ) -> List[AudioSegment]:
         """
         Generate TTS for multiple text segments with timestamps
 
+        Stops with CancelledError as soon as the current request or job is
+        cancelled or runs out of time; segment files already written stay.
+
         Args:
-            segments: List of text segments with metadata
+            segments: Text segments (from create_sentence_segments or create_word_segments)
             language: Language code
             output_dir: Directory to save audio files
+            checkpoint: Optional TranslationCheckpoint of segments made by earlier runs
 
         Returns:
             List of audio file info with timestamps
         """
-        results = []
+        return list(self.iter_with_timestamps(segments, language, output_dir, checkpoint))
+
+    def iter_with_timestamps(
+        self,
+        segments: List[Segment],
+        language: str,
+        output_dir: str,
+        checkpoint=None
+    ) -> Iterator[AudioSegment]:
+        """
+        Generate TTS for multiple text segments, yielding each one as soon as its audio is written
 
-        for i, segment in enumerate(segments):
+        With a checkpoint, segments an earlier (cancelled or failed) run already
+        synthesized from the same text are copied instead of synthesized again,
+        and every new segment is recorded as soon as it is written.
+
+        Args:
+            segments: Text segments (from create_sentence_segments or create_word_segments)
+            language: Language code
+            output_dir: Directory to save audio files
+            checkpoint: Optional TranslationCheckpoint of segments made by earlier runs
+
+        Yields:
+            Audio file info with character offsets and playback start/end times
+        """
+        elapsed = 0.0
+
+        for segment in segments:
             try:
-                text = segment.get('text', '')
-                if not text.strip():
+                if not segment.text.strip():
                     continue
 
                 # Generate unique filename for each segment
-                segment_id = segment.get('id', i)
-                output_filename = f"segment_{segment_id}.mp3"
+                output_filename = f"segment_{segment.id}.mp3"
                 output_path = os.path.join(output_dir, output_filename)
 
                 # Generate audio
-                audio_info = self.text_to_speech(text, language, output_path)
+                audio_segment = AudioSegment.from_audio(
+                    self._synthesize_segment(segment, language, output_path, checkpoint),
+                    segment
+                )
 
-                # Add segment metadata
-                audio_info['segment_id'] = segment_id
-                audio_info['start_char'] = segment.get('start_char', 0)
-                audio_info['end_char'] = segment.get('end_char', len(text))
-                audio_info['text'] = text
+                # Position of this segment when the segments are played back to back
+                if audio_segment.get('duration') is not None:
+                    audio_segment.start_time = elapsed
+                    elapsed += audio_segment.duration
+                    audio_segment.end_time = elapsed
 
-                results.append(audio_info)
+                yield audio_segment
 
+            except CancelledError:
+                raise
             except Exception as e:
-                results.append({
-                    'segment_id': segment.get('id', i),
-                    'error': str(e),
-                    'text': segment.get('text', '')
-                })
-
-        return results
-
-    def create_sentence_segments(self, text: str) -> List[Dict]:
+                yield AudioSegment(segment.id, segment.text, error=str(e))
+
+    def _synthesize_segment(self, segment: Segment, language: str, output_path: str, checkpoint=None) -> Dict:
+        """Synthesize one segment, or copy its audio from an earlier run that already made it"""
+        unit = f"audio:{segment.id}"
+        # The same text read by another TTS service is different audio
+        source_text = f"{self.service}\0{segment.text}"
+
+        saved = checkpoint.get(unit, source_text) if checkpoint else None
+        if saved is not None and os.path.exists(saved['audio_path']):
+            shutil.copyfile(saved['audio_path'], output_path)
+            return {**saved, 'audio_path': output_path}
+
+        audio_info = self.text_to_speech(segment.text, language, output_path)
+        if checkpoint:
+            checkpoint.record(unit, source_text, audio_info)
+        return audio_info
+
+    @timed_stage('sentence_segments')
+    def create_sentence_segments(self, text: str) -> List[Segment]:
         """
         Split text into sentence segments for TTS
 
@@ -179,18 +374,13 @@ class TextToSpeechService:
 
         for i, sentence in enumerate(sentences):
             if sentence.strip():
-                segment = {
-                    'id': i,
-                    'text': sentence.strip(),
-                    'start_char': char_position,
-                    'end_char': char_position + len(sentence)
-                }
-                segments.append(segment)
+                segments.append(Segment(i, sentence.strip(), char_position, char_position + len(sentence)))
                 char_position += len(sentence) + 1  # +1 for space
 
         return segments
 
-    def create_word_segments(self, text: str) -> List[Dict]:
+    @timed_stage('word_segments')
+    def create_word_segments(self, text: str) -> List[Segment]:
         """
         Split text into word segments for word-by-word highlighting
 
@@ -209,13 +399,7 @@ class TextToSpeechService:
         for i, word in enumerate(words):
             word_start = text.find(word, char_position)
             if word_start != -1:
-                segment = {
-                    'id': i,
-                    'text': word,
-                    'start_char': word_start,
-                    'end_char': word_start + len(word)
-                }
-                segments.append(segment)
+                segments.append(Segment(i, word, word_start, word_start + len(word)))
                 char_position = word_start + len(word)
 
         return segments
@@ -227,16 +411,9 @@ class TextToSpeechService:
         Returns:
             List of language codes
         """
-        if self.service == 'gtts':
-            # Common languages supported by gTTS
-            return [
-                'en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ja', 'ko',
-                'zh-cn', 'zh-tw', 'ar', 'hi', 'nl', 'pl', 'tr', 'vi',
-                'th', 'id', 'sv', 'no', 'da', 'fi', 'cs', 'el', 'he',
-                'hu', 'ro', 'sk', 'uk', 'bn', 'ta', 'te', 'mr', 'gu'
-            ]
-        else:
-            return []
+        if self.service in provider_registry.names('tts'):
+            return list(getattr(provider_registry.load('tts', self.service), 'languages', []))
+        return []
 
     def estimate_duration(self, text: str, words_per_minute: int = 150) -> float:
         """
@@ -0,0 +1,107 @@
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from app.utils.metrics import CACHE_HITS, CACHE_MISSES
+
+class TranslationCache:
+    """
+    Translations keyed by service, language pair and source text, stored in SQLite
+
+    The database can be shared by several processes (WAL mode), so batch
+    workers translating the same course material only pay for each text once.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize translation cache
+
+        Args:
+            path: SQLite database path (created if missing)
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS translations ('
+            'key TEXT PRIMARY KEY, service TEXT, source_lang TEXT, target_lang TEXT, result TEXT)'
+        )
+        connection.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections can't be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _key(service: str, source_lang: str, target_lang: str, text: str) -> str:
+        return hashlib.sha1(f"{service}\0{source_lang}\0{target_lang}\0{text}".encode('utf-8')).hexdigest()
+
+    def get(self, service: str, source_lang: str, target_lang: str, text: str) -> Optional[Dict]:
+        """
+        Get a cached translation
+
+        Args:
+            service: Translation service
+            source_lang: Source language code as requested (may be 'auto')
+            target_lang: Target language code
+            text: Source text
+
+        Returns:
+            Cached translation result, or None
+        """
+        row = self._connection().execute(
+            'SELECT result FROM translations WHERE key = ?',
+            (self._key(service, source_lang, target_lang, text),)
+        ).fetchone()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            CACHE_MISSES.inc(cache='translation')
+            return None
+
+        CACHE_HITS.inc(cache='translation')
+        return json.loads(row[0])
+
+    def put(self, service: str, source_lang: str, target_lang: str, text: str, result: Dict):
+        """Store a translation result"""
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO translations (key, service, source_lang, target_lang, result) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (
+                self._key(service, source_lang, target_lang, text),
+                service,
+                source_lang,
+                target_lang,
+                json.dumps(result, ensure_ascii=False)
+            )
+        )
+        connection.commit()
+
+def init_app(app):
+    """
+    Create the translation cache shared by the app's routes and jobs
+
+    Retried /translate, document, page and pipeline requests then only pay
+    the provider for texts that were never translated. The cache is
+    available as app.extensions['translation_cache'] (None when
+    TRANSLATION_CACHE_PATH is unset).
+    """
+    path = app.config.get('TRANSLATION_CACHE_PATH')
+    app.extensions['translation_cache'] = TranslationCache(path) if path else None
@@ -1,41 +1,124 @@
 from typing import Dict, List, Optional
+import hashlib
+import json
 import os
-from deep_translator import GoogleTranslator
-import deepl
+import threading
+from app.models import TranslationUnit
+from app.services.circuit_breaker import CircuitOpenError, provider_circuits
+from app.services.providers import provider_registry
+from app.services.scheduler import provider_scheduler
+from app.utils.cancellation import CancelledError, check_cancelled
+from app.utils.metrics import track_provider_call
+from app.utils.tracing import span, traced
+
+class TranslationCheckpoint:
+    """
+    Append-only record of translated units (chunks, pages) of one document
+
+    Each finished unit is appended as one JSON line and flushed to disk, so
+    after a provider error or a worker restart only the missing or failed
+    units need translating again. Units are matched on the service and a
+    hash of their source text, so a re-chunked document is not mixed up.
+    """
+
+    def __init__(self, path: str, service: str):
+        """
+        Initialize checkpoint, loading any units saved by earlier attempts
+
+        Args:
+            path: Checkpoint file path (.jsonl)
+            service: Translation service the units are translated with
+        """
+        self.path = path
+        self.service = service
+        self.resumed = 0
+        self._lock = threading.Lock()
+        self._units = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        units = {}
+        if not os.path.exists(self.path):
+            return units
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Last line cut short by a crash
+                units[entry['unit']] = entry
+        return units
+
+    def _source_hash(self, source_text: str) -> str:
+        return hashlib.sha1(f"{self.service}\0{source_text}".encode('utf-8')).hexdigest()
+
+    def get(self, unit: str, source_text: str) -> Optional[Dict]:
+        """
+        Get a unit's saved translation
+
+        Args:
+            unit: Unit name (e.g., 'chunk:3', 'page:12')
+            source_text: The unit's source text
+
+        Returns:
+            Saved translation result, or None if the unit must be translated
+        """
+        entry = self._units.get(unit)
+        if entry is None or entry['source_hash'] != self._source_hash(source_text):
+            return None
+
+        with self._lock:
+            self.resumed += 1
+        return entry['result']
+
+    def record(self, unit: str, source_text: str, result: Dict):
+        """Save a unit's translation as soon as it completes"""
+        entry = {'unit': unit, 'source_hash': self._source_hash(source_text), 'result': result}
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+
+        with self._lock:
+            self._units[unit] = entry
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # One O_APPEND write per line, so lines from other processes never interleave
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode('utf-8'))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def discard(self):
+        """Delete the checkpoint (the document was translated completely)"""
+        with self._lock:
+            self._units = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
 
 class TranslationService:
     """Service for translating text using various translation APIs"""
 
-    def __init__(self, service: str = 'google'):
+    def __init__(self, service: str = 'google', cache=None):
         """
         Initialize translation service
 
         Args:
-            service: Translation service to use ('google', 'deepl', 'google_cloud')
+            service: Translation service to use ('google', 'deepl' or a backend from an entry point)
+            cache: Optional TranslationCache consulted before each provider call
         """
         self.service = service
+        self.cache = cache
         self.translator = None
         self._initialize_translator()
 
     def _initialize_translator(self):
-        """Initialize the appropriate translator based on service type"""
-        if self.service == 'google':
-            # Using deep-translator (free, no API key needed)
-            # Translator object is created per request
-            self.translator = None
-        elif self.service == 'deepl':
-            # Using DeepL (requires API key)
-            api_key = os.environ.get('DEEPL_API_KEY')
-            if api_key:
-                self.translator = deepl.Translator(api_key)
-            else:
-                raise ValueError("DeepL API key not found in environment variables")
-        elif self.service == 'google_cloud':
+        """Create the backend for the service (its provider library is imported on first use)"""
+        if self.service == 'google_cloud':
             # Using Google Cloud Translation API (requires API key)
             # Implementation for Google Cloud can be added here
             raise NotImplementedError("Google Cloud Translation not yet implemented")
-        else:
+        if self.service not in provider_registry.names('translation'):
             raise ValueError(f"Unsupported translation service: {self.service}")
+        self.translator = provider_registry.create('translation', self.service)
 
     def translate_text(
         self,
@@ -53,6 +136,12 @@ class TranslationService:
 
         Returns:
             Dictionary with translation results
+
+        Raises:
+            CancelledError: If the current request or job was cancelled or
+                ran out of time before the provider call was made
+            CircuitOpenError: If the provider's circuit is open (not attempted)
+            ValueError: If the provider rejected the input (e.g. an unsupported language)
         """
         if not text or not text.strip():
             return {
@@ -62,110 +151,191 @@ class TranslationService:
                 'service': self.service
             }
 
-        try:
-            if self.service == 'google':
-                return self._translate_google(text, target_lang, source_lang)
-            elif self.service == 'deepl':
-                return self._translate_deepl(text, target_lang, source_lang)
-            else:
-                raise ValueError(f"Unsupported service: {self.service}")
-        except Exception as e:
-            raise Exception(f"Translation error: {str(e)}")
+        if self.cache is not None:
+            cached = self.cache.get(self.service, source_lang, target_lang, text)
+            if cached is not None:
+                return cached
 
-    def _translate_google(
-        self,
-        text: str,
-        target_lang: str,
-        source_lang: str
-    ) -> Dict:
-        """Translate using Google Translate (free)"""
+        check_cancelled()
         try:
-            # deep-translator requires source language (use 'auto' for auto-detection)
-            translator = GoogleTranslator(
-                source=source_lang if source_lang != 'auto' else 'auto',
-                target=target_lang
-            )
-            translated_text = translator.translate(text)
-
-            # Detect source language if auto was used
-            detected_source = source_lang
-            if source_lang == 'auto':
-                try:
-                    from deep_translator import single_detection
-                    detected_source = single_detection(text, api_key=None)
-                except:
-                    detected_source = 'unknown'
-
-            return {
-                'translated_text': translated_text,
-                'source_lang': detected_source,
-                'target_lang': target_lang,
-                'service': 'google',
-                'confidence': None
-            }
+            with provider_circuits.guard('translation', self.service), \
+                    provider_scheduler.slot(self.service, cost=len(text)), \
+                    span('translate.provider', provider=self.service, chars=len(text), target_lang=target_lang), \
+                    track_provider_call('translation', self.service, len(text)):
+                result = self.translator.translate(text, target_lang, source_lang)
+        except (CancelledError, CircuitOpenError, ValueError):
+            raise
         except Exception as e:
-            raise Exception(f"Google Translate error: {str(e)}")
-
-    def _translate_deepl(
-        self,
-        text: str,
-        target_lang: str,
-        source_lang: str
-    ) -> Dict:
-        """Translate using DeepL API"""
-        try:
-            # DeepL language codes are uppercase
-            target_lang_upper = target_lang.upper()
-            source_lang_param = None if source_lang == 'auto' else source_lang.upper()
-
-            result = self.translator.translate_text(
-                text,
-                target_lang=target_lang_upper,
-                source_lang=source_lang_param
-            )
+            raise Exception(f"Translation error: {str(e)}")
 
-            return {
-                'translated_text': result.text,
-                'source_lang': result.detected_source_lang.lower() if result.detected_source_lang else source_lang,
-                'target_lang': target_lang,
-                'service': 'deepl'
-            }
-        except Exception as e:
-            raise Exception(f"DeepL translation error: {str(e)}")
+        # Kept even if the deadline passed during the call, for the retry
+        if self.cache is not None:
+            self.cache.put(self.service, source_lang, target_lang, text, result)
+        return result
 
+    @traced('translate.chunks')
     def translate_chunks(
         self,
         chunks: List[str],
         target_lang: str,
-        source_lang: str = 'auto'
-    ) -> List[Dict]:
+        source_lang: str = 'auto',
+        checkpoint: Optional[TranslationCheckpoint] = None
+    ) -> List[TranslationUnit]:
         """
         Translate multiple text chunks
 
+        Stops as soon as the current request or job is cancelled or runs out
+        of time; the chunks finished until then are in the checkpoint.
+
         Args:
             chunks: List of text chunks to translate
             target_lang: Target language code
             source_lang: Source language code
+            checkpoint: Optional checkpoint to resume from and save progress to
 
         Returns:
-            List of translation results for each chunk
+            Translation unit for each chunk (failed chunks carry the error)
+
+        Raises:
+            CancelledError: If the current request or job was cancelled or ran out of time
         """
         results = []
 
         for i, chunk in enumerate(chunks):
+            # Already translated by an earlier attempt
+            saved = checkpoint.get(f"chunk:{i}", chunk) if checkpoint else None
+            if saved is not None:
+                results.append(TranslationUnit.from_result(saved, i))
+                continue
+
             try:
-                translation = self.translate_text(chunk, target_lang, source_lang)
-                translation['chunk_index'] = i
+                translation = TranslationUnit.from_result(self.translate_text(chunk, target_lang, source_lang), i)
+                if checkpoint:
+                    checkpoint.record(f"chunk:{i}", chunk, translation.to_dict())
                 results.append(translation)
+            except CancelledError:
+                raise
             except Exception as e:
-                results.append({
-                    'chunk_index': i,
-                    'error': str(e),
-                    'original_text': chunk
-                })
+                results.append(TranslationUnit(i, error=str(e), original_text=chunk))
 
         return results
 
+    @traced('translate.document')
+    def translate_document(
+        self,
+        text_data: Dict,
+        chunks: List[str],
+        target_lang: str,
+        source_lang: str = 'auto',
+        translate_boilerplate: bool = False,
+        checkpoint: Optional[TranslationCheckpoint] = None
+    ) -> Dict:
+        """
+        Translate an extracted document, both as a whole and page by page
+
+        Running headers/footers detected by PDFProcessor are not part of the
+        page text; with translate_boilerplate each distinct line is
+        translated once and returned under 'boilerplate'.
+
+        A chunk or page that fails doesn't stop the rest; the result's
+        'complete' flag is False and the failed units are listed, so the
+        document can be resumed with the same checkpoint. Cancellation or a
+        deadline stops the whole document (CancelledError); the units
+        finished until then are kept in the checkpoint as well.
+
+        Args:
+            text_data: Extracted text data (as saved by PDFProcessor)
+            chunks: The document's full text split into chunks
+            target_lang: Target language code
+            source_lang: Source language code
+            translate_boilerplate: Also translate the distinct boilerplate lines
+            checkpoint: Optional checkpoint to resume from and save progress to
+
+        Returns:
+            Dictionary with the translated document in the saved translation layout
+        """
+        # Translate chunks
+        translated_chunks = self.translate_chunks(chunks, target_lang, source_lang, checkpoint)
+
+        # Combine translated chunks
+        translated_text = ' '.join([
+            chunk.translated_text
+            for chunk in translated_chunks
+            if not chunk.failed
+        ])
+
+        # Also translate page by page for better structure
+        translated_pages = []
+        failed_pages = []
+        for page in text_data['pages']:
+            unit = f"page:{page['page_number']}"
+            page_translation = checkpoint.get(unit, page['text']) if checkpoint else None
+
+            if page_translation is None:
+                try:
+                    page_translation = self.translate_text(
+                        page['text'],
+                        target_lang,
+                        source_lang
+                    )
+                except CancelledError:
+                    raise
+                except Exception as e:
+                    failed_pages.append(page['page_number'])
+                    translated_pages.append({
+                        'page_number': page['page_number'],
+                        'original_text': page['text'],
+                        'translated_text': '',
+                        'char_count': 0,
+                        'error': str(e)
+                    })
+                    continue
+
+                if checkpoint:
+                    checkpoint.record(unit, page['text'], page_translation)
+
+            translated_pages.append({
+                'page_number': page['page_number'],
+                'original_text': page['text'],
+                'translated_text': page_translation['translated_text'],
+                'char_count': len(page_translation['translated_text'])
+            })
+
+        failed_chunks = [chunk.chunk_index for chunk in translated_chunks if chunk.failed]
+
+        # Each distinct header/footer line once (page numbers need no translation)
+        boilerplate = []
+        if translate_boilerplate:
+            for line in text_data.get('boilerplate', []):
+                if not any(char.isalpha() for char in line['text']):
+                    continue
+                try:
+                    translated_line = self.translate_text(line['text'], target_lang, source_lang)['translated_text']
+                    boilerplate.append({**line, 'translated_text': translated_line})
+                except CancelledError:
+                    raise
+                except Exception as e:
+                    boilerplate.append({**line, 'error': str(e)})
+
+        # Prepare result with both original and translated text
+        return {
+            'source_lang': translated_chunks[0].get('source_lang', source_lang) if translated_chunks else source_lang,
+            'target_lang': target_lang,
+            'service': self.service,
+            'original_text': text_data['full_text'],  # Include original text
+            'translated_text': translated_text,
+            'full_text': translated_text,  # Keep for backward compatibility
+            'pages': translated_pages,
+            'total_pages': len(translated_pages),
+            'total_chars': len(translated_text),
+            'original_pages': text_data['pages'],  # Include original pages
+            'boilerplate': boilerplate,
+            'complete': not failed_chunks and not failed_pages,  # False: resume before serving
+            'failed_chunks': failed_chunks,
+            'failed_pages': failed_pages,
+            'resumed_units': checkpoint.resumed if checkpoint else 0
+        }
+
     def detect_language(self, text: str) -> Dict:
         """
         Detect the language of input text
@@ -176,10 +346,9 @@ class TranslationService:
         Returns:
             Dictionary with detected language info
         """
-        if self.service == 'google':
+        if hasattr(self.translator, 'detect'):
             try:
-                from deep_translator import single_detection
-                detected_lang = single_detection(text, api_key=None)
+                detected_lang = self.translator.detect(text)
                 return {
                     'language': detected_lang,
                     'confidence': None
@@ -201,18 +370,4 @@ class TranslationService:
         Returns:
             List of language codes
         """
-        if self.service == 'google':
-            return [
-                'en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ja', 'ko',
-                'zh-cn', 'zh-tw', 'ar', 'hi', 'nl', 'pl', 'tr', 'vi',
-                'th', 'id', 'ms', 'sv', 'no', 'da', 'fi'
-            ]
-        elif self.service == 'deepl':
-            return [
-                'en', 'de', 'fr', 'es', 'pt', 'it', 'nl', 'pl', 'ru',
-                'ja', 'zh', 'bg', 'cs', 'da', 'el', 'et', 'fi', 'hu',
-                'id', 'ko', 'lt', 'lv', 'nb', 'ro', 'sk', 'sl', 'sv',
-                'tr', 'uk'
-            ]
-        else:
-            return []
+        return list(getattr(self.translator, 'languages', []))
@@ -0,0 +1,266 @@
+from typing import BinaryIO, Dict, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from app.utils.files import atomic_write_json, document_lock
+
+# Bytes read from the request stream at a time
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+# Running whole-file hashes of sessions this process has been appending to
+_hashers = {}
+_hashers_lock = threading.Lock()
+
+class UploadOffsetError(ValueError):
+    """A chunk was sent for an offset other than the session's current one"""
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(message)
+        self.offset = offset
+
+class UploadSessionStore:
+    """
+    Resumable chunked uploads written straight to disk
+
+    A session is created with the file's name, size and (optionally) its
+    SHA-256. Chunks are appended at the session's current offset, streamed
+    from the request in small blocks and hashed as they are written, so
+    memory use doesn't depend on the file or chunk size. After a dropped
+    connection the client asks for the offset and continues from there.
+    Finalize checks the size and hash and moves the file into place.
+
+    Session state lives next to the data ({upload_id}.json and .part), so
+    any worker process sharing the upload folder can take the next chunk.
+    """
+
+    def __init__(self, upload_folder: str, max_size: int, ttl_seconds: float = 86400):
+        """
+        Initialize upload session store
+
+        Args:
+            upload_folder: Upload folder (sessions are kept in its .sessions subfolder)
+            max_size: Largest file accepted, in bytes
+            ttl_seconds: Sessions untouched for this long are discarded
+        """
+        self.folder = os.path.join(upload_folder, '.sessions')
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+    def _meta_path(self, upload_id: str) -> str:
+        return os.path.join(self.folder, f"{upload_id}.json")
+
+    def _part_path(self, upload_id: str) -> str:
+        return os.path.join(self.folder, f"{upload_id}.part")
+
+    def _load(self, upload_id: str) -> Dict:
+        if not upload_id or os.path.basename(upload_id) != upload_id or upload_id.startswith('.'):
+            raise FileNotFoundError("Upload session not found")
+        meta_path = self._meta_path(upload_id)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError("Upload session not found")
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def create(self, filename: str, size: int, sha256: Optional[str] = None) -> Dict:
+        """
+        Start an upload session
+
+        Args:
+            filename: Original file name
+            size: Total file size in bytes
+            sha256: Expected hex SHA-256 of the whole file (checked at finalize)
+
+        Returns:
+            Session status
+        """
+        if size <= 0:
+            raise ValueError("size must be positive")
+        if size > self.max_size:
+            raise ValueError(f"File too large (limit {self.max_size} bytes)")
+
+        self.expire()
+        os.makedirs(self.folder, exist_ok=True)
+
+        upload_id = uuid.uuid4().hex
+        session = {
+            'upload_id': upload_id,
+            'filename': filename,
+            'size': size,
+            'sha256': sha256.lower() if sha256 else None,
+            'created_at': time.time()
+        }
+        open(self._part_path(upload_id), 'wb').close()
+        atomic_write_json(self._meta_path(upload_id), session)
+
+        with _hashers_lock:
+            _hashers[upload_id] = (0, hashlib.sha256())
+
+        return self.status(upload_id)
+
+    def status(self, upload_id: str) -> Dict:
+        """
+        Get a session's progress
+
+        Args:
+            upload_id: Session identifier
+
+        Returns:
+            Dictionary with the session fields, the current offset and whether it is complete
+        """
+        session = self._load(upload_id)
+        offset = os.path.getsize(self._part_path(upload_id))
+        return {**session, 'offset': offset, 'complete': offset == session['size']}
+
+    def write_chunk(
+        self,
+        upload_id: str,
+        offset: int,
+        stream: BinaryIO,
+        length: Optional[int] = None,
+        chunk_sha256: Optional[str] = None
+    ) -> Dict:
+        """
+        Append a chunk at the session's current offset
+
+        Args:
+            upload_id: Session identifier
+            offset: Offset the chunk starts at (must equal the current offset)
+            stream: Readable stream with the chunk body
+            length: Chunk length, if known
+            chunk_sha256: Expected hex SHA-256 of this chunk
+
+        Returns:
+            Session status after the chunk
+
+        Raises:
+            UploadOffsetError: If offset isn't the current offset or another chunk is being written
+            ValueError: If the chunk overruns the file size or fails its checksum
+        """
+        session = self._load(upload_id)
+        part_path = self._part_path(upload_id)
+
+        try:
+            with document_lock(self.folder, upload_id, timeout=0):
+                written = self._append(upload_id, session, offset, stream, length, chunk_sha256)
+        except TimeoutError:
+            raise UploadOffsetError(
+                "Another chunk is being written for this upload", os.path.getsize(part_path)
+            )
+
+        os.utime(self._meta_path(upload_id))  # Keep active sessions from expiring
+        return {**self.status(upload_id), 'received': written}
+
+    def _append(self, upload_id, session, offset, stream, length, chunk_sha256) -> int:
+        part_path = self._part_path(upload_id)
+        current = os.path.getsize(part_path)
+        if offset != current:
+            raise UploadOffsetError(f"Expected offset {current}, got {offset}", current)
+        if length is not None and current + length > session['size']:
+            raise ValueError("Chunk extends past the declared file size")
+
+        with _hashers_lock:
+            hasher_offset, hasher = _hashers.get(upload_id, (None, None))
+        # Extend a copy of the running hash so a rejected chunk leaves it untouched;
+        # if earlier chunks went to another process, finalize rehashes from disk
+        hasher = hasher.copy() if hasher_offset == current else None
+
+        chunk_hash = hashlib.sha256()
+        written = 0
+        try:
+            with open(part_path, 'ab') as f:
+                while True:
+                    block = stream.read(STREAM_BLOCK_SIZE)
+                    if not block:
+                        break
+                    written += len(block)
+                    if current + written > session['size']:
+                        raise ValueError("Chunk extends past the declared file size")
+                    f.write(block)
+                    chunk_hash.update(block)
+                    if hasher is not None:
+                        hasher.update(block)
+                f.flush()
+                os.fsync(f.fileno())
+
+            if chunk_sha256 and chunk_hash.hexdigest() != chunk_sha256.lower():
+                raise ValueError("Chunk checksum mismatch")
+        except Exception:
+            # Drop the partial chunk so the client can resend it from the same offset
+            with open(part_path, 'ab') as f:
+                f.truncate(current)
+            raise
+
+        if hasher is not None:
+            with _hashers_lock:
+                _hashers[upload_id] = (current + written, hasher)
+        return written
+
+    def finalize(self, upload_id: str, destination: str) -> Dict:
+        """
+        Verify a complete upload and move it to its final path
+
+        Args:
+            upload_id: Session identifier
+            destination: Final file path
+
+        Returns:
+            Session fields with the verified sha256
+
+        Raises:
+            ValueError: If the upload is incomplete or its checksum doesn't match
+        """
+        session = self._load(upload_id)
+        part_path = self._part_path(upload_id)
+
+        with document_lock(self.folder, upload_id, timeout=5):
+            size = os.path.getsize(part_path)
+            if size != session['size']:
+                raise ValueError(f"Upload incomplete: {size} of {session['size']} bytes received")
+
+            with _hashers_lock:
+                hasher_offset, hasher = _hashers.pop(upload_id, (None, None))
+            if hasher_offset != size:
+                # Chunks came through other processes; hash the file from disk
+                hasher = hashlib.sha256()
+                with open(part_path, 'rb') as f:
+                    for block in iter(lambda: f.read(STREAM_BLOCK_SIZE), b''):
+                        hasher.update(block)
+
+            digest = hasher.hexdigest()
+            if session['sha256'] and digest != session['sha256']:
+                raise ValueError("File checksum mismatch")
+
+            os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+            os.replace(part_path, destination)
+            os.remove(self._meta_path(upload_id))
+
+        return {**session, 'sha256': digest}
+
+    def abort(self, upload_id: str):
+        """Discard a session and its data"""
+        self._load(upload_id)
+        with _hashers_lock:
+            _hashers.pop(upload_id, None)
+        for path in (self._part_path(upload_id), self._meta_path(upload_id)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def expire(self):
+        """Remove sessions untouched for longer than the TTL"""
+        if not os.path.isdir(self.folder):
+            return
+
+        cutoff = time.time() - self.ttl_seconds
+        for name in os.listdir(self.folder):
+            path = os.path.join(self.folder, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                continue
+            # Forget the running hash too, or expired sessions pile up in memory
+            with _hashers_lock:
+                _hashers.pop(os.path.splitext(name)[0], None)
@@ -0,0 +1,160 @@
+from typing import Dict, Optional
+import threading
+import time
+from app.utils.metrics import ADMISSION_REJECTIONS, QUEUE_DEPTH
+
+class RouteLimit:
+    """Concurrent requests allowed on one route, with a bounded wait queue"""
+
+    def __init__(self, route: str, concurrency: int, queue_size: int):
+        """
+        Initialize route limit
+
+        Args:
+            route: Route (endpoint) name
+            concurrency: Requests handled at the same time
+            queue_size: Requests allowed to wait for a slot; more are rejected at once
+        """
+        self.route = route
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.active = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: float) -> bool:
+        """
+        Take a slot, waiting up to timeout seconds in the queue
+
+        Returns:
+            False if the queue is full or no slot freed up in time
+        """
+        with self._condition:
+            if self.active < self.concurrency and not self.waiting:
+                self.active += 1
+                return True
+            if self.waiting >= self.queue_size:
+                return False
+
+            self.waiting += 1
+            QUEUE_DEPTH.inc(queue=f"admission_{self.route}")
+            deadline = time.monotonic() + timeout
+            try:
+                while self.active >= self.concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+                self.active += 1
+                return True
+            finally:
+                self.waiting -= 1
+                QUEUE_DEPTH.dec(queue=f"admission_{self.route}")
+
+    def release(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+    def snapshot(self) -> Dict:
+        with self._condition:
+            return {
+                'active': self.active,
+                'concurrency': self.concurrency,
+                'waiting': self.waiting,
+                'queue_size': self.queue_size,
+                'saturation': self.active / self.concurrency if self.concurrency else 1.0
+            }
+
+class AdmissionController:
+    """
+    Per-route admission control
+
+    Each route (Flask endpoint) gets its own concurrency limit and wait
+    queue, from the configured limits or the 'default' entry. A request
+    that finds the queue full, or waits longer than queue_timeout, is
+    rejected right away instead of tying up a worker thread until its
+    client gives up.
+    """
+
+    def __init__(self, limits: Dict[str, Dict], queue_timeout: float = 10.0):
+        """
+        Initialize admission controller
+
+        Args:
+            limits: {route: {'concurrency': n, 'queue': m}}, with a 'default' entry for other routes
+            queue_timeout: Seconds a request may wait for a slot
+        """
+        self.limits = limits
+        self.queue_timeout = queue_timeout
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def route_limit(self, route: str) -> RouteLimit:
+        with self._lock:
+            route_limit = self._routes.get(route)
+            if route_limit is None:
+                settings = self.limits.get(route) or self.limits.get('default', {})
+                route_limit = RouteLimit(route, settings.get('concurrency', 16), settings.get('queue', 32))
+                self._routes[route] = route_limit
+            return route_limit
+
+    def admit(self, route: str) -> Optional[RouteLimit]:
+        """
+        Admit a request to a route
+
+        Returns:
+            The route limit to release when the request ends, or None if it was rejected
+        """
+        route_limit = self.route_limit(route)
+        if route_limit.acquire(self.queue_timeout):
+            return route_limit
+        ADMISSION_REJECTIONS.inc(route=route)
+        return None
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Load of every route that has had requests"""
+        with self._lock:
+            routes = list(self._routes.values())
+        return {route_limit.route: route_limit.snapshot() for route_limit in routes}
+
+def init_app(app):
+    """
+    Apply admission control to a Flask app's requests
+
+    Limits come from ADMISSION_LIMITS; routes in ADMISSION_EXEMPT (health,
+    readiness, metrics) are never limited. Rejected requests get a 503
+    with a Retry-After header. The slot is held until the response is
+    finished, including streamed responses. The controller is available
+    as app.extensions['admission'].
+    """
+    from flask import g, jsonify, request
+
+    controller = AdmissionController(app.config['ADMISSION_LIMITS'], app.config['ADMISSION_QUEUE_TIMEOUT'])
+    app.extensions['admission'] = controller
+    exempt = set(app.config['ADMISSION_EXEMPT'])
+    retry_after = str(int(app.config['ADMISSION_RETRY_AFTER']))
+
+    @app.before_request
+    def _admit_request():
+        if request.endpoint is None or request.endpoint in exempt or request.method == 'OPTIONS':
+            return None
+
+        route_limit = controller.admit(request.endpoint)
+        if route_limit is None:
+            response = jsonify({
+                'error': 'Server is busy',
+                'details': f"Too many concurrent {request.endpoint} requests; retry in {retry_after} seconds"
+            })
+            response.status_code = 503
+            response.headers['Retry-After'] = retry_after
+            return response
+
+        g.admission_slot = route_limit
+        return None
+
+    @app.teardown_request
+    def _release_request(exc):
+        route_limit = g.pop('admission_slot', None)
+        if route_limit is not None:
+            route_limit.release()
@@ -0,0 +1,130 @@
+from typing import Iterator, Tuple
+
+# Bitrates in kbps indexed by [version_group][layer][bitrate_index]
+# version_group 0 = MPEG-1, 1 = MPEG-2 / MPEG-2.5
+_BITRATES = {
+    (0, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (0, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (0, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (1, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (1, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (1, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+# Sample rates in Hz indexed by MPEG version bits
+_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],   # MPEG-2.5
+}
+
+def _parse_frame_header(header: bytes) -> Tuple[int, int, int]:
+    """
+    Parse a 4-byte MPEG audio frame header
+
+    Args:
+        header: Four header bytes
+
+    Returns:
+        Tuple of (frame_length, samples_per_frame, sample_rate), or (0, 0, 0) if invalid
+    """
+    if header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return 0, 0, 0
+
+    version_bits = (header[1] >> 3) & 0x03
+    layer_bits = (header[1] >> 1) & 0x03
+    bitrate_index = (header[2] >> 4) & 0x0F
+    sample_rate_index = (header[2] >> 2) & 0x03
+    padding = (header[2] >> 1) & 0x01
+
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return 0, 0, 0
+
+    layer = 4 - layer_bits  # 1, 2 or 3
+    version_group = 0 if version_bits == 3 else 1
+    bitrate = _BITRATES[(version_group, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or version_group == 0:
+        samples = 1152
+        frame_length = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 576
+        frame_length = 72 * bitrate // sample_rate + padding
+
+    return frame_length, samples, sample_rate
+
+def skip_id3v2(data: bytes) -> int:
+    """
+    Get the offset of the first byte after a leading ID3v2 tag
+
+    Args:
+        data: MP3 file bytes
+
+    Returns:
+        Offset of the audio data (0 if there is no tag)
+    """
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+def iter_mp3_frames(data: bytes) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Iterate over the MPEG audio frames in MP3 data
+
+    Args:
+        data: MP3 file bytes
+
+    Yields:
+        Tuples of (start_offset, end_offset, samples, sample_rate) for each frame
+    """
+    position = skip_id3v2(data)
+    data_length = len(data)
+
+    while position + 4 <= data_length:
+        frame_length, samples, sample_rate = _parse_frame_header(data[position:position + 4])
+
+        if frame_length == 0 or position + frame_length > data_length:
+            # Resynchronize on the next possible frame sync
+            next_sync = data.find(b'\xff', position + 1)
+            if next_sync == -1:
+                break
+            position = next_sync
+            continue
+
+        yield position, position + frame_length, samples, sample_rate
+        position += frame_length
+
+def mp3_duration(data: bytes) -> float:
+    """
+    Compute the exact duration of MP3 data by summing its frames
+
+    Args:
+        data: MP3 file bytes
+
+    Returns:
+        Duration in seconds
+    """
+    duration = 0.0
+    for _, _, samples, sample_rate in iter_mp3_frames(data):
+        duration += samples / sample_rate
+    return duration
+
+def get_mp3_duration(path: str) -> float:
+    """
+    Compute the exact duration of an MP3 file
+
+    Args:
+        path: Path to the MP3 file
+
+    Returns:
+        Duration in seconds
+    """
+    with open(path, 'rb') as f:
+        return mp3_duration(f.read())
@@ -0,0 +1,192 @@
+from typing import Callable, Optional
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+class CancelledError(Exception):
+    """Work stopped because the request or job it belongs to was cancelled"""
+
+class DeadlineExceeded(CancelledError):
+    """Work stopped because the request or job it belongs to ran out of time"""
+
+class CancelToken:
+    """
+    Deadline and cancellation shared by all the work of one request or job
+
+    Work checks the token between units (chunks, pages, segments, queued
+    provider calls) and stops with CancelledError once the token is
+    cancelled or past its deadline. Calls already sent to a provider are
+    not interrupted, but their HTTP timeouts are capped by time_left(), so
+    they don't outlive the deadline either.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, name: str = 'work'):
+        """
+        Initialize token
+
+        Args:
+            timeout: Seconds until the deadline (None: no deadline, only explicit cancellation)
+            name: What the token belongs to, for error messages (e.g. 'translate.translate_document request')
+        """
+        self.name = name
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.reason = None
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def cancel(self, reason: str = 'cancelled'):
+        """
+        Cancel the work (only the first reason is kept)
+
+        Args:
+            reason: Why, reported in the CancelledError of the stopped work
+        """
+        with self._lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the token was cancelled or its deadline has passed"""
+        return self.reason is not None or self.remaining() == 0.0
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or None without one"""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def check(self):
+        """
+        Raises:
+            CancelledError: If the token was cancelled
+            DeadlineExceeded: If the deadline has passed
+        """
+        if self.reason is not None:
+            raise CancelledError(f"{self.name} cancelled: {self.reason}")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise DeadlineExceeded(f"{self.name} deadline of {self.timeout:g}s exceeded")
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Call callback once when the token is cancelled (right away if it already is)
+
+        Deadlines don't trigger callbacks; waiters use remaining() as their timeout.
+
+        Returns:
+            Function that unregisters the callback
+        """
+        with self._lock:
+            if self.reason is None:
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+# Token of the request or job the current context works for
+_current_token = contextvars.ContextVar('cancel_token', default=None)
+
+def current_token() -> Optional[CancelToken]:
+    """Token of the current context, or None (no deadline, never cancelled)"""
+    return _current_token.get()
+
+def set_token(token: Optional[CancelToken]):
+    """
+    Make the rest of the current context's work stop with a token
+
+    Meant for job bodies, which run in their own copy of the context (see
+    propagate()); elsewhere use cancel_scope().
+
+    Returns:
+        Token for resetting the previous setting
+    """
+    return _current_token.set(token)
+
+@contextmanager
+def cancel_scope(token: Optional[CancelToken]):
+    """
+    Make the work inside the block stop with a token
+
+    The token follows the context, so work handed to other threads with
+    propagate() stops with it too.
+    """
+    reset = set_token(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+def check_cancelled():
+    """Raise CancelledError if the current context's work should stop"""
+    token = _current_token.get()
+    if token is not None:
+        token.check()
+
+def is_cancelled() -> bool:
+    """Whether the current context's work should stop"""
+    token = _current_token.get()
+    return token is not None and token.cancelled
+
+def time_left(default: Optional[float] = None) -> Optional[float]:
+    """
+    Timeout for a blocking call: default, capped by the current deadline
+
+    Raises:
+        CancelledError: If the work should already have stopped
+    """
+    token = _current_token.get()
+    if token is None:
+        return default
+    token.check()
+    remaining = token.remaining()
+    if remaining is None:
+        return default
+    return remaining if default is None else min(default, remaining)
+
+def init_app(app):
+    """
+    Give every request a cancel token
+
+    The deadline comes from REQUEST_DEADLINES (by endpoint, else 'default');
+    a client can ask for a shorter one with an X-Request-Deadline header in
+    seconds. The token is cancelled when the request ends, so work it
+    started in other threads stops with it, and a streamed response whose
+    client disconnects stops synthesizing the rest.
+    """
+    from flask import g, request
+
+    deadlines = app.config['REQUEST_DEADLINES']
+
+    @app.before_request
+    def _request_token():
+        timeout = deadlines.get(request.endpoint, deadlines.get('default'))
+        try:
+            requested = float(request.headers.get('X-Request-Deadline', 0))
+        except ValueError:
+            requested = 0
+        if requested > 0:
+            timeout = requested if timeout is None else min(timeout, requested)
+
+        token = CancelToken(timeout, f"{request.endpoint} request")
+        g.cancel_token = token
+        g.cancel_token_reset = set_token(token)
+
+    @app.teardown_request
+    def _cancel_request(exc):
+        token = g.pop('cancel_token', None)
+        if token is not None:
+            token.cancel('request ended')
+        reset = g.pop('cancel_token_reset', None)
+        if reset is not None:
+            _current_token.reset(reset)
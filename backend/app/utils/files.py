@@ -0,0 +1,170 @@
+from typing import Dict, Optional
+import json
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from app.models import to_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+def temp_path_for(path: str) -> str:
+    """Unique temporary path next to path (same directory, so os.replace stays atomic)"""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+
+@contextmanager
+def atomic_output(path: str):
+    """
+    Write a file under a temporary name and move it into place when done
+
+    Readers see either the previous file or the complete new one, never a
+    partial write. The temporary file is removed if the block fails.
+
+    Args:
+        path: Final file path
+
+    Yields:
+        Temporary path to write to
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = temp_path_for(path)
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def atomic_write_json(path: str, data, indent: Optional[int] = 2):
+    """
+    Atomically write data as a JSON file
+
+    Args:
+        path: Output path
+        data: JSON-serializable data (models are written in their JSON shape)
+        indent: JSON indentation
+    """
+    with atomic_output(path) as temp_path:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent, default=to_json)
+            f.flush()
+            os.fsync(f.fileno())
+
+@contextmanager
+def document_lock(lock_folder: str, name: str, timeout: float = 30.0):
+    """
+    Exclusive advisory lock on one document, shared across processes
+
+    The lock is an OS file lock on {lock_folder}/{name}.lock, so it holds
+    across worker processes (and across nodes on a shared volume whose
+    filesystem supports file locks). Only one document is locked, so
+    unrelated documents never wait on each other.
+
+    Args:
+        lock_folder: Directory for lock files
+        name: Lock name (usually the document ID)
+        timeout: Seconds to wait for the lock
+
+    Raises:
+        TimeoutError: If the lock isn't acquired within timeout
+    """
+    os.makedirs(lock_folder, exist_ok=True)
+    lock_file = open(os.path.join(lock_folder, f"{name}.lock"), 'a+')
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for lock on {name}")
+                time.sleep(0.05)
+
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    finally:
+        lock_file.close()
+
+def new_audio_version(audio_folder: str, document_id: str) -> str:
+    """
+    Create a fresh directory for one generation of a document's audio
+
+    Every generation writes its segments into its own version directory, so
+    concurrent generations never overwrite each other's files and the
+    published version is never modified in place.
+
+    Args:
+        audio_folder: Audio output folder
+        document_id: Unique document identifier
+
+    Returns:
+        Version name (directory under audio/{document_id}/), sorting in creation order
+    """
+    # Microseconds too, so versions created within the same second still sort by creation time
+    now = time.time()
+    version = f"v{time.strftime('%Y%m%d%H%M%S', time.localtime(now))}{int(now % 1 * 1e6):06d}_{uuid.uuid4().hex[:8]}"
+    os.makedirs(os.path.join(audio_folder, document_id, version), exist_ok=True)
+    return version
+
+def audio_file_name(document_id: str, version: str, audio_path: str) -> str:
+    """Path of a segment file relative to the audio folder, as served by /tts/audio/<path>"""
+    return f"{document_id}/{version}/{os.path.basename(audio_path)}"
+
+def publish_audio_version(
+    audio_folder: str,
+    document_id: str,
+    version: str,
+    segment_info: Dict,
+    keep: int = 2,
+    lock_timeout: float = 30.0
+):
+    """
+    Make a finished audio version the document's current one
+
+    segments.json in the document directory is the pointer: it is replaced
+    atomically under the document lock, then published versions beyond the
+    newest keep are removed (the previous one stays for listeners who are
+    still playing it). Versions still being generated are never touched.
+
+    Args:
+        audio_folder: Audio output folder
+        document_id: Unique document identifier
+        version: Version returned by new_audio_version
+        segment_info: Segment information to publish
+        keep: Published versions kept on disk, including this one
+        lock_timeout: Seconds to wait for the document lock
+    """
+    doc_audio_dir = os.path.join(audio_folder, document_id)
+    segment_info_path = os.path.join(doc_audio_dir, 'segments.json')
+
+    with document_lock(os.path.join(audio_folder, '.locks'), document_id, lock_timeout):
+        history = []
+        if os.path.exists(segment_info_path):
+            with open(segment_info_path, 'r', encoding='utf-8') as f:
+                history = json.load(f).get('versions', [])
+
+        keep = max(1, keep)
+        history = [name for name in history if name != version] + [version]
+        superseded, history = history[:-keep], history[-keep:]
+
+        atomic_write_json(segment_info_path, {**segment_info, 'version': version, 'versions': history})
+
+        for name in superseded:
+            shutil.rmtree(os.path.join(doc_audio_dir, name), ignore_errors=True)
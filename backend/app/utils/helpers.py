@@ -1,3 +1,4 @@
+import math
 import os
 import uuid
 from datetime import datetime
@@ -63,3 +64,45 @@ def format_file_size(size_in_bytes: int) -> str:
             return f"{size_in_bytes:.2f} {unit}"
         size_in_bytes /= 1024.0
     return f"{size_in_bytes:.2f} TB"
+
+def job_deadline(data: dict, max_seconds: float) -> float:
+    """
+    Deadline of a background job from the request's optional deadline_seconds
+
+    Args:
+        data: Request body
+        max_seconds: Deadline used when none is given, and the longest allowed
+
+    Returns:
+        Seconds the job may run
+
+    Raises:
+        ValueError: If deadline_seconds isn't a positive number
+    """
+    if data.get('deadline_seconds') is None:
+        return max_seconds
+
+    try:
+        deadline = float(data['deadline_seconds'])
+    except (TypeError, ValueError):
+        raise ValueError("deadline_seconds must be a number")
+    if deadline <= 0:
+        raise ValueError("deadline_seconds must be positive")
+    return min(deadline, max_seconds)
+
+def circuit_open_response(error: str, circuit_error) -> tuple:
+    """
+    503 response for a provider call refused by an open circuit
+
+    Args:
+        error: Error message for the response
+        circuit_error: The CircuitOpenError raised
+
+    Returns:
+        Flask response tuple with a Retry-After header (whole seconds, rounded up)
+    """
+    from flask import jsonify
+
+    response = jsonify({'error': error, 'details': str(circuit_error)})
+    response.headers['Retry-After'] = str(math.ceil(circuit_error.retry_after))
+    return response, 503
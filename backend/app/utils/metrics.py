@@ -0,0 +1,298 @@
+from typing import Dict, List, Optional, Tuple
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from fast local work up to slow provider calls
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    """Render a Prometheus label set"""
+    parts = [
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        )
+        for name, value in zip(labelnames, values)
+    ]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(labels.get(name, '') for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}"
+        ]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in sorted(items):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+
+    metric_type = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    metric_type = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets"""
+
+    metric_type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last slot is +Inf), then sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}"
+        ]
+        with self._lock:
+            items = [(key, list(state[0]), state[1]) for key, state in self._values.items()]
+
+        for key, counts, total in sorted(items):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total!r}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Holds every metric and renders them in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class, name: str, *args, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = metric_class(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Optional[Tuple[float, ...]] = None
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets or DEFAULT_BUCKETS)
+
+    def render(self) -> str:
+        """
+        Render all metrics
+
+        Returns:
+            Prometheus text exposition format (version 0.0.4)
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+# Shared registry and the metrics recorded by the services
+registry = MetricsRegistry()
+
+STAGE_DURATION = registry.histogram(
+    'translator_stage_duration_seconds',
+    'Time spent in each processing stage',
+    ('stage',)
+)
+PROVIDER_DURATION = registry.histogram(
+    'translator_provider_request_duration_seconds',
+    'Latency of translation and TTS provider calls',
+    ('kind', 'provider')
+)
+PROVIDER_ERRORS = registry.counter(
+    'translator_provider_errors_total',
+    'Failed translation and TTS provider calls',
+    ('kind', 'provider')
+)
+CHARACTERS_PROCESSED = registry.counter(
+    'translator_characters_processed_total',
+    'Characters handled by each stage',
+    ('stage', 'provider')
+)
+CHARACTERS_SAVED = registry.counter(
+    'translator_characters_saved_total',
+    'Characters removed before reaching a billable provider',
+    ('stage',)
+)
+CACHE_HITS = registry.counter(
+    'translator_cache_hits_total',
+    'Lookups answered from a cache',
+    ('cache',)
+)
+CACHE_MISSES = registry.counter(
+    'translator_cache_misses_total',
+    'Lookups that had to do the work',
+    ('cache',)
+)
+PROVIDER_QUEUE_WAIT = registry.histogram(
+    'translator_provider_queue_wait_seconds',
+    'Time provider calls waited for a slot, per priority class',
+    ('provider', 'priority')
+)
+PROVIDER_CALLS_CANCELLED = registry.counter(
+    'translator_provider_calls_cancelled_total',
+    'Provider calls dropped from the queue because their request or job was cancelled or ran out of time',
+    ('provider', 'priority')
+)
+PROVIDER_CIRCUIT_OPEN = registry.gauge(
+    'translator_provider_circuit_open',
+    'Whether a provider circuit is open or half-open (1) or closed (0)',
+    ('kind', 'provider')
+)
+ADMISSION_REJECTIONS = registry.counter(
+    'translator_admission_rejections_total',
+    'Requests shed with 503 because their route was at its limit',
+    ('route',)
+)
+QUEUE_DEPTH = registry.gauge(
+    'translator_queue_depth',
+    'Items waiting in internal queues',
+    ('queue',)
+)
+STORAGE_USAGE = registry.gauge(
+    'translator_storage_bytes',
+    'Bytes on disk per artifact kind, as of the last storage scan',
+    ('kind',)
+)
+STORAGE_RECLAIMED = registry.counter(
+    'translator_storage_reclaimed_bytes_total',
+    'Bytes freed by storage eviction',
+    ('kind',)
+)
+STORAGE_EVICTIONS = registry.counter(
+    'translator_storage_evictions_total',
+    'Document artifacts evicted by the storage sweeper',
+    ('kind',)
+)
+
+@contextmanager
+def track_provider_call(kind: str, provider: str, chars: int = 0):
+    """
+    Record latency, characters and errors for one provider call
+
+    Args:
+        kind: 'translation' or 'tts'
+        provider: Provider/service name
+        chars: Characters sent to the provider
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        PROVIDER_ERRORS.inc(kind=kind, provider=provider)
+        raise
+    else:
+        CHARACTERS_PROCESSED.inc(chars, stage=kind, provider=provider)
+    finally:
+        PROVIDER_DURATION.observe(time.perf_counter() - start, kind=kind, provider=provider)
+
+def timed_stage(stage: str):
+    """
+    Decorator recording a function's wall time under STAGE_DURATION
+
+    Args:
+        stage: Stage label value
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                STAGE_DURATION.observe(time.perf_counter() - start, stage=stage)
+        return wrapper
+    return decorator
@@ -0,0 +1,133 @@
+from typing import Dict, Optional
+import math
+import os
+import threading
+from app.utils.files import atomic_output
+
+PLAYLIST_FILENAME = 'playlist.m3u8'
+PLAYLIST_MIMETYPE = 'application/vnd.apple.mpegurl'
+
+class MediaPlaylist:
+    """
+    HLS media playlist (EVENT type) over the segment MP3s of one audio version
+
+    Segments can be added in any order; the playlist file lists the
+    contiguous run from the first segment on, so it only ever grows at the
+    end as synthesis catches up. Each rewrite replaces the file atomically.
+    finish() lists whatever is left (skipping missing segments) and closes
+    the playlist with #EXT-X-ENDLIST.
+    """
+
+    def __init__(self, directory: str, total_segments: int, target_duration: float = 10.0):
+        """
+        Initialize playlist
+
+        Args:
+            directory: Version directory holding the segment files
+            total_segments: Number of segments that may be added (indexes 0..total-1)
+            target_duration: Expected longest segment in seconds (raised if a longer one is added)
+        """
+        self.path = os.path.join(directory, PLAYLIST_FILENAME)
+        self.total_segments = total_segments
+        self.target_duration = max(1, math.ceil(target_duration))
+        self.finished = False
+        self._segments = {}
+        self._skipped = set()
+        self._listed = 0
+        self._lock = threading.Lock()
+        self._write()
+
+    def add(self, index: int, filename: str, duration: float):
+        """
+        Add a synthesized segment
+
+        Args:
+            index: Segment position in the document
+            filename: Segment file name (relative to the playlist)
+            duration: Exact duration in seconds
+        """
+        with self._lock:
+            self._segments[index] = (filename, duration)
+            self.target_duration = max(self.target_duration, math.ceil(duration))
+            self._advance()
+
+    def skip(self, index: int):
+        """Mark a segment that will never be added (failed or empty)"""
+        with self._lock:
+            self._skipped.add(index)
+            self._advance()
+
+    def finish(self):
+        """List the remaining segments and end the playlist"""
+        with self._lock:
+            self._listed = self.total_segments
+            self.finished = True
+            self._write()
+
+    def _advance(self):
+        # Rewrite only when the contiguous run grew
+        listed = self._listed
+        while listed < self.total_segments and (listed in self._segments or listed in self._skipped):
+            listed += 1
+        if listed != self._listed:
+            self._listed = listed
+            self._write()
+
+    def render(self) -> str:
+        """Playlist text for the segments listed so far"""
+        lines = [
+            '#EXTM3U',
+            '#EXT-X-VERSION:3',
+            f'#EXT-X-TARGETDURATION:{self.target_duration}',
+            '#EXT-X-MEDIA-SEQUENCE:0',
+            '#EXT-X-PLAYLIST-TYPE:EVENT',
+            '#EXT-X-INDEPENDENT-SEGMENTS'
+        ]
+        for index in range(self._listed):
+            if index not in self._segments:
+                continue
+            filename, duration = self._segments[index]
+            lines.append(f'#EXTINF:{duration:.6f},')
+            lines.append(filename)
+        if self.finished:
+            lines.append('#EXT-X-ENDLIST')
+        return '\n'.join(lines) + '\n'
+
+    def _write(self):
+        with atomic_output(self.path) as temp_path:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+
+    def add_segment_info(self, position: int, audio_segment: Dict):
+        """
+        Add a segment from TextToSpeechService output (or skip it if it failed)
+
+        Args:
+            position: Segment position in the document
+            audio_segment: Audio info with audio_path and duration, or an error
+        """
+        if 'audio_path' in audio_segment and audio_segment.get('duration'):
+            self.add(position, os.path.basename(audio_segment['audio_path']), audio_segment['duration'])
+        else:
+            self.skip(position)
+
+def estimate_target_duration(tts_service, segments, default: float = 10.0) -> float:
+    """
+    Target duration for a playlist, estimated from the longest segment text
+
+    HLS players expect the target duration not to change while the playlist
+    grows, so it is set from an estimate before any audio exists.
+
+    Args:
+        tts_service: TextToSpeechService (for estimate_duration)
+        segments: Segments with a 'text' field
+        default: Value used when there are no segments
+
+    Returns:
+        Target duration in seconds
+    """
+    longest: Optional[str] = max((s.get('text', '') for s in segments), key=len, default=None)
+    if not longest:
+        return default
+    # Synthetic speech is usually a bit slower than the reading-speed estimate
+    return tts_service.estimate_duration(longest) * 1.5
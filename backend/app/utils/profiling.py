@@ -0,0 +1,180 @@
+from typing import Dict, List, Optional
+import cProfile
+import hmac
+import io
+import json
+import os
+import pstats
+import re
+import time
+import uuid
+from datetime import datetime
+
+PROFILE_HEADER = 'X-Profile-Token'
+
+# Profile IDs are file names inside PROFILE_FOLDER
+_PROFILE_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+PROFILE_QUERY_PARAM = 'profile'
+
+def is_authorized(request, secret: Optional[str]) -> bool:
+    """
+    Check whether a request carries the profiling secret
+
+    Args:
+        request: Flask request
+        secret: Config.PROFILING_SECRET (profiling is disabled when empty)
+
+    Returns:
+        True if the header or query flag matches the secret
+    """
+    if not secret:
+        return False
+
+    token = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_PARAM)
+    return bool(token) and hmac.compare_digest(token.encode('utf-8'), secret.encode('utf-8'))
+
+def save_profile(
+    profiler: cProfile.Profile,
+    profile_dir: str,
+    profile_id: str,
+    summary: Dict,
+    top: int = 25
+) -> Dict:
+    """
+    Write a request profile (.prof for pstats/snakeviz) and its JSON summary
+
+    Args:
+        profiler: Finished profiler
+        profile_dir: Directory to save into
+        profile_id: Request ID used as the file name
+        summary: Request details (path, method, timings, status)
+        top: Number of functions to include in the summary
+
+    Returns:
+        The saved summary
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    profiler.dump_stats(os.path.join(profile_dir, f"{profile_id}.prof"))
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats('cumulative')
+
+    functions = []
+    for (filename, line, name), (calls, _, total, cumulative, _) in sorted(
+        stats.stats.items(),
+        key=lambda item: item[1][3],
+        reverse=True
+    )[:top]:
+        functions.append({
+            'function': f"{os.path.basename(filename)}:{line}({name})",
+            'calls': calls,
+            'total_seconds': total,
+            'cumulative_seconds': cumulative
+        })
+
+    summary = {**summary, 'profile_id': profile_id, 'top_functions': functions}
+    with open(os.path.join(profile_dir, f"{profile_id}.json"), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    return summary
+
+def list_profiles(profile_dir: str, limit: int = 20) -> List[Dict]:
+    """
+    List saved profiles ranked by wall time (slowest first)
+
+    Args:
+        profile_dir: Directory holding the profiles
+        limit: Maximum number of profiles to return
+
+    Returns:
+        List of profile summaries without the function breakdown
+    """
+    if not os.path.isdir(profile_dir):
+        return []
+
+    profiles = []
+    for filename in os.listdir(profile_dir):
+        if not filename.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(profile_dir, filename), 'r', encoding='utf-8') as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        summary.pop('top_functions', None)
+        profiles.append(summary)
+
+    profiles.sort(key=lambda p: p.get('wall_ms', 0), reverse=True)
+    return profiles[:limit]
+
+def prune_profiles(profile_dir: str, keep: int):
+    """Delete the oldest profiles beyond the newest `keep`"""
+    summaries = sorted(
+        (f for f in os.listdir(profile_dir) if f.endswith('.json')),
+        key=lambda f: os.path.getmtime(os.path.join(profile_dir, f)),
+        reverse=True
+    )
+    for filename in summaries[keep:]:
+        profile_id = filename[:-len('.json')]
+        for extension in ('.json', '.prof'):
+            path = os.path.join(profile_dir, profile_id + extension)
+            if os.path.exists(path):
+                os.remove(path)
+
+def init_app(app):
+    """
+    Profile individual requests that carry the profiling secret
+
+    Send the X-Profile-Token header (or ?profile=<secret>) with the value
+    of Config.PROFILING_SECRET and the request runs under cProfile. The
+    profile is saved to PROFILE_FOLDER as <request_id>.prof/.json and the
+    response carries an X-Profile-ID header. Work handed to background
+    threads and the body of streamed responses are not covered.
+    """
+    if not app.config.get('PROFILING_SECRET'):
+        return
+
+    from flask import g, request
+
+    @app.before_request
+    def _start_profile():
+        if not is_authorized(request, app.config['PROFILING_SECRET']):
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this interpreter
+            return
+
+        g.profiler = profiler
+        g.profile_started = (time.perf_counter(), time.process_time())
+
+    @app.after_request
+    def _save_profile(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+
+        profiler.disable()
+        wall_start, cpu_start = g.pop('profile_started')
+        profile_id = g.get('request_id') or ''
+        if not _PROFILE_ID.match(profile_id):
+            profile_id = uuid.uuid4().hex
+
+        save_profile(profiler, app.config['PROFILE_FOLDER'], profile_id, {
+            'request_id': profile_id,
+            'method': request.method,
+            'path': request.path,  # Not full_path: the query may carry the secret
+            'endpoint': request.endpoint,
+            'status_code': response.status_code,
+            'wall_ms': (time.perf_counter() - wall_start) * 1000,
+            'cpu_ms': (time.process_time() - cpu_start) * 1000,
+            'timestamp': datetime.now().isoformat()
+        })
+        prune_profiles(app.config['PROFILE_FOLDER'], app.config['PROFILE_KEEP'])
+
+        response.headers['X-Profile-ID'] = profile_id
+        return response
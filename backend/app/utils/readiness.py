@@ -0,0 +1,85 @@
+from typing import Dict, List
+import os
+import shutil
+
+def _disk_headroom(paths: List[str], min_free_bytes: int) -> Dict:
+    """Free space of each filesystem holding one of the paths"""
+    filesystems = {}
+    for path in paths:
+        try:
+            device = os.stat(path).st_dev
+            usage = shutil.disk_usage(path)
+        except OSError:
+            continue
+        if device in filesystems:
+            continue
+        filesystems[device] = {
+            'path': path,
+            'free_bytes': usage.free,
+            'total_bytes': usage.total,
+            'free_ratio': usage.free / usage.total if usage.total else 0.0,
+            'ok': usage.free >= min_free_bytes
+        }
+    return {'min_free_bytes': min_free_bytes, 'filesystems': list(filesystems.values())}
+
+def readiness_report(app) -> Dict:
+    """
+    Whether this process should be sent more traffic, and why
+
+    Not ready (a load balancer should route elsewhere) when a route's wait
+    queue is filling up or a data folder is short of disk space. Open
+    provider circuits make the node 'degraded' but still ready: every node
+    shares the same providers, so routing away wouldn't help.
+
+    Args:
+        app: Flask app
+
+    Returns:
+        Dictionary with status, ready, reasons, saturation, queue depth,
+        admission per route, provider queues, circuits and disk headroom
+    """
+    from app.services.circuit_breaker import provider_circuits
+    from app.services.scheduler import provider_scheduler
+
+    reasons = []
+
+    admission = app.extensions['admission'].snapshot()
+    max_queue_fill = app.config['READY_MAX_QUEUE_FILL']
+    for route, load in admission.items():
+        if load['queue_size'] and load['waiting'] >= load['queue_size'] * max_queue_fill:
+            reasons.append(f"{route} queue {load['waiting']}/{load['queue_size']}")
+
+    disk = _disk_headroom(
+        [app.config['UPLOAD_FOLDER'], app.config['OUTPUT_FOLDER']],
+        app.config['READY_MIN_FREE_BYTES']
+    )
+    for filesystem in disk['filesystems']:
+        if not filesystem['ok']:
+            reasons.append(f"low disk space at {filesystem['path']}: {filesystem['free_bytes']} bytes free")
+
+    providers = provider_scheduler.stats()
+    circuits = provider_circuits.snapshot()
+    open_circuits = [name for name, circuit in circuits.items() if circuit['state'] != 'closed']
+
+    if reasons:
+        status = 'not_ready'
+    elif open_circuits:
+        status = 'degraded'
+    else:
+        status = 'ready'
+
+    return {
+        'status': status,
+        'ready': not reasons,
+        'reasons': reasons,
+        'open_circuits': open_circuits,
+        'saturation': max((load['saturation'] for load in admission.values()), default=0.0),
+        'queue_depth': (
+            sum(load['waiting'] for load in admission.values())
+            + sum(provider['waiting'] for provider in providers.values())
+        ),
+        'admission': admission,
+        'providers': providers,
+        'circuits': circuits,
+        'disk': disk
+    }
@@ -0,0 +1,238 @@
+from typing import Callable, Dict, Optional
+import contextvars
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+# Request IDs taken from clients end up in file names (profiles), so only plain tokens are kept
+_REQUEST_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# Span currently open in this context (request thread or worker)
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+_logger = logging.getLogger('app.traces')
+_logger.propagate = False
+_enabled = False
+
+class Span:
+    """One timed operation within a request trace"""
+
+    __slots__ = (
+        'trace_id', 'span_id', 'parent_id', 'name', 'attrs',
+        'start', '_start_perf', 'status', 'error', 'thread'
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, attrs: Optional[Dict] = None):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs or {}
+        self.start = time.time()
+        self._start_perf = time.perf_counter()
+        self.status = 'ok'
+        self.error = None
+        self.thread = threading.current_thread().name
+
+    def set(self, **attrs):
+        """Attach attributes (sizes, counts, outcome details) to the span"""
+        self.attrs.update(attrs)
+
+    def finish(self):
+        """Write the finished span to the trace log"""
+        record = {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.start,
+            'duration_ms': (time.perf_counter() - self._start_perf) * 1000,
+            'status': self.status,
+            'error': self.error,
+            'thread': self.thread,
+            'attrs': self.attrs
+        }
+        _logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+class _NullSpan:
+    """Stand-in used when tracing is disabled"""
+
+    trace_id = None
+
+    def set(self, **attrs):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+def configure(path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5):
+    """
+    Enable tracing and write spans as JSONL to a rotating file
+
+    Args:
+        path: Trace log file path
+        max_bytes: Size at which the log is rotated
+        backup_count: Number of rotated files to keep
+    """
+    global _enabled
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for handler in list(_logger.handlers):
+        _logger.removeHandler(handler)
+        handler.close()
+
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    _logger.addHandler(handler)
+    _logger.setLevel(logging.INFO)
+    _enabled = True
+
+def current_trace_id() -> Optional[str]:
+    """Get the request ID of the trace active in this context"""
+    parent = _current_span.get()
+    return parent.trace_id if parent else None
+
+def start_span(name: str, trace_id: Optional[str] = None, **attrs):
+    """
+    Open a span without a with-block (for request hooks)
+
+    Args:
+        name: Span name
+        trace_id: Request ID; defaults to the current trace or a new one
+        **attrs: Span attributes
+
+    Returns:
+        Tuple of (span, token) to pass to end_span
+    """
+    if not _enabled:
+        return _NULL_SPAN, None
+
+    parent = _current_span.get()
+    span = Span(
+        name,
+        trace_id or (parent.trace_id if parent else uuid.uuid4().hex),
+        parent.span_id if parent else None,
+        attrs
+    )
+    return span, _current_span.set(span)
+
+def end_span(span, token, error: Optional[BaseException] = None):
+    """Close a span opened with start_span"""
+    if token is None:
+        return
+
+    if error is not None:
+        span.status = 'error'
+        span.error = str(error)
+    span.finish()
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        # Closed from a different context (e.g. a streamed response), just clear it
+        _current_span.set(None)
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Trace the enclosed block as a child of the current span
+
+    Args:
+        name: Span name (e.g., 'translate.provider')
+        **attrs: Span attributes
+
+    Yields:
+        The span, so the block can attach results with span.set(...)
+    """
+    current, token = start_span(name, **attrs)
+    try:
+        yield current
+    except BaseException as e:
+        end_span(current, token, e)
+        raise
+    else:
+        end_span(current, token)
+
+def traced(name: str):
+    """Decorator tracing each call of a function as a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def propagate(func: Callable) -> Callable:
+    """
+    Bind a callable to the current trace context for use on another thread
+
+    Args:
+        func: Callable to run on a worker thread
+
+    Returns:
+        Callable that runs func inside a copy of the caller's context
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Each call gets its own copy: one Context can't be entered by two threads at once
+        return context.copy().run(func, *args, **kwargs)
+    return wrapper
+
+def init_app(app):
+    """
+    Trace every request of a Flask app when TRACING_ENABLED is set
+
+    The request ID is taken from the X-Request-ID header if it is a plain
+    token of up to 64 letters, digits, dashes or underscores (otherwise it
+    is generated) and returned in the response's X-Request-ID header.
+    """
+    if not app.config.get('TRACING_ENABLED'):
+        return
+
+    from flask import g, request
+
+    configure(
+        app.config['TRACE_LOG_PATH'],
+        app.config.get('TRACE_MAX_BYTES', 10 * 1024 * 1024),
+        app.config.get('TRACE_BACKUP_COUNT', 5)
+    )
+
+    @app.before_request
+    def _start_request_span():
+        request_id = request.headers.get('X-Request-ID', '')
+        if not _REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        g.request_span, g.request_span_token = start_span(
+            'request',
+            trace_id=request_id,
+            method=request.method,
+            path=request.path,
+            endpoint=request.endpoint,
+            request_bytes=request.content_length or 0
+        )
+        g.request_id = request_id
+
+    @app.after_request
+    def _tag_response(response):
+        request_span = g.get('request_span')
+        if request_span is not None:
+            request_span.set(status_code=response.status_code, response_bytes=response.content_length)
+            if response.status_code >= 500:
+                request_span.status = 'error'
+            response.headers['X-Request-ID'] = g.request_id
+        return response
+
+    @app.teardown_request
+    def _end_request_span(error=None):
+        request_span = g.pop('request_span', None)
+        token = g.pop('request_span_token', None)
+        if request_span is not None:
+            end_span(request_span, token, error)
@@ -0,0 +1,152 @@
+"""
+Peak memory of PDF extraction against page count
+
+Each (mode, page count) pair runs in its own subprocess so its peak RSS
+is measured alone:
+
+    in_memory   PDFProcessor.extract_text + save_extracted_text
+    streaming   PDFProcessor.extract_to_file (bounded memory)
+
+The table shows whether peak RSS grows with the number of pages; the
+JSON output can be kept to compare commits.
+
+Usage (from backend/):
+    python -m benchmarks.bench_extract_memory --pages 50,200,800 --output memory.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.bench_pipeline import BACKEND_DIR, _git_commit, _peak_rss_mb
+from benchmarks.pdfgen import LAYOUTS, make_pdf
+
+MODES = ('in_memory', 'streaming')
+
+def run_mode(mode: str, pdf_path: str, method: str) -> dict:
+    """
+    Extract one document in this process
+
+    Args:
+        mode: Mode name from MODES
+        pdf_path: Synthetic PDF to extract
+        method: Extraction method ('pdfplumber' or 'pypdf2')
+
+    Returns:
+        Result with seconds, output size and peak RSS
+    """
+    from app.services.pdf_processor import PDFProcessor
+
+    processor = PDFProcessor()
+    baseline_rss = _peak_rss_mb()
+    output_path = os.path.join(tempfile.mkdtemp(prefix='bench-extract-'), 'document_extracted.json')
+
+    start = time.perf_counter()
+    if mode == 'in_memory':
+        text_data = processor.extract_text(pdf_path, method=method)
+        processor.save_extracted_text(text_data, output_path)
+        total_chars = text_data['total_chars']
+    elif mode == 'streaming':
+        total_chars = processor.extract_to_file(pdf_path, output_path, method=method)['total_chars']
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+    seconds = time.perf_counter() - start
+
+    return {
+        'seconds': seconds,
+        'chars': total_chars,
+        'output_bytes': os.path.getsize(output_path),
+        'baseline_rss_mb': baseline_rss,
+        'peak_rss_mb': _peak_rss_mb()
+    }
+
+def run(args) -> dict:
+    """
+    Generate the documents and extract each one in a fresh subprocess per mode
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Full results document
+    """
+    modes = args.modes.split(',')
+    for mode in modes:
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode}")
+
+    pdf_dir = tempfile.mkdtemp(prefix='bench-pdfs-')
+    results = []
+    for pages in [int(p) for p in args.pages.split(',')]:
+        document = make_pdf(os.path.join(pdf_dir, f'{args.layout}_{pages}.pdf'), pages=pages, layout=args.layout)
+
+        for mode in modes:
+            result_path = os.path.join(pdf_dir, 'result.json')
+            completed = subprocess.run(
+                [
+                    sys.executable, '-m', 'benchmarks.bench_extract_memory',
+                    '--worker', mode,
+                    '--pdf', document['path'],
+                    '--method', args.method,
+                    '--result-file', result_path
+                ],
+                cwd=BACKEND_DIR,
+                capture_output=True,
+                text=True
+            )
+            if completed.returncode != 0:
+                raise RuntimeError(f"Mode {mode} failed on {document['path']}:\n{completed.stderr}")
+
+            with open(result_path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            result.update({'mode': mode, 'pages': pages, 'file_bytes': document['file_bytes']})
+            results.append(result)
+            print(
+                f"{mode:<10} {pages:>5}p  {result['seconds']:7.1f} s  "
+                f"peak rss {result['peak_rss_mb'] or 0:7.1f} MB  "
+                f"(+{(result['peak_rss_mb'] or 0) - (result['baseline_rss_mb'] or 0):6.1f} MB over startup)",
+                file=sys.stderr
+            )
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'settings': {'layout': args.layout, 'method': args.method}
+        },
+        'results': results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', default='25,100,400', help='Comma-separated page counts')
+    parser.add_argument('--layout', default='dense', choices=sorted(LAYOUTS))
+    parser.add_argument('--method', default='pdfplumber', choices=['pdfplumber', 'pypdf2'])
+    parser.add_argument('--modes', default=','.join(MODES), help='Comma-separated modes')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--pdf', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_mode(args.worker, args.pdf, args.method)
+        with open(args.result_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+    print(report)
+
+if __name__ == '__main__':
+    main()
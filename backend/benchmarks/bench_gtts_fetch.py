@@ -0,0 +1,91 @@
+"""
+Benchmark gTTS token fetching: sequential gTTS.save vs ConcurrentGTTS
+
+Both engines talk to a local stub endpoint with a fixed per-request
+latency, so the numbers show the effect of concurrency and connection
+reuse rather than network noise.
+
+Usage (from backend/):
+    python -m benchmarks.bench_gtts_fetch --latency-ms 50 --chars 1500
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from unittest import mock
+
+import gtts.tts
+from gtts import gTTS
+
+from app.services.gtts_engine import ConcurrentGTTS
+from benchmarks.stubs import StubGTTSServer
+
+SAMPLE_SENTENCE = "The quick brown fox jumps over the lazy dog while the teacher reads aloud. "
+
+def _time_runs(fn, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {
+        'runs': repeat,
+        'mean_seconds': statistics.mean(timings),
+        'min_seconds': min(timings),
+        'max_seconds': max(timings)
+    }
+
+def run(latency_ms: float, chars: int, connections: list, repeat: int) -> dict:
+    text = (SAMPLE_SENTENCE * (chars // len(SAMPLE_SENTENCE) + 1))[:chars]
+    output_path = os.path.join(tempfile.mkdtemp(), 'bench.mp3')
+    results = {'latency_ms': latency_ms, 'chars': chars, 'engines': {}}
+
+    with StubGTTSServer(latency_ms=latency_ms) as stub:
+        # Point gTTS at the stub instead of translate.google.com
+        with mock.patch.object(gtts.tts, '_translate_url', return_value=stub.url):
+            tokens = len(gTTS(text=text, lang='en')._tokenize(text))
+            results['tokens'] = tokens
+            results['engines']['gtts_sequential'] = _time_runs(
+                lambda: gTTS(text=text, lang='en').save(output_path),
+                repeat
+            )
+
+        for max_connections in connections:
+            engine = ConcurrentGTTS(max_connections=max_connections, base_url=stub.url)
+            results['engines'][f'concurrent_{max_connections}'] = _time_runs(
+                lambda: engine.save(text, 'en', output_path),
+                repeat
+            )
+
+    baseline = results['engines']['gtts_sequential']['mean_seconds']
+    for engine_result in results['engines'].values():
+        engine_result['speedup'] = baseline / engine_result['mean_seconds']
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Stub latency per token request')
+    parser.add_argument('--chars', type=int, default=1500, help='Characters of text to synthesize')
+    parser.add_argument('--connections', default='1,2,4,8', help='Comma-separated connection limits to try')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per engine')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    args = parser.parse_args()
+
+    results = run(
+        args.latency_ms,
+        args.chars,
+        [int(c) for c in args.connections.split(',')],
+        args.repeat
+    )
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+    print(report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,379 @@
+"""
+Benchmark the extract -> translate -> TTS pipeline with stub providers
+
+Synthetic PDFs of each page count and layout are generated, then every
+case runs in its own subprocess (so peak RSS belongs to that case alone)
+against deterministic local stub providers:
+
+    extract_pdfplumber, extract_pypdf2  PDFProcessor.extract_text
+    segment                             sentence/chunk splitting and TTS segments
+    translate_chunks                    TranslationService.translate_chunks
+    tts_segments                        TextToSpeechService.generate_with_timestamps
+    route_flow                          upload -> translate/document -> tts/generate-document
+
+Results (p50/p95 per run, throughput, peak RSS) are written as JSON so
+runs can be compared across commits.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pipeline --pages 1,10 --output before.json
+    python -m benchmarks.bench_pipeline --compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from io import BytesIO
+
+from benchmarks.pdfgen import LAYOUTS, make_pdf
+
+CASES = (
+    'extract_pdfplumber',
+    'extract_pypdf2',
+    'segment',
+    'translate_chunks',
+    'tts_segments',
+    'route_flow'
+)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _percentile(values: list, pct: float) -> float:
+    """Linear-interpolated percentile of a list of numbers"""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _summarize(timings: list, units: dict) -> dict:
+    """Latency percentiles and throughput for a list of run times"""
+    mean = sum(timings) / len(timings)
+    summary = {
+        'runs': len(timings),
+        'mean_seconds': mean,
+        'p50_seconds': _percentile(timings, 50),
+        'p95_seconds': _percentile(timings, 95),
+        'min_seconds': min(timings),
+        'max_seconds': max(timings),
+        'throughput': {f'{unit}_per_second': count / mean for unit, count in units.items()}
+    }
+    summary.update(units)
+    return summary
+
+def _time_runs(fn, repeat: int, warmup: int) -> list:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def run_case(case: str, pdf_path: str, args) -> dict:
+    """
+    Run one benchmark case in this process
+
+    Args:
+        case: Case name from CASES
+        pdf_path: Synthetic PDF to use
+        args: Parsed command-line arguments
+
+    Returns:
+        Case summary
+    """
+    from app.services.pdf_processor import PDFProcessor
+    from app.services.text_to_speech import TextToSpeechService
+    from app.services.translator import TranslationService
+    from benchmarks.stubs import StubProviders, benchmark_config
+
+    processor = PDFProcessor()
+    work_dir = tempfile.mkdtemp(prefix='bench-')
+    stub = StubProviders(
+        translate_latency_ms=args.translate_latency_ms,
+        tts_latency_ms=args.tts_latency_ms,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+
+    with stub:
+        if case.startswith('extract_'):
+            method = case[len('extract_'):]
+            text_data = processor.extract_text(pdf_path, method=method)
+            timings = _time_runs(lambda: processor.extract_text(pdf_path, method=method), args.repeat, args.warmup)
+            summary = _summarize(timings, {'pages': text_data['total_pages'], 'chars': text_data['total_chars']})
+
+        else:
+            text_data = processor.extract_text(pdf_path)
+            full_text = text_data['full_text']
+            tts_service = TextToSpeechService(service='gtts')
+
+            if case == 'segment':
+                def segment():
+                    processor.split_into_sentences(full_text)
+                    processor.split_into_chunks(full_text, max_chars=5000)
+                    tts_service.create_sentence_segments(full_text)
+
+                timings = _time_runs(segment, args.repeat, args.warmup)
+                summary = _summarize(timings, {'chars': len(full_text)})
+
+            elif case == 'translate_chunks':
+                translator = TranslationService(service='google')
+                chunks = processor.split_into_chunks(full_text, max_chars=5000)
+                results = []
+                timings = _time_runs(
+                    lambda: results.append(translator.translate_chunks(chunks, 'es', 'auto')),
+                    args.repeat,
+                    args.warmup
+                )
+                summary = _summarize(timings, {'chunks': len(chunks), 'chars': len(full_text)})
+                summary['errors'] = sum(1 for chunk in results[-1] if 'error' in chunk)
+
+            elif case == 'tts_segments':
+                segments = tts_service.create_sentence_segments(full_text)
+                results = []
+                timings = _time_runs(
+                    lambda: results.append(tts_service.generate_with_timestamps(segments, 'en', work_dir)),
+                    args.repeat,
+                    args.warmup
+                )
+                summary = _summarize(timings, {'segments': len(segments), 'chars': len(full_text)})
+                summary['errors'] = sum(1 for segment in results[-1] if 'error' in segment)
+
+            elif case == 'route_flow':
+                summary = _run_route_flow(pdf_path, text_data, work_dir, args, benchmark_config)
+
+            else:
+                raise ValueError(f"Unknown case: {case}")
+
+    summary['provider_calls'] = dict(stub.calls)
+    summary['peak_rss_mb'] = _peak_rss_mb()
+    return summary
+
+def _run_route_flow(pdf_path: str, text_data: dict, work_dir: str, args, benchmark_config) -> dict:
+    """Time upload -> translate/document -> tts/generate-document through the Flask app"""
+    from app import create_app
+
+    benchmark_config(work_dir)
+    client = create_app('benchmark').test_client()
+
+    with open(pdf_path, 'rb') as f:
+        pdf_bytes = f.read()
+
+    route_timings = {'upload': [], 'translate_document': [], 'generate_document': []}
+    failures = []
+    segment_errors = []
+
+    def timed_post(route: str, url: str, **kwargs):
+        start = time.perf_counter()
+        response = client.post(url, **kwargs)
+        route_timings[route].append(time.perf_counter() - start)
+        if response.status_code != 200:
+            failures.append({'route': route, 'status_code': response.status_code})
+        return response
+
+    def flow():
+        upload = timed_post(
+            'upload',
+            '/api/upload',
+            data={'file': (BytesIO(pdf_bytes), 'bench.pdf')},
+            content_type='multipart/form-data'
+        )
+        document_id = upload.get_json().get('document_id')
+        timed_post('translate_document', '/api/translate/document', json={
+            'document_id': document_id,
+            'target_lang': 'es',
+            'service': 'google'
+        })
+        generated = timed_post('generate_document', '/api/tts/generate-document', json={
+            'document_id': document_id,
+            'language': 'es',
+            'service': 'gtts',
+            'segment_type': 'sentence'
+        })
+        segments = (generated.get_json() or {}).get('segments', [])
+        segment_errors.append(sum(1 for segment in segments if 'error' in segment))
+
+    timings = _time_runs(flow, args.repeat, args.warmup)
+    summary = _summarize(timings, {'documents': 1, 'pages': text_data['total_pages']})
+
+    # Drop warmup runs from the per-route numbers
+    summary['routes'] = {
+        route: {
+            'p50_seconds': _percentile(values[args.warmup:], 50),
+            'p95_seconds': _percentile(values[args.warmup:], 95)
+        }
+        for route, values in route_timings.items()
+    }
+    summary['errors'] = len(failures)
+    summary['segment_errors'] = segment_errors[-1]
+    return summary
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _worker_command(case: str, pdf_path: str, result_path: str, args) -> list:
+    return [
+        sys.executable, '-m', 'benchmarks.bench_pipeline',
+        '--worker', case,
+        '--pdf', pdf_path,
+        '--result-file', result_path,
+        '--repeat', str(args.repeat),
+        '--warmup', str(args.warmup),
+        '--translate-latency-ms', str(args.translate_latency_ms),
+        '--tts-latency-ms', str(args.tts_latency_ms),
+        '--error-rate', str(args.error_rate),
+        '--seed', str(args.seed)
+    ]
+
+def run(args) -> dict:
+    """
+    Generate the documents and run every case in a fresh subprocess
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Full results document
+    """
+    cases = args.cases.split(',')
+    for case in cases:
+        if case not in CASES:
+            raise ValueError(f"Unknown case: {case}")
+
+    pdf_dir = tempfile.mkdtemp(prefix='bench-pdfs-')
+    documents = []
+    for pages in [int(p) for p in args.pages.split(',')]:
+        for layout in args.layouts.split(','):
+            path = os.path.join(pdf_dir, f'{layout}_{pages}.pdf')
+            documents.append(make_pdf(path, pages=pages, layout=layout, seed=args.seed))
+
+    results = []
+    for document in documents:
+        for case in cases:
+            result_path = os.path.join(pdf_dir, 'result.json')
+            completed = subprocess.run(
+                _worker_command(case, document['path'], result_path, args),
+                cwd=BACKEND_DIR,
+                capture_output=True,
+                text=True
+            )
+            if completed.returncode != 0:
+                raise RuntimeError(f"Case {case} failed on {document['path']}:\n{completed.stderr}")
+
+            with open(result_path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            result.update({'case': case, 'layout': document['layout'], 'document_pages': document['pages']})
+            results.append(result)
+            print(
+                f"{case:<20} {document['layout']:<11} {document['pages']:>4}p  "
+                f"p50 {result['p50_seconds'] * 1000:9.1f} ms  "
+                f"p95 {result['p95_seconds'] * 1000:9.1f} ms  "
+                f"rss {result['peak_rss_mb'] or 0:6.1f} MB",
+                file=sys.stderr
+            )
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'settings': {
+                'repeat': args.repeat,
+                'warmup': args.warmup,
+                'translate_latency_ms': args.translate_latency_ms,
+                'tts_latency_ms': args.tts_latency_ms,
+                'error_rate': args.error_rate,
+                'seed': args.seed
+            }
+        },
+        'documents': [{key: value for key, value in doc.items() if key != 'path'} for doc in documents],
+        'results': results
+    }
+
+def compare(baseline_path: str, current_path: str):
+    """Print the p50 change of every case between two result files"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(current_path, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+
+    def key(result):
+        return (result['case'], result['layout'], result['document_pages'])
+
+    before = {key(result): result for result in baseline['results']}
+    print(f"{baseline['meta'].get('commit')} -> {current['meta'].get('commit')}")
+    for result in current['results']:
+        old = before.get(key(result))
+        if old is None:
+            continue
+        change = (result['p50_seconds'] - old['p50_seconds']) / old['p50_seconds'] * 100
+        print(
+            f"{result['case']:<20} {result['layout']:<11} {result['document_pages']:>4}p  "
+            f"{old['p50_seconds'] * 1000:9.1f} -> {result['p50_seconds'] * 1000:9.1f} ms  "
+            f"({change:+.1f}%)"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', default='1,10', help='Comma-separated page counts')
+    parser.add_argument('--layouts', default=','.join(LAYOUTS), help='Comma-separated layouts')
+    parser.add_argument('--cases', default=','.join(CASES), help='Comma-separated cases to run')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case')
+    parser.add_argument('--warmup', type=int, default=1, help='Untimed runs before timing')
+    parser.add_argument('--translate-latency-ms', type=float, default=5.0, help='Stub translation latency')
+    parser.add_argument('--tts-latency-ms', type=float, default=5.0, help='Stub TTS latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of stub calls that fail')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the documents and stub failures')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), help='Compare two result files')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--pdf', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    if args.worker:
+        result = run_case(args.worker, args.pdf, args)
+        with open(args.result_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+    print(report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+Startup time and import cost per module
+
+Each target runs in a fresh interpreter with `python -X importtime`, so
+every run pays the full cold import cost:
+
+    create_app          app factory with all blueprints (what each worker does), on
+                        temporary output folders with tracing and the sweeper off
+    batch_cli           tools.batch module (what each CLI invocation does)
+    translate_google    first TranslationService('google')
+    translate_deepl     first DeepL backend import
+    tts_gtts            first gTTS synthesis backend
+    extract_pdfplumber  first pdfplumber extraction backend
+    extract_pypdf2      first PyPDF2 extraction backend
+
+For every target the report gives the median wall time, the modules
+with the largest cumulative import time, and which provider libraries
+were loaded. Provider libraries should only show up in the targets that
+use them.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --repeat 5 --output startup.json
+"""
+import argparse
+import json
+import platform
+import re
+import subprocess
+import sys
+from datetime import datetime
+
+from benchmarks.bench_pipeline import BACKEND_DIR, _git_commit, _percentile
+
+TARGETS = {
+    'create_app': "from app import create_app; create_app('benchmark')",
+    'batch_cli': "import tools.batch",
+    'translate_google': "from app.services.translator import TranslationService; TranslationService('google')",
+    'translate_deepl': "from app.services.providers import provider_registry; provider_registry.load('translation', 'deepl')",
+    'tts_gtts': "from app.services.providers import provider_registry; provider_registry.load('tts', 'gtts')",
+    'extract_pdfplumber': "from app.services.providers import provider_registry; provider_registry.load('extraction', 'pdfplumber')",
+    'extract_pypdf2': "from app.services.providers import provider_registry; provider_registry.load('extraction', 'pypdf2')"
+}
+
+# Run before the timer; modules they import aren't counted against the target
+SETUP = {
+    # Temporary output folders, no tracing log and no storage sweeper thread
+    'create_app': (
+        "import tempfile; from benchmarks.stubs import benchmark_config; "
+        "_root = tempfile.TemporaryDirectory(); benchmark_config(_root.name)"
+    )
+}
+
+# Third-party provider libraries that should only load when their backend is used
+PROVIDER_MODULES = ('deep_translator', 'deepl', 'gtts', 'pdfplumber', 'PyPDF2')
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+# Written to stderr around the setup, to tell its imports from the target's
+_SETUP_START = '--- setup ---'
+_SETUP_DONE = '--- setup done ---'
+
+# Wall time measured inside the child, around the statement only
+_RUNNER = (
+    "import sys, time\n"
+    "sys.stderr.write('" + _SETUP_START + "\\n')\n"
+    "exec(compile(sys.argv[2], '<setup>', 'exec'))\n"
+    "sys.stderr.write('" + _SETUP_DONE + "\\n')\n"
+    "start = time.perf_counter()\n"
+    "exec(compile(sys.argv[1], '<target>', 'exec'))\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+def parse_importtime(output: str) -> dict:
+    """
+    Cumulative import time per module from `-X importtime` output
+
+    Args:
+        output: The interpreter's stderr
+
+    Returns:
+        Dictionary of module name to {'self_us', 'cumulative_us', 'depth'}
+    """
+    modules = {}
+    for line in output.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = {
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'depth': (len(indent) - 1) // 2
+        }
+    return modules
+
+def run_target(name: str, repeat: int, top: int) -> dict:
+    """
+    Run one target in fresh interpreters
+
+    Args:
+        name: Target name from TARGETS
+        repeat: Number of cold runs
+        top: Number of heaviest modules to report
+
+    Returns:
+        Target summary
+    """
+    wall_times = []
+    import_totals = []
+    modules = {}
+
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', _RUNNER, TARGETS[name], SETUP.get(name, '')],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Target {name} failed:\n{completed.stderr[-2000:]}")
+
+        wall_times.append(float(completed.stdout.strip().splitlines()[-1]))
+        startup_output, _, rest = completed.stderr.partition(_SETUP_START)
+        _, _, target_output = rest.partition(_SETUP_DONE)
+        modules = parse_importtime(startup_output + target_output)
+        import_totals.append(sum(m['cumulative_us'] for m in modules.values() if m['depth'] == 0) / 1e6)
+
+    # Module costs from the last run (each run imports the same modules)
+    heaviest = sorted(modules.items(), key=lambda item: item[1]['cumulative_us'], reverse=True)
+    return {
+        'runs': repeat,
+        'p50_seconds': _percentile(wall_times, 50),
+        'min_seconds': min(wall_times),
+        'max_seconds': max(wall_times),
+        'import_seconds_p50': _percentile(import_totals, 50),
+        'modules_imported': len(modules),
+        'providers_loaded': {
+            module: modules[module]['cumulative_us'] / 1000.0
+            for module in PROVIDER_MODULES
+            if module in modules
+        },
+        'heaviest_modules_ms': {
+            module: info['cumulative_us'] / 1000.0
+            for module, info in heaviest[:top]
+        }
+    }
+
+def run(args) -> dict:
+    """
+    Run every selected target
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Full results document
+    """
+    targets = args.targets.split(',')
+    for target in targets:
+        if target not in TARGETS:
+            raise ValueError(f"Unknown target: {target}")
+
+    results = {}
+    for target in targets:
+        result = run_target(target, args.repeat, args.top)
+        results[target] = result
+        providers = ', '.join(result['providers_loaded']) or 'none'
+        print(
+            f"{target:<20} p50 {result['p50_seconds'] * 1000:8.1f} ms  "
+            f"imports {result['import_seconds_p50'] * 1000:8.1f} ms  "
+            f"{result['modules_imported']:4d} modules  providers: {providers}",
+            file=sys.stderr
+        )
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'settings': {'repeat': args.repeat}
+        },
+        'results': results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--targets', default=','.join(TARGETS), help='Comma-separated targets')
+    parser.add_argument('--repeat', type=int, default=5, help='Cold runs per target')
+    parser.add_argument('--top', type=int, default=10, help='Modules with the largest cumulative import time to report per target')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    args = parser.parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+    print(report)
+
+if __name__ == '__main__':
+    main()
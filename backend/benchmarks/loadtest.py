@@ -0,0 +1,339 @@
+"""
+HTTP load test: simulated learners against the Flask API
+
+Starts the app from create_app with stub providers in a separate server
+process (or targets --url), then replays learner sessions from many
+concurrent users:
+
+    upload -> translate/document -> tts/generate-document
+           -> tts/segments -> audio fetched with Range requests
+
+Concurrency is ramped step by step. Each step reports per-endpoint
+throughput, latency percentiles and error rate. The ramp stops at the
+saturation point: the first step where session throughput stops growing,
+the session p95 exceeds --max-p95-seconds, or errors exceed
+--max-error-rate. The last healthy step is reported as the capacity.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest --users 1,2,4,8,16 --step-seconds 20
+    python -m benchmarks.loadtest --url http://127.0.0.1:5000 --output load.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from benchmarks.bench_pipeline import BACKEND_DIR, _git_commit, _percentile
+from benchmarks.pdfgen import make_pdf
+
+ENDPOINTS = ('upload', 'translate_document', 'generate_document', 'segments', 'audio_range')
+
+class LoadRecorder:
+    """Thread-safe collection of request outcomes for one ramp step"""
+
+    def __init__(self):
+        self.requests = {endpoint: [] for endpoint in ENDPOINTS}
+        self.sessions = []
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        with self._lock:
+            self.requests[endpoint].append((seconds, ok))
+
+    def record_session(self, seconds: float, ok: bool):
+        with self._lock:
+            self.sessions.append((seconds, ok))
+
+    def summary(self, elapsed: float) -> dict:
+        """Throughput, latency percentiles and error rate per endpoint"""
+        def describe(samples):
+            if not samples:
+                return {'count': 0}
+            latencies = [seconds for seconds, _ in samples]
+            errors = sum(1 for _, ok in samples if not ok)
+            return {
+                'count': len(samples),
+                'throughput_per_second': len(samples) / elapsed,
+                'p50_seconds': _percentile(latencies, 50),
+                'p95_seconds': _percentile(latencies, 95),
+                'p99_seconds': _percentile(latencies, 99),
+                'error_rate': errors / len(samples)
+            }
+
+        with self._lock:
+            return {
+                'sessions': describe(self.sessions),
+                'endpoints': {endpoint: describe(samples) for endpoint, samples in self.requests.items()}
+            }
+
+class SimulatedUser(threading.Thread):
+    """One learner repeating the upload-to-playback session until the deadline"""
+
+    def __init__(self, base_url: str, pdf_bytes: bytes, recorder: LoadRecorder, deadline: float, args):
+        super().__init__(daemon=True)
+        self.base_url = base_url.rstrip('/')
+        self.pdf_bytes = pdf_bytes
+        self.recorder = recorder
+        self.deadline = deadline
+        self.args = args
+        self.session = requests.Session()  # Keep-alive, like a browser tab
+
+    def _call(self, endpoint: str, method: str, path: str, expected=(200,), **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=self.args.timeout, **kwargs)
+            ok = response.status_code in expected
+        except requests.RequestException:
+            response, ok = None, False
+        self.recorder.record(endpoint, time.perf_counter() - start, ok)
+        if not ok:
+            raise RuntimeError(f"{endpoint} failed")
+        return response
+
+    def _think(self):
+        if self.args.think_ms > 0:
+            time.sleep(self.args.think_ms / 1000.0)
+
+    def run_session(self):
+        upload = self._call('upload', 'POST', '/api/upload', files={
+            'file': ('lesson.pdf', self.pdf_bytes, 'application/pdf')
+        })
+        document_id = upload.json()['document_id']
+        self._think()
+
+        self._call('translate_document', 'POST', '/api/translate/document', json={
+            'document_id': document_id,
+            'target_lang': self.args.language,
+            'service': 'google'
+        })
+        self._think()
+
+        self._call('generate_document', 'POST', '/api/tts/generate-document', json={
+            'document_id': document_id,
+            'language': self.args.language,
+            'service': 'gtts',
+            'segment_type': 'sentence'
+        })
+
+        segment_info = self._call('segments', 'GET', f'/api/tts/segments/{document_id}').json()
+        segments = segment_info['segments']['segments']
+
+        # Playback: the audio element opens each file with a range request
+        for segment in segments[:self.args.segments_played]:
+            if 'audio_file' not in segment:
+                continue
+            self._call(
+                'audio_range',
+                'GET',
+                f"/api/tts/audio/{segment['audio_file']}",
+                expected=(200, 206),
+                headers={'Range': 'bytes=0-'}
+            )
+            self._think()
+
+    def run(self):
+        while time.monotonic() < self.deadline:
+            start = time.perf_counter()
+            try:
+                self.run_session()
+                ok = True
+            except Exception:
+                ok = False
+            self.recorder.record_session(time.perf_counter() - start, ok)
+
+def run_step(base_url: str, users: int, pdf_bytes: bytes, args) -> dict:
+    """
+    Run one concurrency level for step_seconds
+
+    Args:
+        base_url: API base URL
+        users: Concurrent simulated users
+        pdf_bytes: Document each user uploads
+        args: Parsed command-line arguments
+
+    Returns:
+        Step summary
+    """
+    recorder = LoadRecorder()
+    start = time.monotonic()
+    deadline = start + args.step_seconds
+    workers = [SimulatedUser(base_url, pdf_bytes, recorder, deadline, args) for _ in range(users)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        # Sessions in flight at the deadline are allowed to finish
+        worker.join()
+
+    summary = recorder.summary(time.monotonic() - start)
+    summary['users'] = users
+    return summary
+
+def is_saturated(step: dict, previous, args) -> bool:
+    """Whether a step is past the node's capacity"""
+    sessions = step['sessions']
+    if sessions['count'] == 0:
+        return True
+    if sessions['error_rate'] > args.max_error_rate:
+        return True
+    if sessions['p95_seconds'] > args.max_p95_seconds:
+        return True
+    if previous is not None:
+        gain = sessions['throughput_per_second'] / previous['sessions']['throughput_per_second']
+        if gain < 1 + args.min_gain:
+            return True
+    return False
+
+def start_server(args):
+    """
+    Start the app with stub providers in a child process
+
+    Returns:
+        Tuple of (process, base_url)
+    """
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'benchmarks.loadtest', '--serve',
+            '--translate-latency-ms', str(args.translate_latency_ms),
+            '--tts-latency-ms', str(args.tts_latency_ms),
+            '--error-rate', str(args.error_rate)
+        ],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.PIPE,
+        text=True
+    )
+    line = process.stdout.readline()
+    if not line:
+        process.wait()
+        raise RuntimeError("Load test server failed to start")
+    return process, json.loads(line)['url']
+
+def serve(args):
+    """Run the app with stub providers on a free port (child process side)"""
+    import logging
+    from werkzeug.serving import make_server
+    from app import create_app
+    from benchmarks.stubs import StubProviders, benchmark_config
+
+    benchmark_config(tempfile.mkdtemp(prefix='loadtest-'))
+    StubProviders(
+        translate_latency_ms=args.translate_latency_ms,
+        tts_latency_ms=args.tts_latency_ms,
+        error_rate=args.error_rate
+    ).start()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # Per-request access log costs CPU under load
+    server = make_server('127.0.0.1', 0, create_app('benchmark'), threaded=True)
+    print(json.dumps({'url': f'http://127.0.0.1:{server.server_port}'}), flush=True)
+    server.serve_forever()
+
+def run(args) -> dict:
+    """
+    Ramp concurrency until the API saturates
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Full results document
+    """
+    pdf_path = os.path.join(tempfile.mkdtemp(prefix='loadtest-pdf-'), 'lesson.pdf')
+    make_pdf(pdf_path, pages=args.pages, layout='single')
+    with open(pdf_path, 'rb') as f:
+        pdf_bytes = f.read()
+
+    process = None
+    base_url = args.url
+    if not base_url:
+        process, base_url = start_server(args)
+
+    steps = []
+    capacity = None
+    saturation = None
+    try:
+        previous = None
+        for users in [int(u) for u in args.users.split(',')]:
+            step = run_step(base_url, users, pdf_bytes, args)
+            step['saturated'] = is_saturated(step, previous, args)
+            steps.append(step)
+
+            sessions = step['sessions']
+            print(
+                f"{users:>4} users  {sessions.get('throughput_per_second', 0):7.2f} sessions/s  "
+                f"p95 {sessions.get('p95_seconds', 0):7.2f} s  "
+                f"errors {sessions.get('error_rate', 0) * 100:5.1f}%"
+                + ('  <- saturated' if step['saturated'] else ''),
+                file=sys.stderr
+            )
+
+            if step['saturated']:
+                saturation = users
+                break
+            capacity = users
+            previous = step
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'target': args.url or 'local stub server',
+            'settings': {
+                'step_seconds': args.step_seconds,
+                'pages': args.pages,
+                'segments_played': args.segments_played,
+                'think_ms': args.think_ms,
+                'translate_latency_ms': args.translate_latency_ms,
+                'tts_latency_ms': args.tts_latency_ms,
+                'error_rate': args.error_rate,
+                'max_p95_seconds': args.max_p95_seconds,
+                'max_error_rate': args.max_error_rate,
+                'min_gain': args.min_gain
+            }
+        },
+        'capacity_users': capacity,
+        'saturation_users': saturation,
+        'steps': steps
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='Target an already running API instead of a local stub server')
+    parser.add_argument('--users', default='1,2,4,8,16,32', help='Comma-separated concurrency ramp')
+    parser.add_argument('--step-seconds', type=float, default=20.0, help='Duration of each ramp step')
+    parser.add_argument('--pages', type=int, default=2, help='Pages in the uploaded document')
+    parser.add_argument('--segments-played', type=int, default=5, help='Segment audio files fetched per session')
+    parser.add_argument('--language', default='es', help='Target language')
+    parser.add_argument('--think-ms', type=float, default=0.0, help='Pause between user actions')
+    parser.add_argument('--timeout', type=float, default=120.0, help='Per-request timeout in seconds')
+    parser.add_argument('--translate-latency-ms', type=float, default=20.0, help='Stub translation latency')
+    parser.add_argument('--tts-latency-ms', type=float, default=20.0, help='Stub TTS latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of stub calls that fail')
+    parser.add_argument('--max-p95-seconds', type=float, default=30.0, help='Session p95 that counts as saturated')
+    parser.add_argument('--max-error-rate', type=float, default=0.01, help='Session error rate that counts as saturated')
+    parser.add_argument('--min-gain', type=float, default=0.1, help='Minimum throughput gain per step before saturation')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+    print(report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Synthetic PDF generator for benchmarks
+
+Writes small, valid PDFs with a deterministic text body so extraction and
+the rest of the pipeline can be measured on reproducible input of any size.
+Only the standard Helvetica font is used, so no font files are embedded.
+"""
+from typing import Dict, List
+import random
+
+# Word list for the generated prose (no characters that need PDF escaping)
+WORDS = (
+    'the a of to and in is was for on with as by at from that this it which '
+    'language learning student teacher reader chapter lesson story village river '
+    'morning evening market garden library window journey letter question answer '
+    'quickly slowly carefully together always often never again before after '
+    'reads writes speaks listens travels remembers explains discovers carries opens'
+).split()
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 72
+
+# Text layouts: font size, leading and number of columns
+LAYOUTS = {
+    'single': {'font_size': 12, 'leading': 15, 'columns': 1},
+    'two_column': {'font_size': 10, 'leading': 12, 'columns': 2},
+    'dense': {'font_size': 8, 'leading': 9, 'columns': 1}
+}
+
+def make_sentences(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate deterministic sentences
+
+    Args:
+        count: Number of sentences
+        seed: Random seed
+
+    Returns:
+        List of sentences
+    """
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 18))]
+        ending = rng.choice('...?!')
+        sentences.append(' '.join(words).capitalize() + ending)
+    return sentences
+
+def _wrap(sentences: List[str], max_chars: int) -> List[str]:
+    """Wrap the running text into lines of at most max_chars"""
+    lines = []
+    line = ''
+    for word in ' '.join(sentences).split():
+        if line and len(line) + 1 + len(word) > max_chars:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+def _page_streams(pages: int, layout: str, seed: int) -> List[bytes]:
+    """Build the content stream of every page"""
+    settings = LAYOUTS[layout]
+    font_size = settings['font_size']
+    leading = settings['leading']
+    columns = settings['columns']
+
+    column_gap = 24
+    column_width = (PAGE_WIDTH - 2 * MARGIN - (columns - 1) * column_gap) / columns
+    chars_per_line = int(column_width / (font_size * 0.5))  # Average Helvetica glyph width
+    lines_per_column = int((PAGE_HEIGHT - 2 * MARGIN) / leading)
+    lines_per_page = lines_per_column * columns
+
+    # Generate enough prose to fill every page
+    words_needed = pages * lines_per_page * chars_per_line // 5
+    lines = _wrap(make_sentences(words_needed // 12 + 1, seed), chars_per_line)
+
+    streams = []
+    for page_index in range(pages):
+        page_lines = lines[page_index * lines_per_page:(page_index + 1) * lines_per_page]
+        ops = ['BT', f'/F1 {font_size} Tf', f'{leading} TL']
+        for column in range(columns):
+            column_lines = page_lines[column * lines_per_column:(column + 1) * lines_per_column]
+            if not column_lines:
+                break
+            x = MARGIN + column * (column_width + column_gap)
+            ops.append(f'1 0 0 1 {x:.2f} {PAGE_HEIGHT - MARGIN} Tm')
+            for line in column_lines:
+                ops.append(f'({line}) Tj T*')
+        ops.append('ET')
+        streams.append('\n'.join(ops).encode('latin-1'))
+    return streams
+
+def make_pdf(path: str, pages: int = 1, layout: str = 'single', seed: int = 0) -> Dict:
+    """
+    Write a synthetic PDF
+
+    Args:
+        path: Output file path
+        pages: Number of pages
+        layout: Text layout ('single', 'two_column' or 'dense')
+        seed: Random seed for the text
+
+    Returns:
+        Dictionary with the path, page count, layout and file size
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unsupported layout: {layout}")
+
+    streams = _page_streams(pages, layout, seed)
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content per page
+    page_ids = [4 + 2 * i for i in range(pages)]
+    objects = {
+        1: b'<< /Type /Catalog /Pages 2 0 R >>',
+        2: '<< /Type /Pages /Kids [{}] /Count {} >>'.format(
+            ' '.join(f'{page_id} 0 R' for page_id in page_ids),
+            pages
+        ).encode('latin-1'),
+        3: b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>'
+    }
+    for page_id, stream in zip(page_ids, streams):
+        objects[page_id] = (
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>'
+        ).encode('latin-1')
+        objects[page_id + 1] = (
+            f'<< /Length {len(stream)} >>\nstream\n'.encode('latin-1') + stream + b'\nendstream'
+        )
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(output)
+        output += f'{object_id} 0 obj\n'.encode('latin-1') + objects[object_id] + b'\nendobj\n'
+
+    xref_offset = len(output)
+    output += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    for object_id in sorted(objects):
+        output += f'{offsets[object_id]:010d} 00000 n \n'.encode('latin-1')
+    output += (
+        f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n'
+        f'startxref\n{xref_offset}\n%%EOF\n'
+    ).encode('latin-1')
+
+    with open(path, 'wb') as f:
+        f.write(output)
+
+    return {
+        'path': path,
+        'pages': pages,
+        'layout': layout,
+        'file_bytes': len(output)
+    }
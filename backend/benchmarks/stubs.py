@@ -0,0 +1,263 @@
+from typing import Dict, Optional
+import base64
+import functools
+import json
+import os
+import threading
+import time
+import zlib
+from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# One silent MPEG-2 Layer III frame (24 kHz, 32 kbps, 24 ms), like gTTS output
+SILENT_FRAME = bytes([0xFF, 0xF3, 0x44, 0xC4]) + bytes(92)
+
+def silent_mp3(duration: float) -> bytes:
+    """
+    Build a valid MP3 of silent frames
+
+    Args:
+        duration: Approximate duration in seconds
+
+    Returns:
+        MP3 bytes
+    """
+    return SILENT_FRAME * max(1, int(duration / 0.024))
+
+class StubGTTSServer:
+    """
+    Local stand-in for the Google Translate batchexecute TTS endpoint
+
+    Answers every POST after a fixed latency with a gTTS-style response
+    carrying a short silent MP3, so gTTS and ConcurrentGTTS can be
+    benchmarked without network access.
+    """
+
+    def __init__(self, latency_ms: float = 50.0, port: int = 0):
+        """
+        Initialize stub server
+
+        Args:
+            latency_ms: Delay before each response
+            port: Port to listen on (0 picks a free one)
+        """
+        self.latency = latency_ms / 1000.0
+        self.requests_served = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Allow keep-alive
+            wbufsize = -1  # Send headers and body in one write
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                self.rfile.read(length)
+                time.sleep(stub.latency)
+
+                with stub._lock:
+                    stub.requests_served += 1
+
+                audio = base64.b64encode(silent_mp3(0.5)).decode('ascii')
+                payload = json.dumps(
+                    [['wrb.fr', 'jQ1olc', json.dumps([audio]), None, None, None, 'generic']],
+                    separators=(',', ':')
+                )
+                body = f")]}}'\n\n{len(payload)}\n{payload}\n".encode('utf-8')
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/_/TranslateWebserverUi/data/batchexecute"
+
+    def start(self) -> 'StubGTTSServer':
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+class StubProviders:
+    """
+    Deterministic local translation and TTS providers
+
+    Replaces the Google/DeepL translation and gTTS backends in the
+    provider registry while active. Each call sleeps for a fixed latency;
+    translation upper-cases the text and TTS writes silent MP3 frames
+    whose length follows the text. Failures are decided by a hash of the
+    input, so the same text fails on every run.
+    """
+
+    def __init__(
+        self,
+        translate_latency_ms: float = 5.0,
+        tts_latency_ms: float = 5.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        chars_per_second: float = 15.0
+    ):
+        """
+        Initialize stub providers
+
+        Args:
+            translate_latency_ms: Delay per translation call
+            tts_latency_ms: Delay per TTS call
+            error_rate: Fraction of calls (0-1) that raise
+            seed: Changes which inputs fail
+            chars_per_second: Speaking rate used for the stub audio length
+        """
+        self.translate_latency = translate_latency_ms / 1000.0
+        self.tts_latency = tts_latency_ms / 1000.0
+        self.error_rate = error_rate
+        self.seed = seed
+        self.chars_per_second = chars_per_second
+        self.calls = {'translation': 0, 'tts': 0, 'errors': 0}
+        self._lock = threading.Lock()
+        self._patches = None
+
+    def _should_fail(self, kind: str, text: str) -> bool:
+        if self.error_rate <= 0:
+            return False
+        digest = zlib.crc32(f"{self.seed}:{kind}:{text}".encode('utf-8'))
+        return digest / 0xFFFFFFFF < self.error_rate
+
+    def _count(self, kind: str, failed: bool):
+        with self._lock:
+            self.calls[kind] += 1
+            if failed:
+                self.calls['errors'] += 1
+
+    def translate(self, text: str, target_lang: str, source_lang: str, service: str = 'google') -> Dict:
+        time.sleep(self.translate_latency)
+        failed = self._should_fail('translation', text)
+        self._count('translation', failed)
+        if failed:
+            raise Exception("Stub translation failure")
+
+        return {
+            'translated_text': text.upper(),
+            'source_lang': 'en' if source_lang == 'auto' else source_lang,
+            'target_lang': target_lang,
+            'service': service,
+            'confidence': None
+        }
+
+    def synthesize(self, text: str, language: str, output_path: str) -> Dict:
+        time.sleep(self.tts_latency)
+        failed = self._should_fail('tts', text)
+        self._count('tts', failed)
+        if failed:
+            raise Exception("Stub TTS failure")
+
+        audio = silent_mp3(len(text) / self.chars_per_second)
+        with open(output_path, 'wb') as f:
+            f.write(audio)
+
+        return {
+            'success': True,
+            'audio_path': output_path,
+            'language': language,
+            'service': 'gtts',
+            'file_size': len(audio),
+            'duration': len(audio) // len(SILENT_FRAME) * 0.024
+        }
+
+    def start(self) -> 'StubProviders':
+        from app.services.providers import provider_registry
+
+        self._patches = ExitStack()
+        for service in ('google', 'deepl'):
+            self._patches.enter_context(provider_registry.override(
+                'translation', service, functools.partial(_StubTranslationBackend, self, service)
+            ))
+        self._patches.enter_context(provider_registry.override(
+            'tts', 'gtts', functools.partial(_StubSpeechBackend, self)
+        ))
+        return self
+
+    def stop(self):
+        if self._patches is not None:
+            self._patches.close()
+            self._patches = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+def benchmark_config(root: str, base=None):
+    """
+    Build an app config that keeps all files under root and skips tracing
+
+    Args:
+        root: Directory for uploads and output
+        base: Config class to extend (default: DevelopmentConfig)
+
+    Returns:
+        Config class; also registered as config['benchmark'] for create_app
+    """
+    from config import config, DevelopmentConfig
+
+    output_folder = os.path.join(root, 'output')
+
+    class BenchmarkConfig(base or DevelopmentConfig):
+        DEBUG = False
+        UPLOAD_FOLDER = os.path.join(root, 'uploads')
+        OUTPUT_FOLDER = output_folder
+        AUDIO_OUTPUT_FOLDER = os.path.join(output_folder, 'audio')
+        TRANSLATION_OUTPUT_FOLDER = os.path.join(output_folder, 'translations')
+        TRACE_LOG_PATH = os.path.join(output_folder, 'traces', 'trace.jsonl')
+        PROFILE_FOLDER = os.path.join(output_folder, 'profiles')
+        TRANSLATION_CACHE_PATH = os.path.join(output_folder, 'cache', 'translations.sqlite3')
+        STORAGE_STATE_FOLDER = os.path.join(output_folder, '.storage')
+        STORAGE_SWEEP_INTERVAL = 0
+        TRACING_ENABLED = False
+        PROFILING_SECRET = None
+
+    config['benchmark'] = BenchmarkConfig
+    return BenchmarkConfig
+
+class _StubTranslationBackend:
+    """Translation backend that forwards to StubProviders"""
+
+    def __init__(self, stub: StubProviders, service: str):
+        self.stub = stub
+        self.service = service
+
+    def translate(self, text: str, target_lang: str, source_lang: str) -> Dict:
+        return self.stub.translate(text, target_lang, source_lang, self.service)
+
+    def detect(self, text: str) -> str:
+        return 'en'
+
+class _StubSpeechBackend:
+    """TTS backend that forwards to StubProviders"""
+
+    def __init__(self, stub: StubProviders, **options):
+        self.stub = stub
+
+    def synthesize(self, text: str, language: str, output_path: str, slow: bool = False) -> Dict:
+        return self.stub.synthesize(text, language, output_path)
@@ -12,8 +12,12 @@ class Config:
     OUTPUT_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'output')
     AUDIO_OUTPUT_FOLDER = os.path.join(OUTPUT_FOLDER, 'audio')
     TRANSLATION_OUTPUT_FOLDER = os.path.join(OUTPUT_FOLDER, 'translations')
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max request body (single-request uploads, upload chunks)
+    MAX_UPLOAD_SIZE = 512 * 1024 * 1024  # 512MB max file size for chunked upload sessions
+    UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # Chunk size suggested to clients (must fit MAX_CONTENT_LENGTH)
+    UPLOAD_SESSION_TTL = 24 * 3600  # Seconds an idle upload session is kept for resuming
     ALLOWED_EXTENSIONS = {'pdf'}
+    STREAMING_EXTRACTION_MIN_PAGES = 200  # Documents this long are extracted page by page straight to disk
 
     # API Keys (set these in .env file)
     GOOGLE_TRANSLATE_API_KEY = os.environ.get('GOOGLE_TRANSLATE_API_KEY')
@@ -25,10 +29,83 @@ class Config:
     SUPPORTED_LANGUAGES = [
         'en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ja', 'ko', 'zh', 'ar', 'hi', 'id'
     ]
+    TRANSLATION_PROVIDER_LIMITS = {  # Max concurrent calls per provider, per process
+        'google': 4,
+        'deepl': 8
+    }
+    PROVIDER_PRIORITY_WEIGHTS = {  # Share of saturated providers per priority class (weighted fair queuing)
+        'interactive': 8,  # /translate and the page a reader is waiting on
+        'document': 2,  # Whole-document and pipeline translations
+        'background': 1  # Page prefetch
+    }
+    PAGE_PREFETCH_COUNT = 2  # Pages translated ahead of the reader by default
+    PAGE_PREFETCH_MAX = 10  # Upper bound on the prefetch a client can ask for
+    MULTI_TRANSLATION_MAX_LANGUAGES = 20  # Target languages one /translate/document/multi job may ask for
+    MULTI_TRANSLATION_MAX_WORKERS = 4  # Target languages translated at the same time per job
+    TRANSLATION_CACHE_PATH = os.path.join(OUTPUT_FOLDER, 'cache', 'translations.sqlite3')  # Shared by the API and batch workers (None disables)
 
     # TTS settings
     TTS_CHUNK_SIZE = 5000  # Characters per TTS request
+    TTS_MAX_WORKERS = 4  # Concurrent TTS requests for full-document audio
+    GTTS_MAX_CONNECTIONS = 4  # Concurrent gTTS token requests per host (0 = plain gTTS.save)
     AUDIO_FORMAT = 'mp3'
+    AUDIO_VERSIONS_KEEP = 2  # Published audio versions kept per document (current + previous)
+    PLAYLIST_STALE_SECONDS = 300  # An unpublished playlist that stopped growing this long is abandoned
+    DOCUMENT_LOCK_TIMEOUT = 30  # Seconds to wait for a per-document lock
+
+    # Translate-and-speak pipeline settings
+    PIPELINE_QUEUE_SIZE = 8  # Translated sentences buffered ahead of TTS
+    PIPELINE_TTS_WORKERS = 2  # Concurrent TTS workers per pipeline job
+
+    # Tracing settings (spans written as JSONL, see tools/trace_report.py)
+    TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'true').lower() == 'true'
+    TRACE_LOG_PATH = os.path.join(OUTPUT_FOLDER, 'traces', 'trace.jsonl')
+    TRACE_MAX_BYTES = 10 * 1024 * 1024  # Rotate the trace log at 10MB
+    TRACE_BACKUP_COUNT = 5
+
+    # Profiling settings (send X-Profile-Token: <secret> to profile one request)
+    PROFILING_SECRET = os.environ.get('PROFILING_SECRET')  # Unset disables profiling
+    PROFILE_FOLDER = os.path.join(OUTPUT_FOLDER, 'profiles')
+    PROFILE_KEEP = 100  # Most recent profiles kept on disk
+
+    # Storage lifecycle (audio is evicted first, then translations, then extractions)
+    STORAGE_QUOTA_BYTES = int(os.environ.get('STORAGE_QUOTA_BYTES', 0))  # 0 = unlimited
+    STORAGE_TARGET_RATIO = 0.9  # Evict down to this fraction of the quota
+    STORAGE_MIN_IDLE_SECONDS = 600  # Never evict documents used more recently
+    STORAGE_MAX_IDLE_DAYS = 0  # Drop audio and translations idle this long even under quota (0 = never)
+    STORAGE_SWEEP_INTERVAL = 300  # Seconds between background sweeps (0 disables the sweeper)
+    STORAGE_STATE_FOLDER = os.path.join(OUTPUT_FOLDER, '.storage')
+
+    # Admission control (per process; requests over the limits get 503 with Retry-After)
+    ADMISSION_LIMITS = {  # Concurrent and waiting requests per route (Flask endpoint)
+        'default': {'concurrency': 16, 'queue': 32},
+        'upload.upload_file': {'concurrency': 4, 'queue': 8},
+        'translate.translate_document': {'concurrency': 4, 'queue': 8},
+        'tts.generate_document_tts': {'concurrency': 2, 'queue': 4},
+        'tts.generate_custom_tts': {'concurrency': 2, 'queue': 4},
+        'tts.generate_document_tts_stream': {'concurrency': 4, 'queue': 4},
+        'tts.generate_custom_tts_stream': {'concurrency': 4, 'queue': 4}
+    }
+    ADMISSION_QUEUE_TIMEOUT = 10  # Seconds a request may wait for a slot before it is rejected
+    ADMISSION_RETRY_AFTER = 5  # Retry-After seconds sent with 503 responses
+    ADMISSION_EXEMPT = ('health_check', 'readiness', 'metrics', 'static')
+
+    # Provider circuit breakers and readiness
+    PROVIDER_CIRCUIT_FAILURES = 5  # Consecutive provider failures that open its circuit
+    PROVIDER_CIRCUIT_RESET_SECONDS = 30  # Time a circuit stays open before a trial call
+    READY_MAX_QUEUE_FILL = 0.8  # /api/ready fails once a route's wait queue is this full
+    READY_MIN_FREE_BYTES = 1024 * 1024 * 1024  # /api/ready fails below this much free disk space
+
+    # Deadlines (work past them stops; finished units stay checkpointed for the retry)
+    REQUEST_DEADLINES = {  # Seconds per route (Flask endpoint); None = until the client disconnects
+        'default': 120,
+        'translate.translate_document': 600,
+        'tts.generate_document_tts': 600,
+        'tts.generate_custom_tts': 600,
+        'tts.generate_document_tts_stream': None,
+        'tts.generate_custom_tts_stream': None
+    }
+    JOB_DEADLINE = 6 * 60 * 60  # Default and maximum seconds a background job may run
 
     # CORS settings
     CORS_ORIGINS = '*'  # Allow all origins in development
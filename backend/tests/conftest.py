@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks.stubs import benchmark_config
+
+@pytest.fixture
+def app(tmp_path):
+    """App with all its files under a temporary folder, tracing and the storage sweeper off"""
+    from app import create_app
+
+    benchmark_config(str(tmp_path))
+    return create_app('benchmark')
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from app.utils.admission import AdmissionController, RouteLimit
+
+def test_slots_then_queue_then_rejection():
+    route_limit = RouteLimit('translate', concurrency=1, queue_size=1)
+    assert route_limit.acquire(timeout=1)
+
+    admitted = []
+    waiter = threading.Thread(target=lambda: admitted.append(route_limit.acquire(timeout=5)))
+    waiter.start()
+    while route_limit.snapshot()['waiting'] < 1:
+        time.sleep(0.001)
+
+    # Queue full: rejected without waiting
+    started = time.monotonic()
+    assert not route_limit.acquire(timeout=5)
+    assert time.monotonic() - started < 1
+
+    route_limit.release()
+    waiter.join(5)
+    assert admitted == [True]
+    assert route_limit.snapshot() == {
+        'active': 1, 'concurrency': 1, 'waiting': 0, 'queue_size': 1, 'saturation': 1.0
+    }
+
+def test_queued_request_times_out():
+    route_limit = RouteLimit('translate', concurrency=1, queue_size=4)
+    assert route_limit.acquire(timeout=1)
+
+    started = time.monotonic()
+    assert not route_limit.acquire(timeout=0.05)
+    assert time.monotonic() - started >= 0.05
+    assert route_limit.snapshot()['waiting'] == 0
+    assert route_limit.snapshot()['active'] == 1
+
+def test_controller_uses_route_and_default_limits():
+    controller = AdmissionController(
+        {'translate': {'concurrency': 1, 'queue': 0}, 'default': {'concurrency': 2, 'queue': 0}},
+        queue_timeout=0.01
+    )
+
+    assert controller.admit('translate') is not None
+    assert controller.admit('translate') is None
+    other = [controller.admit('upload') for _ in range(3)]
+    assert [route_limit is not None for route_limit in other] == [True, True, False]
+
+    other[0].release()
+    assert controller.admit('upload') is not None
+    assert controller.snapshot()['upload']['active'] == 2
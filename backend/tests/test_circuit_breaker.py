@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError, provider_circuits
+from app.services.providers import provider_registry
+from app.utils.cancellation import CancelToken, cancel_scope
+
+def _fail(breaker: CircuitBreaker, error: Exception):
+    with pytest.raises(type(error)):
+        with breaker.guard():
+            raise error
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker('translation', 'google', failure_threshold=3)
+    _fail(breaker, Exception('timeout'))
+    _fail(breaker, Exception('timeout'))
+    with breaker.guard():
+        pass  # A success resets the count
+    for _ in range(3):
+        _fail(breaker, Exception('timeout'))
+
+    assert breaker.snapshot()['state'] == 'open'
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            pass
+
+def test_half_open_lets_one_trial_call_through():
+    breaker = CircuitBreaker('translation', 'google', failure_threshold=1, reset_seconds=0.05)
+    _fail(breaker, Exception('timeout'))
+    time.sleep(0.06)
+
+    with breaker.guard():
+        assert breaker.state == 'half_open'
+        # Other calls fail fast while the trial runs
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard():
+                pass
+
+    assert breaker.snapshot() == {'state': 'closed', 'failures': 0, 'retry_in_seconds': None}
+
+def test_failed_trial_opens_the_circuit_again():
+    breaker = CircuitBreaker('translation', 'google', failure_threshold=1, reset_seconds=0.05)
+    _fail(breaker, Exception('timeout'))
+    time.sleep(0.06)
+
+    _fail(breaker, Exception('still down'))
+
+    assert breaker.state == 'open'
+    assert breaker.snapshot()['retry_in_seconds'] > 0.03
+
+def test_cancelled_call_is_not_counted():
+    breaker = CircuitBreaker('translation', 'google', failure_threshold=1)
+    token = CancelToken()
+
+    with cancel_scope(token):
+        token.cancel()
+        _fail(breaker, Exception('read timed out'))
+
+    assert breaker.snapshot()['state'] == 'closed'
+
+def test_rejected_input_does_not_open_the_circuit():
+    breaker = CircuitBreaker('translation', 'google', failure_threshold=2)
+
+    for _ in range(5):
+        _fail(breaker, ValueError('Unsupported language: xx-bad'))
+
+    assert breaker.snapshot()['state'] == 'closed'
+    assert breaker.failures == 0
+
+def test_open_circuit_reports_retry_after():
+    breaker = CircuitBreaker('tts', 'gtts', failure_threshold=2, reset_seconds=30.0)
+    _fail(breaker, Exception('503 from provider'))
+    _fail(breaker, Exception('503 from provider'))
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        with breaker.guard():
+            pass
+    assert 29.0 < excinfo.value.retry_after <= 30.0
+
+def test_route_answers_503_with_retry_after_while_open(client):
+    class DownBackend:
+        def translate(self, text, target_lang, source_lang):
+            raise Exception('503 from provider')
+
+    with provider_registry.override('translation', 'down', DownBackend):
+        provider_circuits.get('translation', 'down').failure_threshold = 2
+        request = {'text': 'hello', 'target_lang': 'es', 'service': 'down'}
+        statuses = [client.post('/api/translate', json=request).status_code for _ in range(2)]
+        response = client.post('/api/translate', json=request)
+
+    assert statuses == [500, 500]
+    assert response.status_code == 503
+    assert 1 <= int(response.headers['Retry-After']) <= 30
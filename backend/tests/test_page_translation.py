@@ -0,0 +1,49 @@
+from app.services.page_translation import PageTranslationService
+from app.services.providers import provider_registry
+
+def _backend(name: str):
+    class Backend:
+        calls = 0
+
+        def translate(self, text, target_lang, source_lang):
+            Backend.calls += 1
+            return {'translated_text': f"{name}: {text}", 'source_lang': 'en', 'target_lang': target_lang, 'service': name}
+    return Backend
+
+TEXT_DATA = {'pages': [{'page_number': 1, 'text': 'Hello.'}, {'page_number': 2, 'text': 'World.'}]}
+
+def test_pages_are_stored_per_service_and_source_language(tmp_path):
+    first, second = _backend('first'), _backend('second')
+    page_service = PageTranslationService(str(tmp_path))
+
+    with provider_registry.override('translation', 'first', first), \
+            provider_registry.override('translation', 'second', second):
+        result = page_service.translate_pages('doc', TEXT_DATA, [1], 'es', 'auto', 'first')
+        assert result['pages'][0]['translated_text'] == 'first: Hello.'
+
+        result = page_service.translate_pages('doc', TEXT_DATA, [1], 'es', 'auto', 'second')
+        assert result['cached'] == []
+        assert result['pages'][0]['translated_text'] == 'second: Hello.'
+
+        result = page_service.translate_pages('doc', TEXT_DATA, [1], 'es', 'en', 'first')
+        assert result['cached'] == []
+
+        result = page_service.translate_pages('doc', TEXT_DATA, [1], 'es', 'auto', 'first')
+        assert result['cached'] == [1]
+        assert result['pages'][0]['translated_text'] == 'first: Hello.'
+
+    assert (first.calls, second.calls) == (2, 1)
+
+def test_prefetch_reservations_are_per_service(tmp_path):
+    page_service = PageTranslationService(str(tmp_path))
+
+    assert page_service.pages_to_prefetch('doc', TEXT_DATA, 0, 2, 'es', 'auto', 'first') == [1, 2]
+    assert page_service.pages_to_prefetch('doc', TEXT_DATA, 0, 2, 'es', 'auto', 'first') == []
+    assert page_service.pages_to_prefetch('doc', TEXT_DATA, 0, 2, 'es', 'auto', 'second') == [1, 2]
+
+    for page_number in (1, 2):
+        page_service.release_prefetch('doc', 'es', page_number, 'auto', 'first')
+        page_service.release_prefetch('doc', 'es', page_number, 'auto', 'second')
+    assert page_service.pages_to_prefetch('doc', TEXT_DATA, 0, 2, 'es', 'auto', 'first') == [1, 2]
+    for page_number in (1, 2):
+        page_service.release_prefetch('doc', 'es', page_number, 'auto', 'first')
@@ -0,0 +1,69 @@
+import contextlib
+import json
+import random
+
+import pytest
+
+from app.services.pdf_processor import PDFProcessor
+from app.services.providers import provider_registry
+
+def _page(number: int) -> str:
+    """A page with a running header, wrapped and hyphenated lines and a page footer"""
+    choice = random.Random(number).choice
+    words = ' '.join(choice(['alpha', 'beta', 'ﬁsh', 'co-\noperate', 'gamma.', 'delta,']) for _ in range(200))
+    lines = [words[i:i + 70] for i in range(0, len(words), 70)]
+    return 'ACME Quarterly Report\n' + '\n'.join(lines) + f"\n\nPage {number} of 6\n"
+
+PAGES = [_page(number) for number in range(1, 7)]
+
+class FakePages:
+    """Extraction backend serving PAGES for any file"""
+
+    @contextlib.contextmanager
+    def open(self, pdf_path):
+        yield {}, len(PAGES), iter(PAGES)
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / 'book.pdf'
+    path.write_bytes(b'%PDF-1.4')
+    with provider_registry.override('extraction', 'fake', FakePages):
+        yield str(path)
+
+def test_streamed_offset_map_matches_in_memory_map(pdf_path, tmp_path):
+    processor = PDFProcessor()
+    in_memory = processor.extract_text(pdf_path, method='fake')
+
+    output_path = tmp_path / 'book.json'
+    processor.extract_to_file(pdf_path, str(output_path), method='fake')
+    streamed = json.loads(output_path.read_text(encoding='utf-8'))
+
+    assert len(in_memory['boilerplate']) == 2
+    assert streamed['full_text'] == in_memory['full_text']
+    assert streamed['raw_text'] == in_memory['raw_text']
+    assert streamed['normalization']['offset_map'] == in_memory['normalization']['offset_map']
+
+def test_offset_map_is_sorted_across_removed_footers(pdf_path, tmp_path):
+    processor = PDFProcessor()
+    output_path = tmp_path / 'book.json'
+    processor.extract_to_file(pdf_path, str(output_path), method='fake')
+    document = json.loads(output_path.read_text(encoding='utf-8'))
+
+    offset_map = document['normalization']['offset_map']
+    assert offset_map == sorted(offset_map)
+    assert offset_map[-1][0] <= len(document['full_text'])
+
+    # Positions map to raw offsets in order, also across page breaks
+    raw_positions = [processor.map_to_raw(offset_map, i) for i in range(len(document['full_text']) + 1)]
+    assert raw_positions == sorted(raw_positions)
+
+def test_normalize_text_maps_rewrites_back_to_raw():
+    processor = PDFProcessor()
+    raw = '  The co-\noperation of ﬁve  teams.\n\nNext line'
+    normalized = processor.normalize_text(raw)
+
+    assert normalized['text'] == 'The cooperation of five teams.\nNext line'
+    offset_map = normalized['offset_map']
+    assert raw[processor.map_to_raw(offset_map, normalized['text'].index('of'))] == 'o'
+    assert raw[processor.map_to_raw(offset_map, normalized['text'].index('teams'))] == 't'
+    assert processor.map_to_raw(offset_map, len(normalized['text'])) == len(raw)
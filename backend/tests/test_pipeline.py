@@ -0,0 +1,26 @@
+from app.services.pipeline import TranslateSpeakPipeline
+
+class FailingFirstTranslator:
+    """Fails the first sentence and detects French for the rest"""
+
+    def translate_text(self, text, target_lang, source_lang):
+        if text.startswith('Bonjour'):
+            raise Exception('provider error')
+        return {'translated_text': text.upper(), 'source_lang': 'fr', 'target_lang': target_lang}
+
+class SilentTTS:
+    service = 'silent'
+
+    def text_to_speech(self, text, language, output_path):
+        with open(output_path, 'wb') as f:
+            f.write(b'')
+        return {'success': True, 'audio_path': output_path, 'language': language, 'duration': 0.0}
+
+def test_source_language_comes_from_the_first_translated_sentence(tmp_path):
+    pipeline = TranslateSpeakPipeline(FailingFirstTranslator(), SilentTTS(), tts_workers=1)
+
+    result = pipeline.run(['Bonjour.', 'Merci.', 'Au revoir.'], 'en', 'auto', str(tmp_path))
+
+    assert result['source_lang'] == 'fr'
+    assert result['segments'][0].failed
+    assert result['translated_sentences'] == ['MERCI.', 'AU REVOIR.']
@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from app.services.scheduler import ProviderScheduler, _Waiter, priority
+from app.utils.cancellation import CancelledError, CancelToken, cancel_scope
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the scheduler"
+        time.sleep(0.001)
+
+class _Calls:
+    """Queues calls one at a time behind a held slot and records their admission order"""
+
+    def __init__(self, scheduler: ProviderScheduler, service: str = 'provider'):
+        self.scheduler = scheduler
+        self.service = service
+        self.order = []
+        self.threads = []
+
+    def queue(self, name: str, priority_class: str, flow: str, cost: float = 10, token=None):
+        waiting = self.scheduler.stats()[self.service]['waiting']
+
+        def call():
+            with cancel_scope(token), priority(priority_class, flow):
+                try:
+                    with self.scheduler.slot(self.service, cost):
+                        self.order.append(name)
+                except CancelledError:
+                    self.order.append(f"{name} cancelled")
+
+        thread = threading.Thread(target=call)
+        thread.start()
+        self.threads.append(thread)
+        _wait_for(lambda: self.scheduler.stats()[self.service]['waiting'] == waiting + 1)
+
+    def join(self):
+        for thread in self.threads:
+            thread.join(5)
+
+def test_interactive_call_waits_only_for_the_next_free_slot():
+    scheduler = ProviderScheduler(default_limit=1)
+    calls = _Calls(scheduler)
+
+    with scheduler.slot('provider'):
+        for page in range(1, 5):
+            calls.queue(f"book page {page}", 'document', 'book')
+        calls.queue('sentence', 'interactive', 'user')
+
+    calls.join()
+    assert calls.order == ['book page 1', 'sentence', 'book page 2', 'book page 3', 'book page 4']
+
+def test_flows_of_one_class_share_the_provider_evenly():
+    scheduler = ProviderScheduler(default_limit=1)
+    calls = _Calls(scheduler)
+
+    with scheduler.slot('provider'):
+        for page in range(1, 4):
+            calls.queue(f"a{page}", 'document', 'book a')
+        for page in range(1, 4):
+            calls.queue(f"b{page}", 'document', 'book b')
+
+    calls.join()
+    assert calls.order == ['a1', 'b1', 'a2', 'b2', 'a3', 'b3']
+
+def test_cancelled_waiter_leaves_the_queue_without_a_slot():
+    scheduler = ProviderScheduler(default_limit=1)
+    calls = _Calls(scheduler)
+    token = CancelToken()
+
+    with scheduler.slot('provider'):
+        calls.queue('cancelled', 'document', 'book', token=token)
+        calls.queue('next', 'document', 'other')
+        token.cancel()
+        _wait_for(lambda: scheduler.stats()['provider']['waiting'] == 1)
+        assert scheduler.stats()['provider']['active'] == 1
+
+    calls.join()
+    assert calls.order == ['cancelled cancelled', 'next']
+    assert scheduler.stats()['provider'] == {'limit': 1, 'active': 0, 'waiting': 0}
+
+def test_waiter_admitted_as_it_is_cancelled_passes_its_slot_on():
+    scheduler = ProviderScheduler(default_limit=1)
+    with scheduler._lock:
+        provider_queue = scheduler._queue('provider')
+        provider_queue.active = 1
+    waiter = _Waiter()
+    waiter.admitted = True
+    token = CancelToken()
+    token.cancel()
+
+    with pytest.raises(CancelledError):
+        scheduler._leave_if_cancelled('provider', provider_queue, waiter, token, 'document')
+    assert scheduler.stats()['provider']['active'] == 0
+
+def test_deadline_while_waiting_releases_nothing():
+    scheduler = ProviderScheduler(default_limit=1)
+    calls = _Calls(scheduler)
+
+    with scheduler.slot('provider'):
+        calls.queue('late', 'document', 'book', token=CancelToken(timeout=0.2))
+        calls.join()
+        assert calls.order == ['late cancelled']
+        assert scheduler.stats()['provider'] == {'limit': 1, 'active': 1, 'waiting': 0}
+
+    assert scheduler.stats()['provider']['active'] == 0
@@ -0,0 +1,38 @@
+import threading
+import time
+
+import pytest
+
+from app.services.providers import provider_registry
+from app.services.text_to_speech import TextToSpeechService
+
+class FirstPieceFails:
+    """TTS backend whose first piece fails at once while the others take a while"""
+
+    calls = 0
+    lock = threading.Lock()
+
+    def __init__(self, **options):
+        pass
+
+    def synthesize(self, text, language, output_path, slow=False):
+        with self.lock:
+            FirstPieceFails.calls += 1
+        if text.startswith('Sentence 0 '):
+            raise Exception('provider error')
+        time.sleep(0.05)
+        with open(output_path, 'wb') as f:
+            f.write(b'')
+        return {'success': True, 'audio_path': output_path, 'language': language}
+
+def test_failed_piece_stops_the_pieces_not_yet_started(tmp_path):
+    text = ' '.join(f"Sentence {i} {'word ' * 40}ends here." for i in range(20))
+
+    with provider_registry.override('tts', 'first_piece_fails', FirstPieceFails):
+        tts_service = TextToSpeechService(service='first_piece_fails')
+        with pytest.raises(Exception, match='provider error'):
+            tts_service.text_to_speech_chunked(text, 'en', str(tmp_path / 'full.mp3'), max_chars=250, max_workers=2)
+
+    # Only the pieces already running when the first one failed were synthesized
+    assert FirstPieceFails.calls <= 4
+    assert list(tmp_path.iterdir()) == []
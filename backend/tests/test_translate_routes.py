@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+@pytest.fixture
+def document(app):
+    text = 'Hello world. This is a test.'
+    path = f"{app.config['TRANSLATION_OUTPUT_FOLDER']}/doc_extracted.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'full_text': text, 'pages': [{'page_number': 1, 'text': text}], 'total_pages': 1}, f)
+    return 'doc'
+
+@pytest.mark.parametrize('target_langs, error', [
+    (['es', {}], 'language codes'),
+    (['es', 'xx-bad'], 'Unsupported target language'),
+    (['es'] * 3 + [f"l{i}" for i in range(30)], 'At most 20'),
+])
+def test_multi_translation_rejects_bad_target_lists(client, document, target_langs, error):
+    response = client.post('/api/translate/document/multi', json={
+        'document_id': document,
+        'target_langs': target_langs
+    })
+
+    assert response.status_code == 400
+    assert error in response.get_json()['error']
+
+def test_repeated_translation_is_served_from_the_shared_cache(client):
+    from app.services.providers import provider_registry
+
+    class CountingBackend:
+        calls = 0
+
+        def translate(self, text, target_lang, source_lang):
+            CountingBackend.calls += 1
+            return {'translated_text': f"[{target_lang}] {text}", 'source_lang': 'en', 'target_lang': target_lang}
+
+    body = {'text': 'Hello world.', 'target_lang': 'es', 'service': 'counting'}
+    with provider_registry.override('translation', 'counting', CountingBackend):
+        first = client.post('/api/translate', json=body)
+        second = client.post('/api/translate', json=body)
+
+    assert first.status_code == second.status_code == 200
+    assert second.get_json()['translation'] == first.get_json()['translation']
+    assert CountingBackend.calls == 1
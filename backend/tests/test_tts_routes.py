@@ -0,0 +1,50 @@
+import json
+import os
+
+from app.services.providers import provider_registry
+from app.utils.cancellation import CancelledError
+from benchmarks.stubs import silent_mp3
+
+TRANSLATED_TEXT = 'Uno. Dos. Tres. Cuatro.'
+
+class InterruptedOnce:
+    """TTS backend whose run is cut off at its third segment the first time"""
+
+    texts = []
+    interrupted = False
+
+    def __init__(self, **options):
+        pass
+
+    def synthesize(self, text, language, output_path, slow=False):
+        if text == 'Tres.' and not InterruptedOnce.interrupted:
+            InterruptedOnce.interrupted = True
+            raise CancelledError('Deadline exceeded')
+        InterruptedOnce.texts.append(text)
+        with open(output_path, 'wb') as f:
+            f.write(silent_mp3(0.5))
+        return {'success': True, 'audio_path': output_path, 'language': language, 'duration': 0.5}
+
+def test_retry_reuses_the_segments_of_the_unfinished_version(app, client):
+    with open(os.path.join(app.config['TRANSLATION_OUTPUT_FOLDER'], 'doc_es_translation.json'), 'w') as f:
+        json.dump({'translated_text': TRANSLATED_TEXT, 'original_text': 'One. Two. Three. Four.'}, f)
+    body = {'document_id': 'doc', 'language': 'es', 'service': 'interrupted_once'}
+
+    with provider_registry.override('tts', 'interrupted_once', InterruptedOnce):
+        assert client.post('/api/tts/generate-document', json=body).status_code == 504
+        assert InterruptedOnce.texts == ['Uno.', 'Dos.']
+
+        response = client.post('/api/tts/generate-document', json=body)
+        assert response.status_code == 200
+
+    # Only the segments the first attempt never made were synthesized again
+    assert InterruptedOnce.texts == ['Uno.', 'Dos.', 'Tres.', 'Cuatro.']
+    segments = response.get_json()['segments']
+    assert [segment['text'] for segment in segments] == ['Uno.', 'Dos.', 'Tres.', 'Cuatro.']
+    for segment in segments:
+        audio_path = os.path.join(app.config['AUDIO_OUTPUT_FOLDER'], segment['audio_file'])
+        assert os.path.getsize(audio_path) > 0
+        assert segment['audio_file'].startswith(f"doc/{response.get_json()['version']}/")
+
+    # Every segment is published, so the next generation starts from scratch
+    assert not os.path.exists(os.path.join(app.config['TRANSLATION_OUTPUT_FOLDER'], 'doc_es_tts.checkpoint.jsonl'))
@@ -0,0 +1,95 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from app.services import upload_sessions
+from app.services.upload_sessions import UploadOffsetError, UploadSessionStore
+
+DATA = bytes(range(256)) * 40
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadSessionStore(str(tmp_path), max_size=len(DATA) * 2)
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def test_chunks_append_at_the_current_offset(store):
+    upload_id = store.create('book.pdf', len(DATA), sha256=_sha256(DATA))['upload_id']
+
+    status = store.write_chunk(upload_id, 0, io.BytesIO(DATA[:4000]))
+    assert (status['offset'], status['received'], status['complete']) == (4000, 4000, False)
+
+    # A resent chunk is refused with the offset to resume from
+    with pytest.raises(UploadOffsetError) as excinfo:
+        store.write_chunk(upload_id, 0, io.BytesIO(DATA[:4000]))
+    assert excinfo.value.offset == 4000
+
+    status = store.write_chunk(upload_id, 4000, io.BytesIO(DATA[4000:]))
+    assert status['complete']
+
+def test_rejected_chunk_leaves_the_offset_for_a_retry(store):
+    upload_id = store.create('book.pdf', len(DATA))['upload_id']
+    store.write_chunk(upload_id, 0, io.BytesIO(DATA[:1000]))
+
+    with pytest.raises(ValueError):
+        store.write_chunk(upload_id, 1000, io.BytesIO(DATA[1000:2000]), chunk_sha256='00' * 32)
+    with pytest.raises(ValueError):
+        store.write_chunk(upload_id, 1000, io.BytesIO(DATA[1000:] + b'overrun'))
+    assert store.status(upload_id)['offset'] == 1000
+
+    store.write_chunk(upload_id, 1000, io.BytesIO(DATA[1000:2000]), chunk_sha256=_sha256(DATA[1000:2000]))
+    assert store.status(upload_id)['offset'] == 2000
+
+def test_finalize_checks_the_whole_file_hash(store, tmp_path):
+    upload_id = store.create('book.pdf', len(DATA), sha256=_sha256(DATA))['upload_id']
+    store.write_chunk(upload_id, 0, io.BytesIO(DATA[:3000]))
+    store.write_chunk(upload_id, 3000, io.BytesIO(DATA[3000:]))
+
+    destination = str(tmp_path / 'book.pdf')
+    result = store.finalize(upload_id, destination)
+
+    assert result['sha256'] == _sha256(DATA)
+    with open(destination, 'rb') as f:
+        assert f.read() == DATA
+    with pytest.raises(FileNotFoundError):
+        store.status(upload_id)
+
+def test_resumed_in_another_process_rehashes_from_disk(store, tmp_path):
+    upload_id = store.create('book.pdf', len(DATA), sha256=_sha256(DATA[::-1]))['upload_id']
+    store.write_chunk(upload_id, 0, io.BytesIO(DATA[:3000]))
+    upload_sessions._hashers.pop(upload_id)  # Earlier chunks went to another worker
+    store.write_chunk(upload_id, 3000, io.BytesIO(DATA[3000:]))
+
+    with pytest.raises(ValueError, match='checksum mismatch'):
+        store.finalize(upload_id, str(tmp_path / 'book.pdf'))
+
+    with pytest.raises(ValueError, match='incomplete'):
+        other = store.create('other.pdf', 10)['upload_id']
+        store.finalize(other, str(tmp_path / 'other.pdf'))
+
+def test_expire_drops_old_sessions_and_their_hashes(tmp_path):
+    store = UploadSessionStore(str(tmp_path), max_size=len(DATA), ttl_seconds=-1)
+    upload_id = store.create('book.pdf', len(DATA))['upload_id']
+    store.write_chunk(upload_id, 0, io.BytesIO(DATA[:100]))
+
+    store.expire()
+
+    assert upload_id not in upload_sessions._hashers
+    assert os.listdir(store.folder) == []
+    with pytest.raises(FileNotFoundError):
+        store.status(upload_id)
+
+def test_chunk_over_the_request_limit_is_413(app, client):
+    app.config['MAX_CONTENT_LENGTH'] = 1000
+    response = client.post('/api/upload/sessions', json={'filename': 'book.pdf', 'size': 5000})
+    upload_id = response.get_json()['upload_id']
+
+    response = client.put(f"/api/upload/sessions/{upload_id}?offset=0", data=b'x' * 2000)
+    assert response.status_code == 413
+
+    response = client.put(f"/api/upload/sessions/{upload_id}?offset=0", data=b'x' * 1000)
+    assert response.status_code == 200
+    assert response.get_json()['offset'] == 1000
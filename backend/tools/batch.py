@@ -0,0 +1,412 @@
+"""
+Offline batch pipeline: extract, translate and synthesize a directory of PDFs
+
+Runs PDFProcessor, TranslationService and TextToSpeechService directly,
+without the HTTP API, and writes the same layout the API reads:
+
+    translations/{document_id}_extracted.json
+    translations/{document_id}_{lang}_translation.json
+    audio/{document_id}/{version}/segment_{n}.mp3 + playlist.m3u8
+    audio/{document_id}/segments.json (points at the published version)
+
+Documents are spread over --processes worker processes (extraction is CPU
+bound). Within a document, --threads sentence segments are synthesized
+concurrently (TTS is network bound). Translations go through a SQLite
+cache shared by all workers, so repeated text is translated once.
+
+The document ID is derived from the file name and content, so running the
+same command again resumes: finished stages are skipped and interrupted
+translations continue from their checkpoint.
+
+Usage (from backend/):
+    python -m tools.batch ~/courses --lang es
+    python -m tools.batch ~/courses --lang es --lang fr --processes 4 --threads 8
+    python -m tools.batch ~/courses --lang de --no-audio --output report.json
+"""
+import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from werkzeug.utils import secure_filename
+
+from app.models import AudioSegment
+from app.utils.files import atomic_write_json, audio_file_name, new_audio_version, publish_audio_version
+from app.utils.playlist import PLAYLIST_FILENAME, MediaPlaylist, estimate_target_duration
+from config import config
+
+# Per-process state set up by _init_worker
+_settings = None
+_progress = None
+_cache = None
+
+def document_id_for(pdf_path: str) -> str:
+    """Stable document ID: file name plus a hash of the content"""
+    digest = hashlib.sha1()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    name = os.path.splitext(secure_filename(os.path.basename(pdf_path)))[0] or 'document'
+    return f"{name}_{digest.hexdigest()[:12]}"
+
+def _init_worker(settings: dict, progress):
+    """Configure a worker process once, before it takes documents"""
+    global _settings, _progress, _cache
+    from app.services.scheduler import provider_scheduler
+    from app.services.translation_cache import TranslationCache
+
+    _settings = settings
+    _progress = progress
+    provider_scheduler.configure(settings['provider_limits'])
+    _cache = TranslationCache(settings['cache_path']) if settings['cache_path'] else None
+
+def _report(event: str, **values):
+    if _progress is not None:
+        _progress.put((event, values))
+
+def _extract(pdf_path: str, document_id: str) -> tuple:
+    """Extract (or load already extracted) text, with the upload route's fallback"""
+    from app.services.pdf_processor import PDFProcessor
+
+    text_file_path = os.path.join(_settings['translation_folder'], f"{document_id}_extracted.json")
+    if os.path.exists(text_file_path):
+        with open(text_file_path, 'r', encoding='utf-8') as f:
+            return json.load(f), False
+
+    # Pages go straight to disk so a worker's peak memory doesn't depend on the page count
+    pdf_processor = PDFProcessor()
+    try:
+        pdf_processor.extract_to_file(pdf_path, text_file_path, method='pdfplumber')
+    except Exception:
+        pdf_processor.extract_to_file(pdf_path, text_file_path, method='pypdf2')
+
+    with open(text_file_path, 'r', encoding='utf-8') as f:
+        return json.load(f), True
+
+def _translate(document_id: str, text_data: dict, target_lang: str) -> tuple:
+    """Translate the document, resuming from its checkpoint (same file as the API's)"""
+    from app.services.pdf_processor import PDFProcessor
+    from app.services.scheduler import priority
+    from app.services.translator import TranslationService, TranslationCheckpoint
+
+    folder = _settings['translation_folder']
+    translation_file_path = os.path.join(folder, f"{document_id}_{target_lang}_translation.json")
+    if os.path.exists(translation_file_path):
+        with open(translation_file_path, 'r', encoding='utf-8') as f:
+            translation_result = json.load(f)
+        if translation_result.get('complete') is not False:
+            return translation_result, False
+
+    pdf_processor = PDFProcessor()
+    translator = TranslationService(service=_settings['service'], cache=_cache)
+    checkpoint = TranslationCheckpoint(
+        os.path.join(folder, f"{document_id}_{target_lang}_translation.checkpoint.jsonl"),
+        _settings['service']
+    )
+
+    chunks = pdf_processor.split_into_chunks(text_data['full_text'], max_chars=5000)
+    with priority('document', document_id):
+        translation_result = {
+            'document_id': document_id,
+            **translator.translate_document(
+                text_data, chunks, target_lang, _settings['source_lang'], False, checkpoint
+            ),
+            'normalization': pdf_processor.normalization_summary(text_data)
+        }
+    atomic_write_json(translation_file_path, translation_result)
+
+    if not translation_result['complete']:
+        raise Exception(
+            f"Incomplete {target_lang} translation ({len(translation_result['failed_chunks'])} chunks, "
+            f"{len(translation_result['failed_pages'])} pages failed); run again to resume"
+        )
+    checkpoint.discard()
+    return translation_result, True
+
+def _synthesize(document_id: str, translation_result: dict, language: str) -> int:
+    """Generate sentence audio and segments.json, synthesizing segments concurrently"""
+    from app.services.text_to_speech import TextToSpeechService
+
+    doc_audio_dir = os.path.join(_settings['audio_folder'], document_id)
+    segment_info_path = os.path.join(doc_audio_dir, 'segments.json')
+    if os.path.exists(segment_info_path):
+        with open(segment_info_path, 'r', encoding='utf-8') as f:
+            segment_info = json.load(f)
+        if segment_info.get('language') == language and not any('error' in s for s in segment_info['segments']):
+            return 0
+
+    tts_service = TextToSpeechService(
+        service=_settings['tts_service'],
+        gtts_connections=_settings['gtts_connections']
+    )
+    translated_text = translation_result.get('translated_text', translation_result.get('full_text', ''))
+    original_text = translation_result.get('original_text', '')
+    segments = [s for s in tts_service.create_sentence_segments(translated_text) if s.text.strip()]
+    original_segments = tts_service.create_sentence_segments(original_text) if original_text else []
+    version = new_audio_version(_settings['audio_folder'], document_id)
+    version_dir = os.path.join(doc_audio_dir, version)
+
+    def synthesize_one(segment):
+        output_path = os.path.join(version_dir, f"segment_{segment.id}.mp3")
+        try:
+            audio_info = tts_service.text_to_speech(segment.text, language, output_path)
+        except Exception as e:
+            return AudioSegment(segment.id, segment.text, error=str(e))
+        audio_segment = AudioSegment.from_audio(audio_info, segment)
+        audio_segment.audio_file = audio_file_name(document_id, version, output_path)
+        return audio_segment
+
+    playlist = MediaPlaylist(version_dir, len(segments), estimate_target_duration(tts_service, segments))
+    audio_segments = []
+    try:
+        with ThreadPoolExecutor(max_workers=_settings['threads']) as executor:
+            # map yields in document order, so the playlist grows as the front of the document is done
+            for position, audio_segment in enumerate(executor.map(synthesize_one, segments)):
+                playlist.add_segment_info(position, audio_segment)
+                audio_segments.append(audio_segment)
+    finally:
+        playlist.finish()
+
+    # Same fields as TextToSpeechService.generate_with_timestamps
+    elapsed = 0.0
+    for i, audio_segment in enumerate(audio_segments):
+        audio_segment.original_text = original_segments[i].text if i < len(original_segments) else ''
+        if audio_segment.get('duration') is not None:
+            audio_segment.start_time = elapsed
+            elapsed += audio_segment.duration
+            audio_segment.end_time = elapsed
+
+    publish_audio_version(
+        _settings['audio_folder'],
+        document_id,
+        version,
+        {
+            'document_id': document_id,
+            'language': language,
+            'segment_type': 'sentence',
+            'segments': audio_segments,
+            'playlist': f"{document_id}/{version}/{PLAYLIST_FILENAME}"
+        },
+        keep=_settings['audio_versions_keep']
+    )
+
+    failed = sum(1 for s in audio_segments if s.failed)
+    if failed:
+        raise Exception(f"{failed} of {len(audio_segments)} {language} audio segments failed; run again to retry")
+    return len(audio_segments)
+
+def process_document(pdf_path: str) -> dict:
+    """
+    Run one PDF through extraction, translation and (optionally) TTS
+
+    Args:
+        pdf_path: PDF file path
+
+    Returns:
+        Dictionary with the document ID, per-stage outcome and counts
+    """
+    start = time.perf_counter()
+    document_id = document_id_for(pdf_path)
+    result = {'pdf': pdf_path, 'document_id': document_id, 'stages': {}, 'success': True}
+    cache_hits = _cache.hits if _cache else 0
+
+    try:
+        text_data, extracted = _extract(pdf_path, document_id)
+        result['stages']['extract'] = 'done' if extracted else 'skipped'
+        result['pages'] = text_data['total_pages']
+        _report('pages', count=text_data['total_pages'] if extracted else 0)
+
+        translations = []
+        for target_lang in _settings['languages']:
+            translation_result, translated = _translate(document_id, text_data, target_lang)
+            translations.append(translation_result)
+            result['stages'][f'translate:{target_lang}'] = 'done' if translated else 'skipped'
+            _report('chars', count=translation_result['total_chars'] if translated else 0)
+
+        # Audio is stored per document, so only the first language gets speech
+        if _settings['audio']:
+            language = _settings['languages'][0]
+            segments = _synthesize(document_id, translations[0], language)
+            result['stages'][f'tts:{language}'] = 'done' if segments else 'skipped'
+            _report('segments', count=segments)
+    except Exception as e:
+        result['success'] = False
+        result['error'] = str(e)
+
+    result['cache_hits'] = (_cache.hits if _cache else 0) - cache_hits
+    result['seconds'] = time.perf_counter() - start
+    _report('document', success=result['success'])
+    return result
+
+class ProgressMonitor:
+    """Drains worker progress events and prints a live throughput line"""
+
+    def __init__(self, progress, total_documents: int, interval: float = 1.0, stream=sys.stderr):
+        self.progress = progress
+        self.total_documents = total_documents
+        self.interval = interval
+        self.stream = stream
+        self.start = time.monotonic()
+        self.totals = {'documents': 0, 'failed': 0, 'pages': 0, 'chars': 0, 'segments': 0}
+        self._last_print = 0.0
+
+    def poll(self, timeout: float):
+        """Apply events that arrive within timeout, then refresh the line if due"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                event, values = self.progress.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if event == 'document':
+                self.totals['documents'] += 1
+                if not values['success']:
+                    self.totals['failed'] += 1
+            else:
+                self.totals[event] += values['count']
+
+        if time.monotonic() - self._last_print >= self.interval:
+            self.print_line()
+
+    def rates(self) -> dict:
+        elapsed = max(time.monotonic() - self.start, 1e-9)
+        return {
+            'elapsed_seconds': elapsed,
+            'documents_per_minute': self.totals['documents'] * 60 / elapsed,
+            'pages_per_second': self.totals['pages'] / elapsed,
+            'chars_per_second': self.totals['chars'] / elapsed,
+            'segments_per_second': self.totals['segments'] / elapsed
+        }
+
+    def print_line(self, end: str = '\r'):
+        rates = self.rates()
+        done = self.totals['documents']
+        eta = ''
+        if 0 < done < self.total_documents:
+            eta = f"  eta {(self.total_documents - done) * rates['elapsed_seconds'] / done:6.0f}s"
+        self.stream.write(
+            f"{done}/{self.total_documents} docs ({self.totals['failed']} failed)  "
+            f"{rates['documents_per_minute']:6.1f} docs/min  "
+            f"{rates['pages_per_second']:6.1f} pages/s  "
+            f"{rates['chars_per_second']:8.0f} chars/s  "
+            f"{rates['segments_per_second']:5.1f} segments/s{eta}   {end}"
+        )
+        self.stream.flush()
+        self._last_print = time.monotonic()
+
+def find_pdfs(input_dir: str, recursive: bool) -> list:
+    pattern = os.path.join(input_dir, '**', '*.pdf') if recursive else os.path.join(input_dir, '*.pdf')
+    return sorted(
+        path for path in glob.glob(pattern, recursive=recursive)
+        if os.path.isfile(path) and not os.path.basename(path).startswith('.')
+    )
+
+def run(args) -> dict:
+    """
+    Process every PDF in the input directory
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Report with per-document results and overall throughput
+    """
+    app_config = config[args.config]
+    pdfs = find_pdfs(args.input_dir, args.recursive)
+    settings = {
+        'translation_folder': app_config.TRANSLATION_OUTPUT_FOLDER,
+        'audio_folder': app_config.AUDIO_OUTPUT_FOLDER,
+        'provider_limits': app_config.TRANSLATION_PROVIDER_LIMITS,
+        'gtts_connections': app_config.GTTS_MAX_CONNECTIONS,
+        'audio_versions_keep': app_config.AUDIO_VERSIONS_KEEP,
+        'cache_path': None if args.no_cache else (args.cache or app_config.TRANSLATION_CACHE_PATH),
+        'languages': args.lang,
+        'source_lang': args.source_lang,
+        'service': args.service,
+        'tts_service': args.tts_service,
+        'audio': not args.no_audio,
+        'threads': args.threads
+    }
+    os.makedirs(settings['translation_folder'], exist_ok=True)
+    os.makedirs(settings['audio_folder'], exist_ok=True)
+
+    manager = multiprocessing.Manager()
+    progress = manager.Queue()
+    monitor = ProgressMonitor(progress, len(pdfs), interval=args.refresh)
+    results = []
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=args.processes,
+            initializer=_init_worker,
+            initargs=(settings, progress)
+        ) as executor:
+            pending = {executor.submit(process_document, path) for path in pdfs}
+            while pending:
+                finished = {future for future in pending if future.done()}
+                for future in finished:
+                    results.append(future.result())
+                pending -= finished
+                monitor.poll(timeout=0.2)
+        monitor.poll(timeout=0.2)
+        monitor.print_line(end='\n')
+    finally:
+        manager.shutdown()
+
+    results.sort(key=lambda r: r['pdf'])
+    return {
+        'settings': {key: value for key, value in settings.items() if key != 'provider_limits'},
+        'processes': args.processes,
+        'documents': len(results),
+        'failed': sum(1 for r in results if not r['success']),
+        'totals': monitor.totals,
+        'throughput': monitor.rates(),
+        'cache_hits': sum(r['cache_hits'] for r in results),
+        'results': results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input_dir', help='Directory of PDF files')
+    parser.add_argument('--lang', action='append', required=True, help='Target language (repeat for several)')
+    parser.add_argument('--source-lang', default='auto', help='Source language code')
+    parser.add_argument('--service', default='google', help='Translation service')
+    parser.add_argument('--tts-service', default='gtts', help='TTS service')
+    parser.add_argument('--no-audio', action='store_true', help='Skip speech generation')
+    parser.add_argument('--processes', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='Worker processes (documents in parallel)')
+    parser.add_argument('--threads', type=int, default=4, help='Concurrent TTS segments per document')
+    parser.add_argument('--cache', help='Shared translation cache database (default from config)')
+    parser.add_argument('--no-cache', action='store_true', help='Always call the translation provider')
+    parser.add_argument('--recursive', action='store_true', help='Include PDFs in subdirectories')
+    parser.add_argument('--config', default='default', choices=sorted(config), help='Configuration to take folders from')
+    parser.add_argument('--refresh', type=float, default=1.0, help='Seconds between throughput updates')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"Not a directory: {args.input_dir}")
+
+    report = run(args)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for result in report['results']:
+        if not result['success']:
+            print(f"FAILED {result['pdf']}: {result['error']}", file=sys.stderr)
+    print(
+        f"{report['documents'] - report['failed']}/{report['documents']} documents processed, "
+        f"{report['cache_hits']} translation cache hits",
+        file=sys.stderr
+    )
+    sys.exit(1 if report['failed'] else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+Flame-style breakdown of one request trace from the JSONL trace log
+
+Reads the span records written by app.utils.tracing (including rotated
+files) and prints the span tree of a single request with total time,
+self time and a proportional bar, followed by self time per span name.
+
+Usage (from backend/):
+    python -m tools.trace_report                       # slowest request in the log
+    python -m tools.trace_report --trace-id <id>       # a specific request
+    python -m tools.trace_report --list                # recent requests
+    python -m tools.trace_report --folded > out.folded # input for flamegraph.pl / speedscope
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from collections import defaultdict
+
+DEFAULT_LOG = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'output', 'traces', 'trace.jsonl'
+)
+BAR_WIDTH = 30
+
+def load_spans(log_path):
+    """Load all span records from the log and its rotated backups"""
+    spans = []
+    for path in sorted(glob.glob(log_path + '*')):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    spans.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return spans
+
+def group_traces(spans):
+    traces = defaultdict(list)
+    for record in spans:
+        traces[record['trace_id']].append(record)
+    return traces
+
+def trace_root(trace_spans):
+    """The root span (no parent, or parent missing from the log); the longest one wins"""
+    ids = {s['span_id'] for s in trace_spans}
+    roots = [s for s in trace_spans if not s['parent_id'] or s['parent_id'] not in ids]
+    return max(roots, key=lambda s: s['duration_ms'])
+
+def build_children(trace_spans):
+    children = defaultdict(list)
+    for record in trace_spans:
+        children[record['parent_id']].append(record)
+    for records in children.values():
+        records.sort(key=lambda s: s['start'])
+    return children
+
+def self_time(record, children):
+    """Span time not covered by its children (children may overlap when run in parallel)"""
+    intervals = sorted(
+        (c['start'], c['start'] + c['duration_ms'] / 1000.0)
+        for c in children.get(record['span_id'], [])
+    )
+    covered = 0.0
+    current_start = current_end = None
+    for start, end in intervals:
+        start = max(start, record['start'])
+        end = min(end, record['start'] + record['duration_ms'] / 1000.0)
+        if end <= start:
+            continue
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                covered += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        covered += current_end - current_start
+    return max(0.0, record['duration_ms'] - covered * 1000.0)
+
+def describe(record):
+    attrs = record.get('attrs') or {}
+    keys = ('path', 'provider', 'chars', 'pages', 'status_code', 'method')
+    details = ' '.join(f"{k}={attrs[k]}" for k in keys if k in attrs)
+    if record.get('status') == 'error':
+        details += f" ERROR: {record.get('error')}"
+    return details
+
+def print_tree(root, children, trace_spans, out=sys.stdout):
+    # Background work can outlive the request span, so scale bars to the whole trace
+    trace_end = max(s['start'] + s['duration_ms'] / 1000.0 for s in trace_spans)
+    total = (trace_end - root['start']) * 1000.0 or 1.0
+    out.write(f"{'span':<48} {'total ms':>10} {'self ms':>10}  {'':<{BAR_WIDTH}}\n")
+
+    def walk(record, depth):
+        offset = int((record['start'] - root['start']) * 1000.0 / total * BAR_WIDTH)
+        width = max(1, int(record['duration_ms'] / total * BAR_WIDTH))
+        offset = min(max(offset, 0), BAR_WIDTH - 1)
+        bar = (' ' * offset + '#' * width)[:BAR_WIDTH]
+        label = ('  ' * depth + record['name'])[:48]
+        out.write(
+            f"{label:<48} {record['duration_ms']:>10.1f} {self_time(record, children):>10.1f}  "
+            f"{bar:<{BAR_WIDTH}} {describe(record)}\n"
+        )
+        for child in children.get(record['span_id'], []):
+            walk(child, depth + 1)
+
+    walk(root, 0)
+
+def print_by_name(trace_spans, children, out=sys.stdout):
+    totals = defaultdict(lambda: [0, 0.0, 0.0])
+    for record in trace_spans:
+        entry = totals[record['name']]
+        entry[0] += 1
+        entry[1] += record['duration_ms']
+        entry[2] += self_time(record, children)
+
+    out.write(f"\n{'name':<32} {'calls':>6} {'total ms':>12} {'self ms':>12}\n")
+    for name, (calls, total, self_ms) in sorted(totals.items(), key=lambda item: -item[1][2]):
+        out.write(f"{name:<32} {calls:>6} {total:>12.1f} {self_ms:>12.1f}\n")
+
+def print_folded(root, children, out=sys.stdout):
+    """Folded stacks (name;name;name self_us) for flame graph tools"""
+    def walk(record, stack):
+        stack = stack + [record['name']]
+        out.write(f"{';'.join(stack)} {int(self_time(record, children) * 1000)}\n")
+        for child in children.get(record['span_id'], []):
+            walk(child, stack)
+    walk(root, [])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--log', default=DEFAULT_LOG, help='Trace log path (rotated files are included)')
+    parser.add_argument('--trace-id', help='Request ID to report (default: slowest request)')
+    parser.add_argument('--list', action='store_true', help='List recent requests instead')
+    parser.add_argument('--limit', type=int, default=20, help='Requests to show with --list')
+    parser.add_argument('--folded', action='store_true', help='Print folded stacks for flame graph tools')
+    args = parser.parse_args()
+
+    traces = group_traces(load_spans(args.log))
+    if not traces:
+        sys.exit(f"No spans found in {args.log}")
+
+    if args.list:
+        roots = sorted((trace_root(spans) for spans in traces.values()), key=lambda s: -s['start'])
+        for root in roots[:args.limit]:
+            print(f"{root['trace_id']}  {root['duration_ms']:>10.1f} ms  {root['name']}  {describe(root)}")
+        return
+
+    if args.trace_id:
+        if args.trace_id not in traces:
+            sys.exit(f"Trace {args.trace_id} not found")
+        trace_spans = traces[args.trace_id]
+    else:
+        trace_spans = max(traces.values(), key=lambda spans: trace_root(spans)['duration_ms'])
+
+    root = trace_root(trace_spans)
+    children = build_children(trace_spans)
+
+    if args.folded:
+        print_folded(root, children)
+        return
+
+    print(f"Trace {root['trace_id']} ({len(trace_spans)} spans)\n")
+    print_tree(root, children, trace_spans)
+    print_by_name(trace_spans, children)
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
 // API Configuration
 const API_BASE_URL = 'http://localhost:5000/api';
+const CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024;  // Larger files use resumable chunked uploads
+const UPLOAD_CHUNK_RETRIES = 5;
 
 // State management
 let state = {
@@ -12,6 +14,8 @@ let state = {
     currentSegmentIndex: 0,
     audioElements: [],
     isPlaying: false,
+    isGenerating: false,  // Segments are still streaming in
+    waitingForSegment: false,  // Playback reached a segment that is not ready yet
     targetLanguage: 'es',
     phraseTimings: []  // Estimated timings for each phrase
 };
@@ -109,16 +113,20 @@ function handleDrop(event) {
 async function uploadFile(file) {
     showStatus(uploadStatus, 'loading', 'Uploading and extracting text from PDF...');
 
-    const formData = new FormData();
-    formData.append('file', file);
-
     try {
-        const response = await fetch(`${API_BASE_URL}/upload`, {
-            method: 'POST',
-            body: formData
-        });
+        let data;
+        if (file.size > CHUNKED_UPLOAD_THRESHOLD) {
+            data = await uploadFileChunked(file);
+        } else {
+            const formData = new FormData();
+            formData.append('file', file);
 
-        const data = await response.json();
+            const response = await fetch(`${API_BASE_URL}/upload`, {
+                method: 'POST',
+                body: formData
+            });
+            data = await response.json();
+        }
 
         if (data.success) {
             state.documentId = data.document_id;
@@ -144,6 +152,83 @@ async function uploadFile(file) {
     }
 }
 
+async function sha256Hex(buffer) {
+    if (!window.crypto || !window.crypto.subtle) {
+        return null;  // Only available on secure origins
+    }
+    const digest = await window.crypto.subtle.digest('SHA-256', buffer);
+    return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+}
+
+async function uploadFileChunked(file) {
+    // Resumable upload: start a session, PUT chunks at the server's offset, then finalize
+    const sessionResponse = await fetch(`${API_BASE_URL}/upload/sessions`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ filename: file.name, size: file.size })
+    });
+    const session = await sessionResponse.json();
+    if (!session.success) {
+        return session;
+    }
+
+    const sessionUrl = `${API_BASE_URL}/upload/sessions/${session.upload_id}`;
+    let offset = session.offset;
+    let failures = 0;
+
+    while (offset < file.size) {
+        const chunk = await file.slice(offset, offset + session.chunk_size).arrayBuffer();
+        const headers = { 'Content-Type': 'application/octet-stream' };
+        const chunkHash = await sha256Hex(chunk);
+        if (chunkHash) {
+            headers['X-Chunk-SHA256'] = chunkHash;
+        }
+
+        try {
+            const response = await fetch(`${sessionUrl}?offset=${offset}`, {
+                method: 'PUT',
+                headers,
+                body: chunk
+            });
+            const data = await response.json();
+
+            if (response.ok || response.status === 409) {
+                offset = data.offset;  // 409: resume from where the server actually is
+                failures = 0;
+                const percent = Math.floor((offset / file.size) * 100);
+                showStatus(uploadStatus, 'loading', `Uploading PDF... ${percent}%`);
+                continue;
+            }
+            if (response.status === 404) {
+                return data;
+            }
+        } catch (error) {
+            // Connection dropped; ask the server how far it got below
+        }
+
+        failures += 1;
+        if (failures > UPLOAD_CHUNK_RETRIES) {
+            throw new Error('Upload failed after several retries');
+        }
+        await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+
+        try {
+            const status = await (await fetch(sessionUrl)).json();
+            if (status.success) {
+                offset = status.offset;
+            }
+        } catch (error) {
+            // Still offline; retry the same chunk
+        }
+    }
+
+    showStatus(uploadStatus, 'loading', 'Verifying upload and extracting text from PDF...');
+    const response = await fetch(`${sessionUrl}/finalize`, { method: 'POST' });
+    return response.json();
+}
+
 // Translation Handlers
 async function handleTranslate() {
     if (!state.documentId) {
@@ -173,7 +258,11 @@ async function handleTranslate() {
 
         const data = await response.json();
 
-        if (data.success) {
+        if (data.success && data.translation.complete === false) {
+            // Finished units are checkpointed; translating again resumes the rest
+            showStatus(translateStatus, 'error', incompleteTranslationMessage(data.translation));
+            translateBtn.disabled = false;
+        } else if (data.success) {
             state.originalText = data.translation.original_text || '';
             state.translatedText = data.translation.translated_text || data.translation.full_text;
 
@@ -201,6 +290,11 @@ async function handleTranslate() {
     }
 }
 
+function incompleteTranslationMessage(translation) {
+    const failed = (translation.failed_chunks || []).length + (translation.failed_pages || []).length;
+    return `Translation incomplete: ${failed} part(s) failed. Translate again to resume where it stopped.`;
+}
+
 // Translation Editor Handlers
 function updateCharCount() {
     const charCount = translatedTextEditor.value.length;
@@ -235,7 +329,9 @@ async function handleRetranslate() {
 
         const data = await response.json();
 
-        if (data.success) {
+        if (data.success && data.translation.complete === false) {
+            showStatus(translateStatus, 'error', incompleteTranslationMessage(data.translation));
+        } else if (data.success) {
             state.translatedText = data.translation.translated_text || data.translation.full_text;
             state.targetLanguage = newTargetLang;
 
@@ -288,14 +384,17 @@ async function handleGenerateAudio() {
         return;
     }
 
-    showStatus(audioStatus, 'loading', 'Generating audio with sentence segments... This may take a moment.');
+    showStatus(audioStatus, 'loading', 'Generating audio with sentence segments... Playback can start as soon as the first one is ready.');
     generateAudioBtn.disabled = true;
 
+    resetAudioPlayer();
+
     try {
         // Use edited text from editor or state
         const textToSpeak = translatedTextEditor.value.trim() || state.translatedText;
 
-        const response = await fetch(`${API_BASE_URL}/tts/generate-custom`, {
+        // Stream segments as they are synthesized instead of waiting for the whole document
+        const response = await fetch(`${API_BASE_URL}/tts/generate-custom/stream`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -306,72 +405,155 @@ async function handleGenerateAudio() {
                 original_text: state.originalText,
                 language: state.targetLanguage,
                 service: 'gtts',
-                segment_type: 'sentence'
+                format: 'sse'
             })
         });
 
-        const data = await response.json();
-
-        if (data.success) {
-            state.segments = data.segments;
+        if (!response.ok) {
+            const data = await response.json();
+            showStatus(audioStatus, 'error', data.error || 'Audio generation failed');
+            generateAudioBtn.disabled = false;
+            return;
+        }
 
-            showStatus(audioStatus, 'success', `Audio generated successfully! ${data.total_segments} segments created.`);
+        state.isGenerating = true;
+        let totalSegments = 0;
 
-            // Setup audio player
-            setupAudioPlayer();
+        await readEventStream(response, (event, data) => {
+            if (event === 'start') {
+                totalSegments = data.total_segments;
+            } else if (event === 'segment') {
+                addSegment(data);
 
-            // Display text with segments
-            displayTextWithSegments();
+                // Show player and text display once the first segment is playable
+                if (state.segments.length === 1) {
+                    audioPlayerContainer.classList.remove('hidden');
+                    textDisplay.classList.remove('hidden');
+                }
 
-            // Show player and text display
-            audioPlayerContainer.classList.remove('hidden');
-            textDisplay.classList.remove('hidden');
-        } else {
-            showStatus(audioStatus, 'error', data.error || 'Audio generation failed');
-            generateAudioBtn.disabled = false;
-        }
+                showStatus(audioStatus, 'loading', `Generating audio... ${state.segments.length} of ${totalSegments} segments ready.`);
+            } else if (event === 'done') {
+                showStatus(audioStatus, 'success', `Audio generated successfully! ${data.total_segments} segments created.`);
+            } else if (event === 'error') {
+                showStatus(audioStatus, 'error', data.details || data.error || 'Audio generation failed');
+                generateAudioBtn.disabled = false;
+            }
+        });
     } catch (error) {
         showStatus(audioStatus, 'error', `Error: ${error.message}`);
         generateAudioBtn.disabled = false;
+    } finally {
+        state.isGenerating = false;
     }
 }
 
-// Audio Player Setup
-function setupAudioPlayer() {
-    let loadedCount = 0;
-    const totalAudios = state.segments.filter(s => s.audio_path).length;
-
-    // Create audio elements for each segment
-    state.audioElements = state.segments.map(segment => {
-        if (segment.audio_path) {
-            const audio = new Audio();
-            const filename = segment.audio_path.split('\\').pop().split('/').pop();
-            audio.src = `${API_BASE_URL}/tts/audio/${state.documentId}/${filename}`;
-            audio.playbackRate = parseFloat(speedSelect.value);
-
-            // Add event listeners
-            audio.addEventListener('ended', () => {
-                playNextSegment();
-            });
-
-            audio.addEventListener('timeupdate', () => {
-                updateProgress();
-            });
-
-            // Recalculate timings when audio metadata is loaded
-            audio.addEventListener('loadedmetadata', () => {
-                loadedCount++;
-                // Once all audio files have loaded metadata, recalculate timings
-                if (loadedCount === totalAudios) {
-                    state.phraseTimings = calculatePhraseTiming();
-                    console.log('Phrase timings recalculated with actual audio durations');
+// Read a server-sent event stream from a fetch response
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let separator;
+        while ((separator = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, separator);
+            buffer = buffer.slice(separator + 2);
+
+            let event = 'message';
+            let data = '';
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event:')) {
+                    event = line.slice(6).trim();
+                } else if (line.startsWith('data:')) {
+                    data += line.slice(5).trim();
                 }
             });
 
-            return audio;
+            if (data) {
+                onEvent(event, JSON.parse(data));
+            }
         }
-        return null;
-    }).filter(audio => audio !== null);
+    }
+}
+
+// Audio Player Setup
+function resetAudioPlayer() {
+    state.audioElements.forEach(audio => {
+        if (audio) audio.pause();
+    });
+
+    state.segments = [];
+    state.audioElements = [];
+    state.phrases = [];
+    state.phraseTimings = [];
+    state.currentSegmentIndex = 0;
+    state.currentPhraseIndex = 0;
+    state.waitingForSegment = false;
+
+    textContentOriginal.innerHTML = '';
+    textContentTranslated.innerHTML = '';
+    setupSynchronizedScrolling();
+}
+
+// Add a newly synthesized segment to the player and the text display
+function addSegment(segment) {
+    const segmentIndex = state.segments.length;
+    state.segments.push(segment);
+    state.audioElements.push(createSegmentAudio(segment, segmentIndex));
+
+    const firstPhraseIndex = state.phrases.length;
+    state.phrases.push(...createPhraseSegments(segment, segmentIndex, firstPhraseIndex));
+    state.phraseTimings.push(...calculatePhraseTiming(segmentIndex));
+    displayPhrases(firstPhraseIndex);
+
+    // Resume playback if it was waiting for this segment
+    if (state.waitingForSegment && state.isPlaying) {
+        state.waitingForSegment = false;
+        playCurrentSegment();
+    }
+}
+
+function createSegmentAudio(segment, segmentIndex) {
+    if (!segment.audio_path) return null;
+
+    const audio = new Audio();
+    if (segment.audio_url) {
+        audio.src = `${API_BASE_URL.replace(/\/api$/, '')}${segment.audio_url}`;
+    } else if (segment.audio_file) {
+        // Path under the audio folder, including the generation's version directory
+        audio.src = `${API_BASE_URL}/tts/audio/${segment.audio_file}`;
+    } else {
+        const filename = segment.audio_path.split('\\').pop().split('/').pop();
+        audio.src = `${API_BASE_URL}/tts/audio/${state.documentId}/${filename}`;
+    }
+    audio.playbackRate = parseFloat(speedSelect.value);
+
+    // Add event listeners
+    audio.addEventListener('ended', () => {
+        playNextSegment();
+    });
+
+    audio.addEventListener('timeupdate', () => {
+        updateProgress();
+    });
+
+    // Without a server-side duration, recalculate timings once the metadata is loaded
+    if (!segment.duration) {
+        audio.addEventListener('loadedmetadata', () => {
+            const timings = calculatePhraseTiming(segmentIndex);
+            state.phraseTimings = state.phraseTimings
+                .filter(t => t.segmentIndex !== segmentIndex)
+                .concat(timings);
+        });
+    }
+
+    return audio;
 }
 
 // Split text into phrases (3-5 words each)
@@ -389,83 +571,69 @@ function splitIntoPhrases(text, wordsPerPhrase = 4) {
     return phrases;
 }
 
-// Create phrase segments from sentence segments
-function createPhraseSegments() {
+// Create phrase segments for one sentence segment
+function createPhraseSegments(segment, segmentIndex, firstPhraseId) {
     const phrases = [];
-    let phraseId = 0;
-
-    state.segments.forEach((segment, segmentIndex) => {
-        const translatedPhrases = splitIntoPhrases(segment.text || '');
-        const originalPhrases = splitIntoPhrases(segment.original_text || '');
-
-        // Match phrases count (use the longer one as reference)
-        const maxPhrases = Math.max(translatedPhrases.length, originalPhrases.length);
-
-        for (let i = 0; i < maxPhrases; i++) {
-            phrases.push({
-                id: phraseId++,
-                segmentIndex: segmentIndex,
-                translatedText: translatedPhrases[i] || '',
-                originalText: originalPhrases[i] || '',
-                phraseIndexInSegment: i
-            });
-        }
-    });
+    const translatedPhrases = splitIntoPhrases(segment.text || '');
+    const originalPhrases = splitIntoPhrases(segment.original_text || '');
+
+    // Match phrases count (use the longer one as reference)
+    const maxPhrases = Math.max(translatedPhrases.length, originalPhrases.length);
+
+    for (let i = 0; i < maxPhrases; i++) {
+        phrases.push({
+            id: firstPhraseId + i,
+            segmentIndex: segmentIndex,
+            translatedText: translatedPhrases[i] || '',
+            originalText: originalPhrases[i] || '',
+            phraseIndexInSegment: i
+        });
+    }
 
     return phrases;
 }
 
-// Estimate timing for each phrase within segments
-function calculatePhraseTiming() {
-    const timings = [];
-
-    state.phrases.forEach((phrase, phraseIndex) => {
-        const segment = state.segments[phrase.segmentIndex];
-        if (!segment || !state.audioElements[phrase.segmentIndex]) return;
+// Estimate timing for each phrase within one segment
+function calculatePhraseTiming(segmentIndex) {
+    const segment = state.segments[segmentIndex];
+    const audio = state.audioElements[segmentIndex];
+    if (!segment || !audio) return [];
 
-        const audio = state.audioElements[phrase.segmentIndex];
-        const segmentPhrases = state.phrases.filter(p => p.segmentIndex === phrase.segmentIndex);
-        const phraseCount = segmentPhrases.length;
+    const segmentPhrases = state.phrases.filter(p => p.segmentIndex === segmentIndex);
+    const phraseCount = segmentPhrases.length;
+
+    // Use the exact duration from the server, then the loaded audio, otherwise estimate
+    let segmentDuration;
+    if (segment.duration) {
+        segmentDuration = segment.duration;
+    } else if (audio.duration && !isNaN(audio.duration) && audio.duration > 0) {
+        segmentDuration = audio.duration;
+    } else {
+        // Fall back to estimation (120 words per minute for more conservative estimate)
+        const wordCount = (segment.text || '').split(/\s+/).length;
+        segmentDuration = (wordCount / 120) * 60; // seconds
+    }
 
-        // Use actual audio duration if available, otherwise estimate
-        let segmentDuration;
-        if (audio.duration && !isNaN(audio.duration) && audio.duration > 0) {
-            // Use actual audio duration for accurate timing
-            segmentDuration = audio.duration;
-        } else {
-            // Fall back to estimation (120 words per minute for more conservative estimate)
-            const wordCount = (segment.text || '').split(/\s+/).length;
-            segmentDuration = (wordCount / 120) * 60; // seconds
-        }
+    // Divide equally among phrases
+    const phraseDuration = segmentDuration / phraseCount;
 
-        // Divide equally among phrases
-        const phraseDuration = segmentDuration / phraseCount;
+    return segmentPhrases.map(phrase => {
         const startTime = phrase.phraseIndexInSegment * phraseDuration;
-        const endTime = startTime + phraseDuration;
-
-        timings.push({
-            phraseIndex,
-            segmentIndex: phrase.segmentIndex,
+        return {
+            phraseIndex: phrase.id,
+            segmentIndex: segmentIndex,
             startTime,
-            endTime,
+            endTime: startTime + phraseDuration,
             duration: phraseDuration
-        });
+        };
     });
-
-    return timings;
 }
 
-// Display Text with Segments (Dual Panel)
-function displayTextWithSegments() {
-    textContentOriginal.innerHTML = '';
-    textContentTranslated.innerHTML = '';
-
-    // Create phrase-level segments
-    state.phrases = createPhraseSegments();
-    state.phraseTimings = calculatePhraseTiming();
+// Display phrases in both panels, starting at the given phrase index
+function displayPhrases(fromIndex) {
+    state.phrases.slice(fromIndex).forEach(phrase => {
+        const index = phrase.id;
 
-    // Render phrases in both panels
-    state.phrases.forEach((phrase, index) => {
         // Original text panel
         if (phrase.originalText) {
             const originalSpan = document.createElement('span');
@@ -494,14 +662,11 @@ function displayTextWithSegments() {
             textContentTranslated.appendChild(translatedSpan);
         }
     });
-
-    // Setup synchronized scrolling
-    setupSynchronizedScrolling();
 }
 
 // Playback Controls
 function handlePlay() {
-    if (state.audioElements.length === 0) return;
+    if (!state.audioElements.some(audio => audio)) return;
 
     state.isPlaying = true;
     playBtn.classList.add('hidden');
@@ -528,6 +693,9 @@ function playCurrentSegment() {
         currentAudio.play();
         // Start phrase-level highlighting for this segment
         startPhraseHighlighting(state.currentSegmentIndex);
+    } else if (state.currentSegmentIndex < state.audioElements.length) {
+        // Segment failed to synthesize, skip it
+        playNextSegment();
     }
 }
 
@@ -536,6 +704,9 @@ function playNextSegment() {
 
     if (state.currentSegmentIndex < state.audioElements.length) {
         playCurrentSegment();
+    } else if (state.isGenerating) {
+        // Next segment is still being synthesized, resume when it arrives
+        state.waitingForSegment = true;
     } else {
         // Reached end
         handlePause();
@@ -603,7 +774,7 @@ function startPhraseHighlighting(segmentIndex) {
 function handleSpeedChange(event) {
     const speed = parseFloat(event.target.value);
     state.audioElements.forEach(audio => {
-        audio.playbackRate = speed;
+        if (audio) audio.playbackRate = speed;
     });
 }
 